@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina de acesso ao banco de dados termodinâmico.
+
+As buscas das classes da rotina Conexao são realizadas pelo método ``consultar(tabela,colunas,**filtros)``, que retorna
+uma lista de tuplas, com as linhas da tabela cujas colunas dos filtros são iguais aos valores informados. O método está
+disponível em duas formas de acesso ao banco:
+
+- ``Banco_SQLite``: Conexão ao banco de dados SQLite (Ex.: THERMO_DATA_BANK_EXEMPLO.db);
+- ``Banco_Snapshot``: Cópia do banco, somente para leitura, em um único arquivo binário (snapshot), gerado pela função
+  ``exportar``. As colunas das tabelas são arrays do numpy mapeados em memória, de modo que a abertura do snapshot não lê
+  os dados e os processos que utilizam o mesmo snapshot compartilham as páginas do arquivo. As buscas utilizam índices
+  (valor -> linhas) das colunas dos filtros, criados na primeira busca de cada coluna.
+
+A função ``abrir_banco`` retorna o snapshot do banco quando este existe e é mais recente que o banco de dados e, caso
+contrário, uma conexão ao banco de dados. O snapshot é aberto uma única vez em cada processo e a conexão, uma única vez em
+cada thread de cada processo, sendo reutilizada por todos os componentes e modelos criados.
+
+O banco de dados utilizado é, em ordem de prioridade: o informado pela função ``configurar_banco`` (caminho ou URI do
+SQLite, Ex.: 'file:/dados/banco.db?mode=ro'), o informado pela variável de ambiente VLE_BANCO ou o banco de dados de
+exemplo, no diretório desta rotina. Por padrão, a conexão é somente para leitura; a opção ``imutavel`` indica ao SQLite
+que o arquivo não é alterado durante a execução, dispensando os bloqueios de leitura (Ex.: bancos em sistemas de arquivos
+somente para leitura ou compartilhados entre muitos processos).
+
+Formato do snapshot: identificador (8 bytes), tamanho do cabeçalho (inteiro de 8 bytes), cabeçalho em JSON (tabelas,
+colunas, tipo e posição dos dados e das marcações de valores nulos) e os dados das colunas, alinhados em 64 bytes.
+
+Exemplo (exportação do snapshot pela linha de comando): ::
+
+    python Banco.py -b THERMO_DATA_BANK_EXEMPLO.db
+"""
+import os
+import json
+import struct
+import threading
+from sqlite3 import connect
+from numpy import array, zeros, memmap, dtype as tipo_numpy
+from Erros import Erro_Valor, texto_utf8
+
+BANCO       = 'THERMO_DATA_BANK_EXEMPLO.db' # Banco de dados de exemplo
+VARIAVEL    = 'VLE_BANCO'                   # Variável de ambiente com o caminho do banco de dados
+IDENTIFICADOR = b'VLESNAP1'
+ALINHAMENTO = 64
+
+_configuracao = {'caminho':None,'somente_leitura':True,'imutavel':False,'versao':0}
+_snapshots    = {} # caminho -> (data de modificação, Banco_Snapshot)
+_locais       = threading.local() # Conexões compartilhadas de cada thread
+
+def configurar_banco(caminho=None,somente_leitura=True,imutavel=False):
+    u'''
+    Função para configurar o banco de dados utilizado pelas rotinas. As conexões abertas com a configuração anterior são
+    substituídas na próxima busca de cada thread.
+
+    ========
+    Entradas
+    ========
+
+    * caminho (str): Caminho ou URI ('file:...') do banco de dados. Caso não seja inserido, é utilizada a variável de ambiente VLE_BANCO ou o banco de dados de exemplo;
+    * somente_leitura (bool): Abre o banco de dados somente para leitura;
+    * imutavel (bool): Indica ao SQLite que o banco de dados não é alterado durante a execução (vide documentação da rotina).
+    '''
+    _configuracao.update({'caminho':caminho,'somente_leitura':somente_leitura,'imutavel':imutavel,
+                          'versao':_configuracao['versao']+1})
+
+def caminho_banco():
+    u'''
+    Caminho do banco de dados configurado (vide documentação da rotina).
+    '''
+    if _configuracao['caminho'] is not None:
+        return _configuracao['caminho']
+    return os.environ.get(VARIAVEL) or os.path.join(os.path.dirname(os.path.abspath(__file__)),BANCO)
+
+def _URI_Arquivo(caminho):
+    # URI do SQLite para o caminho de um arquivo (os caracteres %, ? e # são codificados)
+    caminho = os.path.abspath(caminho).replace(os.sep,'/').replace('%','%25').replace('?','%3f').replace('#','%23')
+    return 'file:'+('' if caminho.startswith('/') else '/')+caminho
+
+def _Suporte_URI():
+    opcoes = [linha[0] for linha in connect(':memory:').execute('PRAGMA compile_options')]
+    return 'USE_URI' in opcoes or 'USE_URI=1' in opcoes
+
+_URI = _Suporte_URI() # O SQLite interpreta os nomes 'file:...' como URI
+
+def caminho_snapshot(banco):
+    u'''
+    Caminho do snapshot do banco de dados: mesmo nome, com a extensão .snap.
+    '''
+    return os.path.splitext(banco)[0]+'.snap'
+
+def abrir_banco(banco=None):
+    u'''
+    Função para abrir o banco de dados (Padrão: ``caminho_banco()``). Caso o snapshot do banco exista e seja mais recente
+    que o banco de dados, retorna o snapshot (objeto ``Banco_Snapshot``, compartilhado no processo); caso contrário, retorna
+    a conexão ao banco de dados da thread (objeto ``Banco_SQLite``, compartilhado na thread).
+    '''
+    if banco is None:
+        banco = caminho_banco()
+    if not banco.startswith('file:'):
+        snapshot = caminho_snapshot(banco)
+        if os.path.exists(snapshot):
+            data = os.path.getmtime(snapshot)
+            if not os.path.exists(banco) or data >= os.path.getmtime(banco):
+                aberto = _snapshots.get(snapshot)
+                if aberto is None or aberto[0] != data:
+                    aberto = _snapshots[snapshot] = (data,Banco_Snapshot(snapshot))
+                return aberto[1]
+
+    # Conexões da thread, descartadas quando a configuração é alterada ou em um novo processo (Ex.: multiprocessing)
+    processo = os.getpid()
+    if getattr(_locais,'versao',None) != (processo,_configuracao['versao']):
+        if getattr(_locais,'versao',(None,))[0] == processo:
+            fechar_banco()
+        _locais.conexoes = {}
+        _locais.versao   = (processo,_configuracao['versao'])
+    conexao = _locais.conexoes.get(banco)
+    if conexao is None:
+        conexao = _locais.conexoes[banco] = Banco_SQLite(banco,_configuracao['somente_leitura'],_configuracao['imutavel'],
+                                                         compartilhado=True)
+    return conexao
+
+def fechar_banco():
+    u'''
+    Função para encerrar as conexões compartilhadas da thread. Uma nova conexão é aberta na próxima busca.
+    '''
+    for conexao in getattr(_locais,'conexoes',{}).values():
+        conexao.encerrar()
+    _locais.conexoes = {}
+
+class Banco_SQLite:
+
+    def __init__(self,caminho=None,somente_leitura=False,imutavel=False,compartilhado=False):
+        u'''
+        Conexão ao banco de dados SQLite.
+
+        ========
+        Entradas
+        ========
+
+        * caminho (str): Caminho ou URI ('file:...') do banco de dados. Padrão: ``caminho_banco()``;
+        * somente_leitura (bool): Abre o banco de dados somente para leitura;
+        * imutavel (bool): Indica ao SQLite que o banco de dados não é alterado durante a execução;
+        * compartilhado (bool): Conexão compartilhada (vide ``abrir_banco``), que não é encerrada pelo método ``fechar``.
+        '''
+        if caminho is None:
+            caminho = caminho_banco()
+        self.caminho       = caminho
+        self.compartilhado = compartilhado
+
+        endereco = caminho
+        if caminho.startswith('file:'):
+            if not _URI:
+                raise Erro_Valor(u'A versão do SQLite utilizada não aceita URIs: %s.'%caminho)
+        else:
+            if not os.path.exists(caminho):
+                raise Erro_Valor(u'O banco de dados %s não existe. Informe o caminho pela função configurar_banco ou pela variável de ambiente %s.'%(caminho,VARIAVEL))
+            opcoes = (['mode=ro'] if somente_leitura else []) + (['immutable=1'] if imutavel else [])
+            if opcoes and _URI:
+                endereco = _URI_Arquivo(caminho)+'?'+'&'.join(opcoes)
+        self.__conector = connect(endereco)
+        if somente_leitura:
+            self.__conector.execute('PRAGMA query_only=1') # Também quando o SQLite não aceita URIs
+        self.__cursor   = self.__conector.cursor()
+
+    def consultar(self,tabela,colunas='*',**filtros):
+        u'''
+        Busca das linhas da tabela cujas colunas dos filtros são iguais aos valores informados.
+
+        ========
+        Entradas
+        ========
+
+        * tabela (str): Nome da tabela;
+        * colunas (list): Nomes das colunas retornadas, ou '*' para todas as colunas, na ordem da tabela;
+        * filtros: Pares coluna=valor.
+
+        ======
+        Saídas
+        ======
+
+        * Uma lista de tuplas, uma por linha. A ordem das linhas não é definida (depende dos índices do banco de dados).
+
+        =======
+        Exemplo
+        =======
+        ::
+
+            >>> banco.consultar('Componentes',['ID'],Nome='Metano')
+            [(1,)]
+        '''
+        self.__cursor.execute(*self.__selecao(tabela,colunas,filtros))
+        return self.__cursor.fetchall()
+
+    def plano(self,tabela,colunas='*',**filtros):
+        u'''
+        Plano de execução (EXPLAIN QUERY PLAN) da busca realizada pelo método ``consultar`` com as mesmas entradas. Retorna
+        uma lista com a descrição de cada etapa do plano (Ex.: 'SEARCH NRTL USING INDEX ...' ou 'SCAN NRTL').
+        '''
+        selecao, valores = self.__selecao(tabela,colunas,filtros)
+        self.__cursor.execute('EXPLAIN QUERY PLAN '+selecao,valores)
+        return [linha[-1] for linha in self.__cursor.fetchall()]
+
+    def __selecao(self,tabela,colunas,filtros):
+        chaves   = list(filtros)
+        selecao  = 'SELECT '+('*' if colunas == '*' else ', '.join(['['+coluna+']' for coluna in colunas]))+' FROM ['+tabela+']'
+        if chaves:
+            selecao += ' WHERE '+' AND '.join(['['+chave+']=?' for chave in chaves])
+        return selecao, tuple([filtros[chave] for chave in chaves])
+
+    def tabelas(self):
+        u'''
+        Lista com os nomes das tabelas do banco de dados.
+        '''
+        self.__cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+        return [linha[0] for linha in self.__cursor.fetchall() if not linha[0].startswith('sqlite_')] # Exceto as tabelas internas do SQLite
+
+    def colunas(self,tabela):
+        u'''
+        Lista com os nomes das colunas da tabela, na ordem da tabela.
+        '''
+        self.__cursor.execute('PRAGMA table_info(['+tabela+'])')
+        return [linha[1] for linha in self.__cursor.fetchall()]
+
+    def fechar(self):
+        u'''
+        Encerra a conexão com o banco de dados, exceto as conexões compartilhadas (vide ``fechar_banco``).
+        '''
+        if not self.compartilhado:
+            self.__conector.close()
+
+    def encerrar(self):
+        u'''
+        Encerra a conexão com o banco de dados, inclusive as conexões compartilhadas.
+        '''
+        self.__conector.close()
+
+class Banco_Snapshot:
+
+    def __init__(self,caminho):
+        u'''
+        Snapshot do banco de dados, somente para leitura (vide documentação da rotina e a função ``exportar``).
+        '''
+        self.caminho = caminho
+        with open(caminho,'rb') as arquivo:
+            if arquivo.read(len(IDENTIFICADOR)) != IDENTIFICADOR:
+                raise Erro_Valor(u'O arquivo %s não é um snapshot do banco de dados.'%caminho)
+            tamanho   = struct.unpack('<Q',arquivo.read(8))[0]
+            cabecalho = json.loads(arquivo.read(tamanho).decode('utf-8'))
+        inicio = _Alinhar(len(IDENTIFICADOR)+8+tamanho)
+        dados  = memmap(caminho,dtype='u1',mode='r')
+
+        def vista(descricao,tipo,posicao):
+            if descricao['linhas'] == 0:
+                return zeros(0,dtype=tipo)
+            tipo = tipo_numpy(tipo)
+            return dados[inicio+posicao:inicio+posicao+tipo.itemsize*descricao['linhas']].view(tipo)
+
+        self.origem   = cabecalho['origem']
+        self.__tabelas = {}
+        for tabela, descricao in cabecalho['tabelas'].items():
+            colunas = []
+            for coluna in descricao['colunas']:
+                nulos = None if coluna['nulos'] is None else vista(descricao,'?',coluna['nulos'])
+                colunas.append((coluna['nome'],vista(descricao,coluna['tipo'],coluna['posicao']),nulos))
+            self.__tabelas[tabela] = {'linhas':descricao['linhas'],'colunas':colunas,
+                                      'posicao':dict([(coluna[0],j) for j,coluna in enumerate(colunas)])}
+        self.__indices = {}
+
+    def __tabela(self,tabela):
+        dados = self.__tabelas.get(tabela)
+        if dados is None:
+            raise Erro_Valor(u'A tabela %s não consta no snapshot do banco de dados (%s).'%(tabela,self.caminho))
+        return dados
+
+    def __valor(self,coluna,i):
+        nome, valores, nulos = coluna
+        if nulos is not None and nulos[i]:
+            return None
+        return valores[i].item()
+
+    def __indice(self,tabela,nome):
+        u'''
+        Índice da coluna: dicionário valor -> linhas. Criado na primeira busca.
+        '''
+        chave  = (tabela,nome)
+        indice = self.__indices.get(chave)
+        if indice is None:
+            dados  = self.__tabela(tabela)
+            coluna = dados['colunas'][dados['posicao'][nome]]
+            indice = {}
+            for i in xrange(dados['linhas']):
+                indice.setdefault(self.__valor(coluna,i),[]).append(i)
+            self.__indices[chave] = indice
+        return indice
+
+    def consultar(self,tabela,colunas='*',**filtros):
+        u'''
+        Busca das linhas da tabela cujas colunas dos filtros são iguais aos valores informados, com as mesmas entradas e
+        saídas do método ``consultar`` da classe ``Banco_SQLite``.
+        '''
+        dados = self.__tabela(tabela)
+        if filtros:
+            chaves = list(filtros)
+            linhas = self.__indice(tabela,chaves[0]).get(filtros[chaves[0]],[])
+            for chave in chaves[1:]:
+                indice = set(self.__indice(tabela,chave).get(filtros[chave],[]))
+                linhas = [i for i in linhas if i in indice]
+        else:
+            linhas = xrange(dados['linhas'])
+        if colunas == '*':
+            selecao = dados['colunas']
+        else:
+            selecao = [dados['colunas'][dados['posicao'][coluna]] for coluna in colunas]
+        return [tuple([self.__valor(coluna,i) for coluna in selecao]) for i in linhas]
+
+    def tabelas(self):
+        u'''
+        Lista com os nomes das tabelas do snapshot.
+        '''
+        return sorted(self.__tabelas)
+
+    def colunas(self,tabela):
+        u'''
+        Lista com os nomes das colunas da tabela, na ordem da tabela.
+        '''
+        return [coluna[0] for coluna in self.__tabela(tabela)['colunas']]
+
+    def fechar(self):
+        u'''
+        O snapshot permanece aberto, pois é compartilhado no processo (vide ``abrir_banco``).
+        '''
+        pass
+
+def _Alinhar(posicao):
+    return (posicao + ALINHAMENTO - 1)//ALINHAMENTO*ALINHAMENTO
+
+def _Coluna(valores):
+    u'''
+    Conversão dos valores de uma coluna (lista) em array: inteiros (int64), números reais (float64) ou textos (unicode).
+    Retorna o array e as marcações de valores nulos (ou None, caso não haja valores nulos).
+    '''
+    presentes = [valor for valor in valores if valor is not None]
+    if all([isinstance(valor,(int,long)) for valor in presentes]):
+        tipo, vazio = '<i8', 0
+    elif all([isinstance(valor,(int,long,float)) for valor in presentes]):
+        tipo, vazio = '<f8', float('nan')
+    elif all([isinstance(valor,basestring) for valor in presentes]):
+        presentes = [unicode(valor) for valor in presentes]
+        tipo, vazio = '<U%d'%max([1]+[len(valor) for valor in presentes]), u''
+    else:
+        raise Erro_Valor(u'Tipo de dado não suportado pelo snapshot (Ex.: BLOB).')
+    nulos = [valor is None for valor in valores]
+    dados = array([vazio if valor is None else valor for valor in valores],dtype=tipo)
+    return dados, (array(nulos,dtype='?') if any(nulos) else None)
+
+def exportar(banco=None,snapshot=None):
+    u'''
+    Função para exportar o banco de dados para um snapshot (vide documentação da rotina).
+
+    ========
+    Entradas
+    ========
+
+    * banco (str): Caminho do banco de dados. Padrão: ``caminho_banco()``;
+    * snapshot (str): Caminho do snapshot. Padrão: caminho do banco com a extensão .snap.
+
+    ======
+    Saídas
+    ======
+
+    * Retorna o caminho do snapshot.
+    '''
+    if banco is None:
+        banco = caminho_banco()
+    if snapshot is None:
+        snapshot = caminho_snapshot(banco)
+
+    origem  = Banco_SQLite(banco,somente_leitura=True)
+    tabelas = {}
+    blocos  = []
+    posicao = 0
+    for tabela in origem.tabelas():
+        nomes  = origem.colunas(tabela)
+        linhas = origem.consultar(tabela) # Ordem das linhas do banco de dados
+        colunas = []
+        for j,nome in enumerate(nomes):
+            dados, nulos = _Coluna([linha[j] for linha in linhas])
+            coluna = {'nome':nome,'tipo':dados.dtype.str,'posicao':posicao,'nulos':None}
+            blocos.append((posicao,dados.tostring()))
+            posicao = _Alinhar(posicao+dados.nbytes)
+            if nulos is not None:
+                coluna['nulos'] = posicao
+                blocos.append((posicao,nulos.tostring()))
+                posicao = _Alinhar(posicao+nulos.nbytes)
+            colunas.append(coluna)
+        tabelas[tabela] = {'linhas':len(linhas),'colunas':colunas}
+    origem.fechar()
+
+    cabecalho = json.dumps({'origem':os.path.basename(banco),'tabelas':tabelas},sort_keys=True).encode('utf-8')
+    inicio    = _Alinhar(len(IDENTIFICADOR)+8+len(cabecalho))
+    temporario = snapshot+'.tmp'
+    with open(temporario,'wb') as arquivo:
+        arquivo.write(IDENTIFICADOR+struct.pack('<Q',len(cabecalho))+cabecalho)
+        for posicao_bloco, bloco in blocos:
+            arquivo.seek(inicio+posicao_bloco)
+            arquivo.write(bloco)
+        arquivo.truncate(inicio+posicao)
+    if os.path.exists(snapshot):
+        os.remove(snapshot) # os.rename não substitui arquivos existentes no Windows
+    os.rename(temporario,snapshot)
+    return snapshot
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser # Apenas na linha de comando (a rotina é importada pelos cálculos)
+
+    argumentos = ArgumentParser(description=texto_utf8(u'Exportação do banco de dados termodinâmico para um snapshot somente para leitura.'))
+    argumentos.add_argument('-b','--banco',default=None,help=texto_utf8(u'Banco de dados SQLite. Padrão: variável de ambiente %s ou %s.'%(VARIAVEL,BANCO)))
+    argumentos.add_argument('-s','--snapshot',default=None,help=texto_utf8(u'Arquivo do snapshot. Padrão: banco de dados com a extensão .snap.'))
+    argumentos = argumentos.parse_args()
+
+    print exportar(argumentos.banco,argumentos.snapshot)
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from sqlite3 import connect
-from warnings import warn
-from scipy import exp, log
-from numpy import zeros
+import sys
+from copy import copy
+from Banco import abrir_banco
+from Diagnostico import diagnostico_padrao
+from Erros import Erro_Valor, Erro_Nome
+from Kernel import Kernel_UNIQUAC, Kernel_NRTL, Kernel_Wilson, Kernel_Van_Laar, Kernel_UNIFAC
+from numpy import exp, log, zeros, any as algum
 
 class Componente_Caracterizar:
     
@@ -75,8 +78,7 @@ class Componente_Caracterizar:
         #==============================================================================
         #         CONEXÃO COM O BANCO DE DADOS
         #==============================================================================
-        conector     = connect('THERMO_DATA_BANK_EXEMPLO.db') # Conecta a rotina ao banco de dados
-        self.__cursor  = conector.cursor()                      # Permite a navegação no banco de dados a partir da rotina
+        self.__banco = abrir_banco() # Conecta a rotina ao banco de dados (ou ao seu snapshot, vide rotina Banco)
 
         #==============================================================================
         #         LISTAGEM DE MÉTODOS DISPONÍVEIS
@@ -89,7 +91,7 @@ class Componente_Caracterizar:
         # Mostrar lista de componentes para o usuário, caso solicitado
         if Componente == None:
             
-            print u'Os seguintes componentes estão disponíveis no banco de dados: '+', '.join(self.lista_componentes())+'.'
+            print (u'Os seguintes componentes estão disponíveis no banco de dados: '+', '.join(self.lista_componentes())+'.').encode(sys.stdout.encoding or 'utf-8','replace')
         
         else:
             #==============================================================================
@@ -126,7 +128,7 @@ class Componente_Caracterizar:
         #==============================================================================
         #         ENCERRAR CONEXÃO COM O BANCO
         #==============================================================================
-        conector.close()
+        self.__banco.fechar()
         
     def lista_componentes(self):
         u'''
@@ -139,8 +141,7 @@ class Componente_Caracterizar:
         * Retorna uma lista contendo os nomes dos componentes.
         '''        
         
-        self.__cursor.execute('SELECT Nome FROM Componentes')  # Seleciona a coluna Nome da tabela Componentes do banco de dados
-        row = self.__cursor.fetchall()                         # Retorna a coluna selecionada em forma de lista de tuplas
+        row = self.__banco.consultar('Componentes',['Nome'])   # Retorna a coluna Nome da tabela Componentes em forma de lista de tuplas
         return [i[0] for i in row]                             # Transforma a lista de tuplas em uma lista com o contéudo das tuplas (os nomes dos componentes)
         
     def Validacao_Nome(self,Nome):
@@ -152,7 +153,7 @@ class Componente_Caracterizar:
         '''
         # Validação do nome do componente
         if Nome not in self.lista_componentes():
-            raise NameError(u'O nome do componente não consta no Banco de dados. Os seguintes componentes estão disponíveis no banco de dados: '+', '.join(self.lista_componentes())+'.')  # Emite um erro com a mensagem inserida no método
+            raise Erro_Nome(u'O nome do componente não consta no Banco de dados. Os seguintes componentes estão disponíveis no banco de dados: '+', '.join(self.lista_componentes())+'.')  # Emite um erro com a mensagem inserida no método
 
     def Busca_ID(self):
         u'''
@@ -165,8 +166,7 @@ class Componente_Caracterizar:
         * Gera o atributo ID em forma de número inteiro
         '''
         
-        self.__cursor.execute('SELECT ID FROM Componentes WHERE  Nome=?',(self.nome,)) # Busca do ID do componente na tabela Componentes no banco de dados
-        row = self.__cursor.fetchall()                                                 # Retorna a linha contendo o ID em forma de lista de tupla
+        row = self.__banco.consultar('Componentes',['ID'],Nome=self.nome) # Busca do ID do componente na tabela Componentes, em forma de lista de tupla
         self.ID = row[0][0]                                                            # Cria o atributo ID
 
     def Busca_grupo(self):
@@ -183,15 +183,13 @@ class Componente_Caracterizar:
         #==============================================================================
         #         BUSCA ID_GRUPO NA TABELA COMPONENTES
         #==============================================================================
-        self.__cursor.execute('SELECT ID_grupo FROM Componentes WHERE ID=?',(self.ID,))        
-        row = self.__cursor.fetchall()        
+        row = self.__banco.consultar('Componentes',['ID_grupo'],ID=self.ID)
         ID_grupo = row[0][0]
         
         #==============================================================================
         #         BUSCA NOME DO GRUPO PELA ID_GRUPO NA TABELA GRUPO
         #==============================================================================
-        self.__cursor.execute('SELECT Nome FROM Grupo WHERE ID=?',(ID_grupo,))        
-        row = self.__cursor.fetchall()
+        row = self.__banco.consultar('Grupo',['Nome'],ID=ID_grupo)
         self.grupo_funcional = row[0][0]
         
 
@@ -208,8 +206,7 @@ class Componente_Caracterizar:
         
         if self.eqPsat == self.__lista_EqPsat[0]: 
             
-            self.__cursor.execute('SELECT ID_forma FROM Parametros_Psat_Prausnitz_4th_edition WHERE ID_componente=?',(self.ID,)) # Busca as possíveis formas de equação do cálculo da pressão de vapor
-            row = self.__cursor.fetchall()         # Cria uma lista de tuplas contendo as formas de equações
+            row = self.__banco.consultar('Parametros_Psat_Prausnitz_4th_edition',['ID_forma'],ID_componente=self.ID) # Busca as possíveis formas de equação do cálculo da pressão de vapor, em forma de lista de tuplas
             
         return [i[0] for i in row]                 # Transforma a lista de tuplas em uma lista com o contéudo das tuplas (Os marcadores das formas de equações)
 
@@ -226,7 +223,7 @@ class Componente_Caracterizar:
         
         # Caso o método inserido não constar na lista de métodos disponíveis
         if self.eqPsat not in self.__lista_EqPsat:                      
-            raise NameError(u'O método de cálculo de Psat não consta no Banco de dados. Métodos disponíveis: '+', '.join(self.__lista_EqPsat)+'.')
+            raise Erro_Nome(u'O método de cálculo de Psat não consta no Banco de dados. Métodos disponíveis: '+', '.join(self.__lista_EqPsat)+'.')
         
         # Caso o método inserido conste na lista de métodos disponíveis:
         if self.eqPsat == self.__lista_EqPsat[0]:
@@ -234,13 +231,13 @@ class Componente_Caracterizar:
 
             if self.nEqPsat != None:                # Caso a forma da equação seja inserida pelo usuário
                 if self.nEqPsat not in dadosbanco:  # Caso a forma da equação inserida não conste no banco
-                    raise ValueError(u'Foi escolhida a equação %s para calcular a pressão de saturação. Contudo foi inserido uma forma de equação que não consta no Banco de dados (Vide documentação do Banco de dados). Formas de equações disponíveis: '%(self.eqPsat,)+', '.join(str(forma) for forma in dadosbanco)+'.') 
+                    raise Erro_Valor(u'Foi escolhida a equação %s para calcular a pressão de saturação. Contudo foi inserido uma forma de equação que não consta no Banco de dados (Vide documentação do Banco de dados). Formas de equações disponíveis: '%(self.eqPsat,)+', '.join(str(forma) for forma in dadosbanco)+'.') 
             
             if self.nEqPsat == None:                # Caso a forma da equação não seja inserida
                 if len(dadosbanco) == 1:            # Caso haja apenas uma forma de equação, dados banco tem tamanho 1
                     self.nEqPsat = dadosbanco[0]    # Como não seja inserida a forma de equação, o programa usará a única forma disponível
                 else: # Caso haja mais de uma forma de equação disponível no banco de dados
-                    raise ValueError(u'Foi escolhida a equação %s para calcular a pressão de saturação. No entanto, é necessário informar expressamente a forma da equaçao (Vide documentação do Banco de dados), visto que há diferentes opções disponíveis: '%(self.eqPsat,)+', '.join(str(forma) for forma in dadosbanco)+'.') 
+                    raise Erro_Valor(u'Foi escolhida a equação %s para calcular a pressão de saturação. No entanto, é necessário informar expressamente a forma da equaçao (Vide documentação do Banco de dados), visto que há diferentes opções disponíveis: '%(self.eqPsat,)+', '.join(str(forma) for forma in dadosbanco)+'.') 
         
     def warnings(self):
         u'''        
@@ -254,7 +251,7 @@ class Componente_Caracterizar:
         #         Verificação se a temperatura inserida está dentro ou não da faixa de aplicabilidade das fórmulas do cálculo de Psat
         #==============================================================================
         if self.T < self.__TminPsat or self.T > self.__TmaxPsat:
-            warn(u'A temperatura especificada está fora da faixa de aplicabilidade da equaçao de Psat. A temperatura de pertencer ao intervalo: (%f, '%self.__TminPsat+'%f).'%self.__TmaxPsat) # Emite um aviso. Contudo o programa continua a rodar
+            diagnostico_padrao.avisar('psat_faixa_temperatura',componente=self.nome,T=self.T,Tmin=self.__TminPsat,Tmax=self.__TmaxPsat) # Emite um aviso. Contudo o programa continua a rodar
  
         #==============================================================================
         #        Validar se a temperatura especificada é menor do que Tc, se self.nEqPsat = 1.
@@ -265,7 +262,7 @@ class Componente_Caracterizar:
                 # sendo a primeira forma disponível
                 if self.nEqPsat == 1:
                     if self.T > self.Tc:
-                        raise ValueError(u'Para a equação de pressão de vapor escolhida para o método de cálculo: %s, é necessário que a temperatura esteja abaixo da temperatura crítica,'%(self.eqPsat,)+' Tc = %f.'%self.Tc)
+                        raise Erro_Valor(u'Para a equação de pressão de vapor escolhida para o método de cálculo: %s, é necessário que a temperatura esteja abaixo da temperatura crítica,'%(self.eqPsat,)+' Tc = %f.'%self.Tc)
 
     def solver(self,f,df,arg,x0,itmax = 100, tol = 1e-10):
        u'''
@@ -277,7 +274,10 @@ class Componente_Caracterizar:
         
         * f (def): Equação, cuja a raíz deseja-se encontrar, inserida como ``def`` na forma f(x,y)=0;
         * df (def): Derivada da equação, também inserida como ``def``
-        * arg (float): Argumento extra das funções Pvap e Tsat. Pode ser pressão em bar, caso a função for Tsat, ou temperatura em Kelvin, caso a função for Pvap;
+        * arg (float ou array): Argumento extra das funções Pvap e Tsat. Pode ser pressão em bar, caso a função for Tsat, ou temperatura em Kelvin, caso a função for Pvap;
+        
+            * Caso ``arg`` seja um array, as raízes são calculadas simultaneamente para todos os elementos e o método itera até que todas satisfaçam a tolerância.
+            
         * x0 (float): Estimativa inicial para o método numérico;
         * itmax (int): Número máximo de iterações;
         * tol (float): tolerância para o cálculo da raiz da equação.
@@ -298,7 +298,7 @@ class Componente_Caracterizar:
        '''
        i = 0
        x = x0
-       while abs(f(self,x,arg)) >= tol and i<=itmax:
+       while algum(abs(f(self,x,arg)) >= tol) and i<=itmax:
            xi = x
            x = xi - f(self,xi,arg) / df(self,xi,arg)
            i+=1
@@ -439,8 +439,8 @@ class Componente_Caracterizar:
             return Resul # Retorno
     
         elif nEqPsat == 3: # Cálculo de Psat quando nEq = 3
-            Eq3(self.VPA,self.VPB,self.VPC,P)         
-            # Retorno
+            Resul = Eq3(self.VPA,self.VPB,self.VPC,P)
+            return Resul # Retorno
         
         # Todos os Tsat são em Kelvin
 
@@ -476,8 +476,7 @@ class Componente_Caracterizar:
         [1] REID, R.C.; PRAUSNITZ, J.M.; POLING, B.E. The properties of Gases and Liquids, 4th edition, McGraw-Hill, 1987.
         '''
         
-        self.__cursor.execute('SELECT * FROM Propriedades_puras WHERE  ID_componente=?',(self.ID,))
-        row = self.__cursor.fetchall() # linha do banco de dados para o ID
+        row = self.__banco.consultar('Propriedades_puras','*',ID_componente=self.ID) # linha do banco de dados para o ID
 
         #==============================================================================
         # PROPRIEDADES DA SUBSTÂNCIA (Tc,Pc,Fator acêtrico(w),Massa molar (MM),radius_giration,Fator de Compressibilidade crítico(Zc)
@@ -505,8 +504,7 @@ class Componente_Caracterizar:
         
         if self.eqPsat == self.__lista_EqPsat[0]:
             
-            self.__cursor.execute('SELECT * FROM Parametros_Psat_Prausnitz_4th_edition WHERE  ID_componente=? AND ID_forma=?',(self.ID,self.nEqPsat))
-            row = self.__cursor.fetchall() 
+            row = self.__banco.consultar('Parametros_Psat_Prausnitz_4th_edition','*',ID_componente=self.ID,ID_forma=self.nEqPsat)
             
             #==============================================================================
             # PARÂMETROS PARA O CÁLCULO DE PSAT FORNECIDO PELO Prausnitz_4th_edition 
@@ -534,6 +532,11 @@ class Componente_Caracterizar:
         
 class Modelo:
 
+    # Atributos recortados pelo método Subsistema: matrizes NC x NC (parâmetros dos pares de componentes) e listas com um
+    # elemento por componente
+    _matrizes = ()
+    _vetores  = ()
+
     def __init__(self,Componentes):
         u'''
         Classe auxiliar para facilitar as buscas e validações dos parâmetros dos modelos.
@@ -568,27 +571,88 @@ class Modelo:
             * Método usado para realizar a busca das possíveis formas de equação para determinada mistura e determinado modelo. Vide documentação do método.
         * ``ValidacaoFormaEq``:
             * Método utilizado para validar a forma de equação inserida. Vide documentação do método.
+        * ``Kernel``:
+            * Método que retorna o kernel do modelo de coeficiente de atividade. Vide documentação do método.
+        * ``Subsistema``:
+            * Método que retorna o modelo de uma parte dos componentes, sem novas buscas no Banco de dados. Vide documentação do método.
         '''
         
         #==============================================================================
         #         CONEXAO COM O BANCO DE DADOS
         #==============================================================================
-        self.__conector = connect('THERMO_DATA_BANK_EXEMPLO.db')  # Conecta a rotina ao banco de dados
-        self.__cursor = self.__conector.cursor()
+        self.__banco = abrir_banco() # Conecta a rotina ao banco de dados (ou ao seu snapshot, vide rotina Banco)
 
         #==============================================================================
         #         VALIDA SE A ENTRADA Componentes É UM OBJETO DA CLASSE Componente_Caracterizar        
         #==============================================================================
         teste                 = [isinstance(elemento,Componente_Caracterizar) for elemento in Componentes]
         if False in teste:
-            raise NameError(u'A entrada Componentes não é um objeto da classe Componente_Caracterizar (Vide documentação da classe).')
+            raise Erro_Nome(u'A entrada Componentes não é um objeto da classe Componente_Caracterizar (Vide documentação da classe).')
             
         #==============================================================================
         #         BUSCA DOS ID'S    
         #==============================================================================
         self.__ID_Componentes = [Componente.ID for Componente in Componentes] # Criação da lista com as ID's dos componentes
         
-    def Busca_Parametros(self,tabela,coluna,IDFORMA=False):
+    def Kernel(self,z_coordenacao=10.0):
+        u'''
+        Método que retorna o kernel do modelo de coeficiente de atividade (vide rotina ``Kernel``), com as constantes do
+        modelo pré-processadas. O kernel é criado na primeira chamada, para cada número de coordenação, e reutilizado nas
+        seguintes. Disponível para os modelos UNIQUAC, NRTL, WILSON, Van_Laar e UNIFAC.
+        
+        ========
+        Entradas
+        ========
+        
+        * z_coordenacao (float): Número de coordenação, utilizado apenas pelos modelos UNIQUAC e UNIFAC.
+        '''
+        kernels = self.__dict__.setdefault('_kernels',{})
+        if z_coordenacao not in kernels:
+            kernels[z_coordenacao] = self._Criar_Kernel(z_coordenacao)
+        return kernels[z_coordenacao]
+
+    def Subsistema(self,indices):
+        u'''
+        Método que retorna o modelo de uma parte dos componentes (Ex.: os componentes de uma seção de coluna de um sistema
+        maior). Os parâmetros do subsistema são recortados dos parâmetros deste modelo, sem novas buscas no Banco de dados.
+        A faixa de temperatura e as formas de equação não são validadas novamente.
+        
+        ========
+        Entradas
+        ========
+        
+        * indices (list): Índices dos componentes do subsistema, na ordem desejada, na lista de componentes deste modelo.
+        
+        =======
+        Exemplo 
+        =======
+        
+        ::
+        
+            Componentes = [Comp1,Comp2,Comp3]
+            modelo      = UNIQUAC(Componentes,330.0,1)
+            
+            modelo_13   = modelo.Subsistema([0,2]) # Equivalente a UNIQUAC([Comp1,Comp3],330.0,1)
+        '''
+        NC      = len(self.__ID_Componentes)
+        indices = [int(i) for i in indices]
+        if len(indices) == 0 or len(set(indices)) != len(indices) or min(indices) < 0 or max(indices) >= NC:
+            raise Erro_Valor(u'Os índices do subsistema devem ser distintos e pertencer ao intervalo [0, %d].'%(NC-1,))
+        
+        subsistema = copy(self)
+        subsistema.__ID_Componentes = [self.__ID_Componentes[i] for i in indices]
+        subsistema._kernels         = {}
+        for atributo in self._matrizes:
+            matriz = getattr(self,atributo,None)
+            if matriz is not None:
+                setattr(subsistema,atributo,[[matriz[i][j] for j in indices] for i in indices])
+        for atributo in self._vetores:
+            vetor = getattr(self,atributo,None)
+            if vetor is not None:
+                setattr(subsistema,atributo,[vetor[i] for i in indices])
+        return subsistema
+
+    def Busca_Parametros(self,tabela,coluna,IDFORMA=False,padrao=None):
         u'''
         Método utilizado para busca dos parâmetros dos modelos.
         
@@ -598,7 +662,8 @@ class Modelo:
         
         * tabela (str): Nome da tabela, conforme consta no Banco de dados, na qual a coluna se encontra;
         * coluna (str): Nome da coluna, conforme consta no Banco de dados, da qual deseja-se buscar o parâmetro;
-        * IDFORMA (int): O ID da forma da equação desejada, vide documentação do Banco de dados. Caso o modelo inserido não possua diferentes formas de equações, esta entrada não é necessária.
+        * IDFORMA (int): O ID da forma da equação desejada, vide documentação do Banco de dados. Caso o modelo inserido não possua diferentes formas de equações, esta entrada não é necessária;
+        * padrao (float): Valor utilizado para os pares de componentes que não constam no Banco de dados. Caso não seja inserido, a ausência de um par resulta em erro.
                 
         ======
         Saídas
@@ -643,12 +708,13 @@ class Modelo:
         for i,ID_i in enumerate(self.__ID_Componentes):
             for j,ID_j in enumerate(self.__ID_Componentes):
                 if IDFORMA == False:
-                    selecao = 'SELECT '+coluna+' FROM '+tabela+' WHERE ID_componente_i=? AND ID_componente_j=? '
+                    row = self.__banco.consultar(tabela,[coluna],ID_componente_i=ID_i,ID_componente_j=ID_j)
                 else:
-                    selecao = 'SELECT '+coluna+' FROM '+tabela+' WHERE ID_forma=%d AND ID_componente_i=? AND ID_componente_j=? '%IDFORMA
-                self.__cursor.execute(selecao,(ID_i,ID_j))
-                row = self.__cursor.fetchall() 
-                retorno[i][j] = row[0][0]
+                    row = self.__banco.consultar(tabela,[coluna],ID_forma=IDFORMA,ID_componente_i=ID_i,ID_componente_j=ID_j)
+                if len(row) == 0 and padrao is not None:
+                    retorno[i][j] = padrao # Par de componentes ausente no Banco de dados
+                else:
+                    retorno[i][j] = row[0][0]
                 
         return retorno
     
@@ -669,15 +735,13 @@ class Modelo:
         #==============================================================================
         #         Busca da faixa de temperatura no banco de dados        
         #==============================================================================        
-        selecao    =  'SELECT TempMin, TempMax FROM '+tabela+' WHERE ID_componente_i=? AND ID_componente_j=? AND ID_forma=?'      
-        self.__cursor.execute(selecao,(self.__ID_Componentes[0],self.__ID_Componentes[1],FormaEq)) 
-        faixa      =  self.__cursor.fetchall()
+        faixa      =  self.__banco.consultar(tabela,['TempMin','TempMax'],ID_componente_i=self.__ID_Componentes[0],ID_componente_j=self.__ID_Componentes[1],ID_forma=FormaEq)
 
         #==============================================================================
         #         Validação da temperatura
         #==============================================================================
         if T < faixa[0][0] or T > faixa[0][1]:
-            warn(u'A temperatura especificada está fora da faixa de aplicabilidade da mistura utilizada para o modelo desejado. A temperatura deve pertencer ao intervalo: (%f, '%faixa[0][0]+'%f).'%faixa[0][1]) # Emite um aviso quando a temperatura está fora da faixa de aplicação. Contudo o programa continua a rodar
+            diagnostico_padrao.avisar('modelo_faixa_temperatura',tabela=tabela,T=T,Tmin=faixa[0][0],Tmax=faixa[0][1]) # Emite um aviso quando a temperatura está fora da faixa de aplicação. Contudo o programa continua a rodar
 
         
     def FormaEquacao(self,tabela):
@@ -699,8 +763,7 @@ class Modelo:
         '''
         self.tabela = tabela # Criação do atributo tabela
         
-        self.__cursor.execute('SELECT ID_forma FROM '+self.tabela+' WHERE ID_componente_i=? AND ID_componente_j=?',(self.__ID_Componentes[0],self.__ID_Componentes[1]))
-        row                 = self.__cursor.fetchall() # linha contendo as formas de equações disponíveis em forma de lista de tupla..
+        row                 = self.__banco.consultar(self.tabela,['ID_forma'],ID_componente_i=self.__ID_Componentes[0],ID_componente_j=self.__ID_Componentes[1]) # linha contendo as formas de equações disponíveis em forma de lista de tupla..
         self.lista_forma_eq = [i[0] for i in row] # Criação do atriubto lista_forma_eq em forma de lista de inteiros.
         
          
@@ -721,12 +784,14 @@ class Modelo:
             if len(self.lista_forma_eq) == 1:            # Caso haja apenas uma forma de equação, dados banco tem tamanho 1
                 self.formaEq = self.lista_forma_eq[0]    # Como não seja inserida a forma de equação, o programa usará a única forma disponível
             else: # Caso haja mais de uma forma de equação disponível no banco de dados
-                raise ValueError(u'Foi escolhido o modelo %s. No entanto, é necessário informar expressamente a forma da equaçao (Vide documentação do Banco de dados), visto que há diferentes opções disponíveis para a mistura desejada: '%(self.tabela,)+', '.join(str(model) for model in self.lista_forma_eq)+'.')         
+                raise Erro_Valor(u'Foi escolhido o modelo %s. No entanto, é necessário informar expressamente a forma da equaçao (Vide documentação do Banco de dados), visto que há diferentes opções disponíveis para a mistura desejada: '%(self.tabela,)+', '.join(str(model) for model in self.lista_forma_eq)+'.')         
         
         if self.formaEq not in self.lista_forma_eq: # Caso a forma da equação inserida não conste no banco de dados
-            raise ValueError(u'A forma de equação inserida não consta no Banco de dados para a mistura e o modelo desejados (Vide documentação do Banco de dados). Para o caso requerido, as formas de equações disponíveis são: '+', '.join(str(model) for model in self.lista_forma_eq)+'.')
+            raise Erro_Valor(u'A forma de equação inserida não consta no Banco de dados para a mistura e o modelo desejados (Vide documentação do Banco de dados). Para o caso requerido, as formas de equações disponíveis são: '+', '.join(str(model) for model in self.lista_forma_eq)+'.')
                 
 class VIRIAL(Modelo):
+    
+    _matrizes = ('coef_solv','k_int_binaria')
    
     def __init__(self,Componentes,regra_mistura='Hayden_o_Connel',parametro_int=None):
         u'''
@@ -798,8 +863,8 @@ class VIRIAL(Modelo):
         #         MOSTRAR REGRAS DISPONÍVEIS
         #==============================================================================
         if Componentes == None:
-            print u'As seguintes regras de mistura estão disponíveis: '+', '.join(self.__regras_mistura_disponiveis)+'.'
-            raise NameError(u'Insira uma das regras mostradas na lista.')       
+            print (u'As seguintes regras de mistura estão disponíveis: '+', '.join(self.__regras_mistura_disponiveis)+'.').encode(sys.stdout.encoding or 'utf-8','replace')
+            raise Erro_Nome(u'Insira uma das regras mostradas na lista.')       
     
         #==============================================================================
         #         BUSCA ID NA CLASSE MÃE (CLASSE MODELO)  
@@ -822,7 +887,7 @@ class VIRIAL(Modelo):
             else:
                 self.coef_solv  = parametro_int
         
-        self._Modelo__conector.close()
+        self._Modelo__banco.fechar()
             
     def ValidacaoREGRA(self):
         u'''
@@ -831,10 +896,13 @@ class VIRIAL(Modelo):
         '''
         self.__regras_mistura_disponiveis = ['Hayden_o_Connel','Tsonopoulos'] 
         if self.regra_mistura not in self.__regras_mistura_disponiveis:
-            raise NameError(u'A regra de mistura inserida não está disponível. Regras disponíveis: '+'%, '.join(self.__regras_mistura_disponiveis)+'.')
+            raise Erro_Nome(u'A regra de mistura inserida não está disponível. Regras disponíveis: '+'%, '.join(self.__regras_mistura_disponiveis)+'.')
     
 
 class UNIQUAC(Modelo):
+    
+    _matrizes = ('parametro_int',)
+    _vetores  = ('r','q','ql')
    
     def __init__(self,Componentes,T,FormaEqUNIQUAC = None,parametro_int=None):
         u'''
@@ -894,6 +962,11 @@ class UNIQUAC(Modelo):
         #==============================================================================
         Modelo.__init__(self,Componentes)
         
+        # Parâmetros dos componentes, utilizados pelo kernel
+        self.r  = [Componente.r  for Componente in Componentes]
+        self.q  = [Componente.q  for Componente in Componentes]
+        self.ql = [Componente.ql for Componente in Componentes]
+        
         #==============================================================================
         #         FORMA DE EQUACAO 
         #==============================================================================
@@ -923,9 +996,14 @@ class UNIQUAC(Modelo):
         #==============================================================================
         #         ENCERRAR CONEXÃO COM O BANCO
         #==============================================================================         
-        self._Modelo__conector.close()
+        self._Modelo__banco.fechar()
+        
+    def _Criar_Kernel(self,z_coordenacao):
+        return Kernel_UNIQUAC(self.r,self.q,self.ql,self.parametro_int,self.formaEq,z_coordenacao)
          
 class NRTL(Modelo):
+    
+    _matrizes = ('parametro_int','alpha')
    
     def __init__(self,Componentes,T,FormaEqNRTL = None,parametro_int=None,alpha = None):
         u'''
@@ -1013,10 +1091,15 @@ class NRTL(Modelo):
         #==============================================================================
         #         ENCERRAR CONEXÃO COM O BANCO
         #==============================================================================        
-        self._Modelo__conector.close()
+        self._Modelo__banco.fechar()
+        
+    def _Criar_Kernel(self,z_coordenacao):
+        return Kernel_NRTL(self.parametro_int,self.alpha,self.formaEq)
 
 class WILSON(Modelo):
     
+    _matrizes = ('parametro_int',)
+    
     def __init__(self,Componentes,T,FormaEqWILSON = None,parametro_int=None):
         u'''
         Rotina para busca dos parâmetros do modelo de Wilson, vide [1].
@@ -1099,10 +1182,15 @@ class WILSON(Modelo):
         #==============================================================================
         #         ENCERRAR CONEXÃO COM O BANCO
         #==============================================================================
-        self._Modelo__conector.close()
+        self._Modelo__banco.fechar()
+        
+    def _Criar_Kernel(self,z_coordenacao):
+        return Kernel_Wilson(self.parametro_int)
         
 class Van_Laar(Modelo):
     
+    _matrizes = ('parametro',)
+    
     def __init__(self,Componentes,parametro=None):
         u'''
         Rotina para busca dos parâmetros do modelo de Wilson, vide [1].
@@ -1162,4 +1250,288 @@ class Van_Laar(Modelo):
         #==============================================================================
         #         ENCERRAR CONEXÃO COM O BANCO
         #==============================================================================
-        self._Modelo__conector.close()
+        self._Modelo__banco.fechar()
+        
+    def _Criar_Kernel(self,z_coordenacao):
+        return Kernel_Van_Laar(self.parametro)
+
+class UNIFAC(Modelo):
+    
+    _vetores = ('nu',)
+    
+    def __init__(self,Componentes,subgrupos=None):
+        u'''
+        Rotina para busca dos parâmetros do modelo UNIFAC, vide [1]. O modelo é de contribuição de grupos e não necessita de
+        parâmetros de interação binária entre os componentes, sendo útil para as misturas que não constam nas tabelas dos
+        demais modelos.
+        
+        ========
+        Entradas
+        ========
+        
+        * Componentes (list): É uma lista de objetos ``Componente_Caracterizar``, vide documentação da dessa classe;
+        * subgrupos (list): Uma lista, com um dicionário por componente, com o nome e o número de cada subgrupo (Ex.: ``{'CH3':1,'CH3CO':1}`` para a acetona). Caso não seja inserida, a divisão em subgrupos é buscada na tabela ``UNIFAC_componente_subgrupo`` do Banco de dados.
+        
+        =========
+        Atributos
+        =========
+        
+        * ``subgrupos``: Uma lista com os nomes dos subgrupos presentes na mistura;
+        * ``grupos_principais``: Uma lista com o ID do grupo principal de cada subgrupo;
+        * ``nu``: Uma lista de listas com o número de cada subgrupo (colunas) em cada componente (linhas);
+        * ``R_k``, ``Q_k``: Listas com os parâmetros de volume e área dos subgrupos;
+        * ``parametro_int``: Uma lista de listas com os parâmetros de interação a_mn (K) entre os grupos principais de cada par de subgrupos.
+                
+        =======
+        Exemplo 
+        =======
+        
+        Como já foi citado, a entrada ``Componentes`` é uma lista de objetos ``Componente_Caracterizar``, portanto
+        o primeiro passo para usar esta classe é acessar a classe ``Componente_Caracterizar``, vide documentação da
+        classe, da seguinte forma: ::
+        
+            Comp1 = Componente_Caracterizar('Acetona',ConfigPsat=('Prausnitz4th',1),T=330.0)
+            Comp2 = Componente_Caracterizar('Benzeno',ConfigPsat=('Prausnitz4th',1),T=330.0)
+
+        Em seguida, a classe ``UNIFAC`` pode ser acessada do seguinte modo: ::
+
+            modelo = UNIFAC([Comp1,Comp2])
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] FREDENSLUND, A.; JONES, R. L.; PRAUSNITZ, J. M. Group-contribution estimation of activity coefficients
+        in nonideal liquid mixtures. AIChE Journal, v. 21, n. 6, p. 1086–1099, nov. 1975.
+        '''
+        #==============================================================================
+        #         NOME DO MODELO
+        #==============================================================================
+        self.nome_modelo = 'UNIFAC' # Atributo útil para a rotina VLE
+        
+        #==============================================================================
+        #         BUSCA ID NA CLASSE MÃE (CLASSE MODELO)        
+        #==============================================================================
+        Modelo.__init__(self,Componentes)
+        
+        #==============================================================================
+        #         SUBGRUPOS E PARAMETROS DO MODELO
+        #==============================================================================
+        self.Busca_Subgrupos(Componentes,subgrupos)
+        self.parametro_int = self.Busca_Parametros_Grupos()
+
+        #==============================================================================
+        #         ENCERRAR CONEXÃO COM O BANCO
+        #==============================================================================
+        self._Modelo__banco.fechar()
+        
+    def Busca_Subgrupos(self,Componentes,subgrupos=None):
+        u'''
+        Método para busca da divisão dos componentes em subgrupos e dos parâmetros R e Q dos subgrupos.
+        
+        ======
+        Saídas
+        ======
+        
+        * Gera os atributos ``subgrupos``, ``grupos_principais``, ``nu``, ``R_k`` e ``Q_k``.
+        '''
+        banco = self._Modelo__banco
+        
+        #==============================================================================
+        #         SUBGRUPOS DE CADA COMPONENTE (ID_subgrupo -> quantidade)
+        #==============================================================================
+        contagem = []
+        for i,Componente in enumerate(Componentes):
+            if subgrupos is None:
+                row = banco.consultar('UNIFAC_componente_subgrupo',['ID_subgrupo','Quantidade'],ID_componente=Componente.ID)
+                if len(row) == 0:
+                    raise Erro_Valor(u'O componente %s não possui divisão em subgrupos do modelo UNIFAC no Banco de dados (tabela UNIFAC_componente_subgrupo). Informe os subgrupos pela entrada subgrupos.'%Componente.nome)
+                contagem.append(dict(row))
+            else:
+                contagem_i = {}
+                for nome,quantidade in subgrupos[i].items():
+                    row = banco.consultar('UNIFAC_subgrupo',['ID'],Nome=nome)
+                    if len(row) == 0:
+                        raise Erro_Valor(u'O subgrupo %s não consta no Banco de dados (tabela UNIFAC_subgrupo).'%nome)
+                    contagem_i[row[0][0]] = quantidade
+                contagem.append(contagem_i)
+        
+        #==============================================================================
+        #         PARAMETROS DOS SUBGRUPOS PRESENTES NA MISTURA
+        #==============================================================================
+        ID_subgrupos = sorted(set([ID for contagem_i in contagem for ID in contagem_i]))
+        self.subgrupos = []; self.grupos_principais = []; self.R_k = []; self.Q_k = []
+        for ID in ID_subgrupos:
+            nome, grupo, R_k, Q_k = banco.consultar('UNIFAC_subgrupo',['Nome','ID_grupo_principal','R','Q'],ID=ID)[0]
+            self.subgrupos.append(nome)
+            self.grupos_principais.append(grupo)
+            self.R_k.append(R_k)
+            self.Q_k.append(Q_k)
+        
+        self.nu = [[contagem_i.get(ID,0) for ID in ID_subgrupos] for contagem_i in contagem]
+        
+    def Busca_Parametros_Grupos(self):
+        u'''
+        Método para busca dos parâmetros de interação entre os grupos principais dos subgrupos presentes na mistura.
+        
+        ======
+        Saídas
+        ======
+        
+        * Este método retorna uma lista de listas com os parâmetros a_mn (K), com uma linha e uma coluna por subgrupo. Os subgrupos de um mesmo grupo principal não interagem (a_mn = 0).
+        '''
+        banco   = self._Modelo__banco
+        grupos  = self.grupos_principais
+        amn     = {}
+        for m in set(grupos):
+            for n in set(grupos):
+                if m == n:
+                    amn[m,n] = 0.0
+                    continue
+                row = banco.consultar('UNIFAC_parametros_interacao',['amn'],ID_grupo_principal_m=m,ID_grupo_principal_n=n)
+                if len(row) == 0:
+                    raise Erro_Valor(u'O parâmetro de interação entre os grupos principais %d e %d do modelo UNIFAC não consta no Banco de dados (tabela UNIFAC_parametros_interacao).'%(m,n))
+                amn[m,n] = row[0][0]
+        return [[amn[m,n] for n in grupos] for m in grupos]
+        
+    def Subsistema(self,indices):
+        u'''
+        Método que retorna o modelo de uma parte dos componentes (vide documentação do método na classe ``Modelo``). Os
+        subgrupos ausentes nos componentes do subsistema são removidos.
+        '''
+        subsistema = Modelo.Subsistema(self,indices)
+        presentes  = [k for k in xrange(len(self.subgrupos)) if algum([nu_i[k] for nu_i in subsistema.nu])]
+        
+        subsistema.nu                = [[nu_i[k] for k in presentes] for nu_i in subsistema.nu]
+        subsistema.subgrupos         = [self.subgrupos[k]         for k in presentes]
+        subsistema.grupos_principais = [self.grupos_principais[k] for k in presentes]
+        subsistema.R_k               = [self.R_k[k]               for k in presentes]
+        subsistema.Q_k               = [self.Q_k[k]               for k in presentes]
+        subsistema.parametro_int     = [[self.parametro_int[m][n] for n in presentes] for m in presentes]
+        return subsistema
+        
+    def _Criar_Kernel(self,z_coordenacao):
+        return Kernel_UNIFAC(self.nu,self.R_k,self.Q_k,self.parametro_int,z_coordenacao)
+
+class Cubica(Modelo):
+    
+    _matrizes = ('k_int_binaria',)
+    
+    def __init__(self,Componentes,parametro_int=None):
+        u'''
+        Classe base das equações de estado cúbicas na forma generalizada, vide [1]: ::
+        
+            P = R*T/(v-b) - a/(v**2 + u*b*v + w*b**2)
+            
+        As classes filhas (``SRK`` e ``Peng_Robinson``) definem o nome do modelo, a tabela do Banco de dados
+        com os parâmetros de interação binária e as constantes da equação.
+        
+        ========
+        Entradas
+        ========
+        
+        * Componentes (list): É uma lista de objetos ``Componente_Caracterizar``, vide documentação da dessa classe;
+        * parametro_int (list): Lista de listas com os parâmetros de interação binária kij. Caso não seja inserido, os parâmetros são buscados no Banco de dados.
+        
+            * Os pares de componentes que não constam no Banco de dados recebem kij = 0.
+        
+        =========
+        Atributos
+        =========
+        
+        * ``k_int_binaria``: Uma lista de listas contendo os parâmetros de interação binária kij da mistura desejada;
+        * ``u``, ``w`` (float): Constantes da forma generalizada da equação;
+        * ``Omega_a``, ``Omega_b`` (float): Constantes dos parâmetros a e b dos componentes puros;
+        * ``coef_m`` (tuple): Coeficientes do polinômio do fator acêntrico na função alpha: m = coef_m[0] + coef_m[1]*w + coef_m[2]*w**2.
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] REID, R.C.; PRAUSNITZ, J.M.; POLING, B.E. The properties of Gases and Liquids, 4th edition, McGraw-Hill, 1987.
+        '''
+        #==============================================================================
+        #         BUSCA ID NA CLASSE MÃE (CLASSE MODELO)        
+        #==============================================================================
+        Modelo.__init__(self,Componentes) 
+
+        #==============================================================================
+        #         PARAMETROS DO MODELO
+        #==============================================================================
+        if parametro_int == None:
+            self.k_int_binaria = self.Busca_Parametros(self.tabela,'kij',padrao=0.0) # Trasforma a def Parametros da classe Modelo em atributo da classe
+        else:
+            self.k_int_binaria = parametro_int
+            
+        #==============================================================================
+        #         ENCERRAR CONEXÃO COM O BANCO
+        #==============================================================================
+        self._Modelo__banco.fechar()
+        
+class SRK(Cubica):
+    
+    # Constantes da equação de Soave-Redlich-Kwong
+    nome_modelo = 'SRK' # Atributo útil para a rotina VLE
+    tabela      = 'SRK'
+    u           = 1.0
+    w           = 0.0
+    Omega_a     = 0.42748
+    Omega_b     = 0.08664
+    coef_m      = (0.480,1.574,-0.176)
+    
+    def __init__(self,Componentes,parametro_int=None):
+        u'''
+        Rotina para busca dos parâmetros da equação de estado de Soave-Redlich-Kwong, vide [1]. Vide documentação da classe ``Cubica``.
+        
+        =======
+        Exemplo 
+        =======
+        
+        A classe ``SRK`` pode ser acessada do seguinte modo: ::
+        
+            Comp1 = Componente_Caracterizar('Metano',ConfigPsat=('Prausnitz4th',1),T=100.0)
+            Comp2 = Componente_Caracterizar('Etano',ConfigPsat=('Prausnitz4th',1),T=289.9)
+            
+            modelo = SRK([Comp1,Comp2])
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] SOAVE, G. Equilibrium constants from a modified Redlich-Kwong equation of state. Chem. Eng. Sci. 27 (1972) 1197–1203.
+        '''
+        Cubica.__init__(self,Componentes,parametro_int)
+        
+class Peng_Robinson(Cubica):
+    
+    # Constantes da equação de Peng-Robinson
+    nome_modelo = 'Peng-Robinson' # Atributo útil para a rotina VLE
+    tabela      = 'Peng-Robinson'
+    u           = 2.0
+    w           = -1.0
+    Omega_a     = 0.45724
+    Omega_b     = 0.07780
+    coef_m      = (0.37464,1.54226,-0.26992)
+    
+    def __init__(self,Componentes,parametro_int=None):
+        u'''
+        Rotina para busca dos parâmetros da equação de estado de Peng-Robinson, vide [1]. Vide documentação da classe ``Cubica``.
+        
+        =======
+        Exemplo 
+        =======
+        
+        A classe ``Peng_Robinson`` pode ser acessada do seguinte modo: ::
+        
+            Comp1 = Componente_Caracterizar('Metano',ConfigPsat=('Prausnitz4th',1),T=100.0)
+            Comp2 = Componente_Caracterizar('Etano',ConfigPsat=('Prausnitz4th',1),T=289.9)
+            
+            modelo = Peng_Robinson([Comp1,Comp2])
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] PENG, D.-Y.; ROBINSON, D. B. A New Two-Constant Equation of State. Ind. Eng. Chem. Fundam. 15 (1976) 59–64.
+        '''
+        Cubica.__init__(self,Componentes,parametro_int)
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina para a medição do desempenho dos cálculos de equilíbrio líquido-vapor.
+
+Os casos utilizam os componentes e parâmetros do banco de dados THERMO_DATA_BANK_EXEMPLO.db e cobrem:
+    - Importacao: tempo de importação das rotinas de cálculo (Conexao e VLE) em um processo novo, além do numpy e do
+      sqlite3, comparado ao orçamento ORCAMENTO_IMPORTACAO. As rotinas de cálculo não devem importar os módulos de
+      MODULOS_PROIBIDOS (Ex.: o matplotlib é importado pela rotina Graficos apenas na construção do primeiro gráfico)
+    - Coeficiente_Atividade: UNIQUAC (formas 1, 2 e 3), NRTL (formas 1, 2 e 3), Wilson, Van Laar e UNIFAC
+    - Second_Virial_Coef: regras de Hayden O'Connel e Tsonopoulos
+    - PhiSat
+    - PontoBolha_P, PontoBolha_T, PontoOrvalho_P e PontoOrvalho_T (e as respectivas versões em lote)
+    - Flash e Flash_Lote
+    - Predicao (temperatura e pressão constantes)
+
+As formas de equação que não constam no banco de dados (Ex.: UNIQUAC forma 3) utilizam os parâmetros da forma 1
+convertidos, de modo que os coeficientes calculados são os mesmos.
+
+Os resultados são escritos no formato JSON, um registro por linha (JSON lines). O primeiro registro descreve o ambiente
+e os demais, os casos, com as chaves:
+    - caso, metodo, sistema: Identificação do caso
+    - chamadas: Número de chamadas realizadas
+    - pontos: Número de pontos (composições) calculados por chamada
+    - tempo_total, tempo_chamada: Tempo de parede total e por chamada (s), sendo este a mediana das chamadas
+    - chamadas_por_segundo, pontos_por_segundo
+    - iteracoes: Dicionário com a média e o máximo do número de iterações (quando disponível)
+    - erro: Mensagem de erro, caso o cálculo não possa ser realizado (as demais chaves ficam vazias)
+    - orcamento, proibidos, aprovado: Orçamento (s), módulos proibidos importados e resultado da verificação (apenas no
+      caso Importacao)
+
+O comando termina com erro caso o caso Importacao não seja aprovado.
+
+Uso: ::
+
+    python Desempenho.py [-r REPETICOES] [-s SAIDA] [-f FILTRO] [--orcamento-importacao SEGUNDOS]
+"""
+import os
+import sys
+import json
+import platform
+import subprocess
+from argparse import ArgumentParser
+from time import time, strftime
+
+import numpy
+from numpy import array, linspace, column_stack, median, exp
+
+from Conexao import Componente_Caracterizar, UNIQUAC, NRTL, WILSON, Van_Laar, UNIFAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico, diagnostico_padrao
+from Erros import texto_utf8
+
+R = 83.144621 # em cm3.bar/ K.mol
+
+ORCAMENTO_IMPORTACAO = 0.075                 # Tempo máximo de importação de Conexao e VLE, além do numpy e do sqlite3 / s
+MODULOS_PROIBIDOS    = ['scipy','matplotlib'] # Módulos que não devem ser importados pelas rotinas de cálculo
+
+# Script executado em um processo novo para a medição do tempo de importação
+_IMPORTACAO = '''
+import sys, json
+from time import time
+inicio = time()
+import numpy, sqlite3
+base = time()
+import Conexao, VLE
+fim = time()
+sys.stdout.write(json.dumps({'rotinas':fim-base,'modulos':sorted(set([nome.split('.')[0] for nome in sys.modules if sys.modules[nome] is not None]))}))
+'''
+
+def Sistema(nomes,T):
+    u'''
+    Caracterização dos componentes de um sistema, à temperatura T em Kelvin.
+    '''
+    return [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=T) for nome in nomes]
+
+def Calculo(Componentes,model_liq,model_vap,**kwargs):
+    u'''
+    Criação do objeto ``VLE`` utilizado nos casos, com o coletor de diagnósticos no nível 'silencioso'.
+    '''
+    return VLE('Coeficiente_Atividade',Componentes,model_liq,model_vap,diagnostico=Diagnostico('silencioso'),**kwargs)
+
+def Iteracoes(*condicoes):
+    u'''
+    Resumo do número de iterações dos objetos ``Condicao`` (média e máximo).
+    '''
+    valores = [array(condicao.iteracoes,dtype=float).reshape(-1) for condicao in condicoes if getattr(condicao,'iteracoes',None) is not None]
+    if len(valores) == 0:
+        return None
+    valores = numpy.concatenate(valores)
+    return {'media':float(valores.mean()),'max':int(valores.max())}
+
+def Casos():
+    u'''
+    Gerador dos casos do benchmark. Cada caso é um dicionário com as chaves ``caso``, ``metodo``, ``sistema``, ``pontos`` e
+    ``preparo``. O preparo é uma função que cria os objetos necessários e retorna a função medida e a função que extrai
+    o número de iterações da última chamada (ou None).
+    '''
+    x_lote = column_stack((linspace(0.01,0.99,500),1-linspace(0.01,0.99,500)))
+
+    #==============================================================================
+    #         COEFICIENTE DE ATIVIDADE
+    #==============================================================================
+    def Atividade(nomes,T,modelo):
+        def preparo():
+            C = Sistema(nomes,T)
+            calculo = Calculo(C,modelo(C),VIRIAL(C,'Tsonopoulos') if nomes[0] == 'Metano' else VIRIAL(C))
+            return (lambda: calculo.Coeficiente_Atividade([0.3,0.7],T)), None
+        return preparo
+
+    def Atividade_Lote(nomes,T,modelo):
+        def preparo():
+            C = Sistema(nomes,T)
+            calculo = Calculo(C,modelo(C),VIRIAL(C,'Tsonopoulos') if nomes[0] == 'Metano' else VIRIAL(C))
+            return (lambda: calculo.Coeficiente_Atividade_Lote(x_lote,T)), None
+        return preparo
+
+    def UNIQUAC_forma(forma):
+        # Formas 2 e 3 a partir dos parâmetros da forma 1 (tau = exp(-a/T))
+        def modelo(C):
+            if forma == 1:
+                return UNIQUAC(C,340.0,1)
+            a = array(UNIQUAC(C,340.0,1).parametro_int)
+            return UNIQUAC(C,340.0,forma,parametro_int=(exp(-a/340.0) if forma == 2 else a).tolist())
+        return modelo
+
+    def NRTL_forma(forma):
+        # Formas 2 e 3 a partir dos parâmetros da forma 1 (tau = g/RT)
+        def modelo(C):
+            base = NRTL(C,330.0,1)
+            if forma == 1:
+                return base
+            g = array(base.parametro_int)
+            return NRTL(C,330.0,forma,parametro_int=(g/(R*330.0) if forma == 2 else g).tolist(),alpha=base.alpha)
+        return modelo
+
+    atividade = [('UNIQUAC forma 1',('Acetona','Etanol'),340.0,UNIQUAC_forma(1)),
+                 ('UNIQUAC forma 2',('Acetona','Etanol'),340.0,UNIQUAC_forma(2)),
+                 ('UNIQUAC forma 3',('Acetona','Etanol'),340.0,UNIQUAC_forma(3)),
+                 ('NRTL forma 1',('Acetona','Metanol'),330.0,NRTL_forma(1)),
+                 ('NRTL forma 2',('Acetona','Metanol'),330.0,NRTL_forma(2)),
+                 ('NRTL forma 3',('Acetona','Metanol'),330.0,NRTL_forma(3)),
+                 ('Wilson',('Metanol','o-Xileno'),350.0,lambda C: WILSON(C,350.0)),
+                 ('Van Laar',('Metano','Etano'),170.0,lambda C: Van_Laar(C)),
+                 ('UNIFAC',('Acetona','Etanol'),340.0,lambda C: UNIFAC(C))]
+
+    for nome, nomes, T, modelo in atividade:
+        yield {'caso':'Coeficiente_Atividade '+nome,'metodo':'Coeficiente_Atividade','sistema':'-'.join(nomes),'pontos':1,
+               'preparo':Atividade(nomes,T,modelo)}
+        yield {'caso':'Coeficiente_Atividade_Lote '+nome,'metodo':'Coeficiente_Atividade_Lote','sistema':'-'.join(nomes),'pontos':x_lote.shape[0],
+               'preparo':Atividade_Lote(nomes,T,modelo)}
+
+    #==============================================================================
+    #         SEGUNDO COEFICIENTE VIRIAL E PHISAT
+    #==============================================================================
+    def Virial(nomes,regra):
+        def preparo():
+            C = Sistema(nomes,340.0)
+            calculo = Calculo(C,UNIQUAC(C,340.0,1),VIRIAL(C,regra))
+            return (lambda: calculo.Second_Virial_Coef(340.0)), None
+        return preparo
+
+    for regra in ['Hayden_o_Connel','Tsonopoulos']:
+        yield {'caso':'Second_Virial_Coef '+regra,'metodo':'Second_Virial_Coef','sistema':'Etanol-Benzeno','pontos':1,
+               'preparo':Virial(('Etanol','Benzeno'),regra)}
+
+    def Phisat():
+        C = Sistema(('Acetona','Etanol'),340.0)
+        calculo = Calculo(C,UNIQUAC(C,340.0,1),VIRIAL(C))
+        return (lambda: calculo.PhiSat(340.0)), None
+
+    yield {'caso':'PhiSat','metodo':'PhiSat','sistema':'Acetona-Etanol','pontos':1,'preparo':Phisat}
+
+    #==============================================================================
+    #         PONTOS DE BOLHA E DE ORVALHO, FLASH E PREDICAO
+    #==============================================================================
+    def Blocos_Predicao(calculo):
+        # Os resultados da Predicao binária não mantêm o número de iterações (vide VLE.Predicao): os blocos de
+        # Predicao_Iterativa da última chamada são registrados
+        blocos    = []
+        iterativa = calculo.Predicao_Iterativa
+        def registrar(*args,**kwargs):
+            del blocos[:]
+            for bloco in iterativa(*args,**kwargs):
+                blocos.append(bloco)
+                yield bloco
+        calculo.Predicao_Iterativa = registrar
+        return blocos
+
+    def Algoritmo(metodo,argumentos,fases):
+        def preparo():
+            C = Sistema(('Acetona','Etanol'),340.0)
+            calculo = Calculo(C,UNIQUAC(C,340.0,1),VIRIAL(C),Pressao=1.013,maxiter=500)
+            funcao  = getattr(calculo,metodo)
+            if metodo == 'Predicao':
+                blocos = Blocos_Predicao(calculo)
+                return (lambda: funcao(*argumentos)), (lambda: Iteracoes(*[bloco[fase] for bloco in blocos for fase in fases]))
+            return (lambda: funcao(*argumentos)), (lambda: Iteracoes(*[getattr(calculo,fase) for fase in fases]))
+        return preparo
+
+    algoritmos = [('PontoBolha_P',([0.3,0.7],340.0),['Bolha'],1),
+                  ('PontoBolha_T',([0.3,0.7],1.013),['Bolha'],1),
+                  ('PontoOrvalho_P',([0.3,0.7],340.0),['Orvalho'],1),
+                  ('PontoOrvalho_T',([0.3,0.7],1.013),['Orvalho'],1),
+                  ('Flash',([0.3,0.7],340.0,1.0),['condicao_global'],1),
+                  ('PontoBolha_P_Lote',(x_lote,340.0),['Bolha'],x_lote.shape[0]),
+                  ('PontoBolha_T_Lote',(x_lote,1.013),['Bolha'],x_lote.shape[0]),
+                  ('PontoOrvalho_P_Lote',(x_lote,340.0),['Orvalho'],x_lote.shape[0]),
+                  ('PontoOrvalho_T_Lote',(x_lote,1.013),['Orvalho'],x_lote.shape[0]),
+                  ('Flash_Lote',(x_lote,340.0,1.0),['condicao_global'],x_lote.shape[0]),
+                  ('Predicao',('temperatura',340.0),['Bolha','Orvalho'],2500),
+                  ('Predicao',('pressao',1.013),['Bolha','Orvalho'],2500)]
+
+    for metodo, argumentos, fases, pontos in algoritmos:
+        caso = metodo if metodo != 'Predicao' else metodo+' '+argumentos[0]
+        yield {'caso':caso,'metodo':metodo,'sistema':'Acetona-Etanol','pontos':pontos,'preparo':Algoritmo(metodo,argumentos,fases)}
+
+def Medir(caso,repeticoes):
+    u'''
+    Execução de um caso ``repeticoes`` vezes (após uma chamada de aquecimento). Retorna o registro do caso.
+    '''
+    registro = dict((chave,caso[chave]) for chave in ['caso','metodo','sistema','pontos'])
+    try:
+        funcao, iteracoes = caso['preparo']()
+        funcao() # Chamada de aquecimento (caches e importações)
+        tempos = []
+        for i in xrange(repeticoes):
+            inicio = time()
+            funcao()
+            tempos.append(time() - inicio)
+    except Exception as erro:
+        registro.update({'chamadas':0,'tempo_total':None,'tempo_chamada':None,'chamadas_por_segundo':None,
+                         'pontos_por_segundo':None,'iteracoes':None,'erro':u'%s: %s'%(type(erro).__name__,unicode(erro))})
+        return registro
+
+    tempo_chamada = float(median(tempos))
+    registro.update({'chamadas':repeticoes,'tempo_total':float(sum(tempos)),'tempo_chamada':tempo_chamada,
+                     'chamadas_por_segundo':1.0/tempo_chamada if tempo_chamada > 0 else None,
+                     'pontos_por_segundo':caso['pontos']/tempo_chamada if tempo_chamada > 0 else None,
+                     'iteracoes':iteracoes() if iteracoes is not None else None,'erro':None})
+    return registro
+
+def Importacao(repeticoes,orcamento=ORCAMENTO_IMPORTACAO):
+    u'''
+    Medição do tempo de importação das rotinas de cálculo, cada chamada em um processo novo (após uma chamada de
+    aquecimento, que compila as rotinas). Retorna o registro do caso Importacao.
+    '''
+    registro = {'caso':'Importacao','metodo':'importacao','sistema':'-','pontos':1,'orcamento':orcamento}
+    try:
+        medidas = []
+        for i in xrange(repeticoes+1):
+            saida = subprocess.check_output([sys.executable,'-c',_IMPORTACAO],cwd=os.path.dirname(os.path.abspath(__file__)))
+            medidas.append(json.loads(saida))
+    except Exception as erro:
+        registro.update({'chamadas':0,'tempo_total':None,'tempo_chamada':None,'chamadas_por_segundo':None,
+                         'pontos_por_segundo':None,'iteracoes':None,'erro':u'%s: %s'%(type(erro).__name__,unicode(erro)),
+                         'proibidos':None,'aprovado':False})
+        return registro
+
+    tempos        = [medida['rotinas'] for medida in medidas[1:]]
+    tempo_chamada = float(median(tempos))
+    proibidos     = sorted(set([modulo for medida in medidas for modulo in medida['modulos'] if modulo in MODULOS_PROIBIDOS]))
+    registro.update({'chamadas':repeticoes,'tempo_total':float(sum(tempos)),'tempo_chamada':tempo_chamada,
+                     'chamadas_por_segundo':1.0/tempo_chamada if tempo_chamada > 0 else None,
+                     'pontos_por_segundo':None,'iteracoes':None,'erro':None,'proibidos':proibidos,
+                     'aprovado':tempo_chamada <= orcamento and len(proibidos) == 0})
+    return registro
+
+def Ambiente():
+    u'''
+    Registro do ambiente de execução.
+    '''
+    return {'caso':'ambiente','data':strftime('%Y-%m-%d %H:%M:%S'),'python':platform.python_version(),
+            'numpy':numpy.__version__,'plataforma':platform.platform()}
+
+def executar(repeticoes=20,filtro=None,saida=sys.stdout,orcamento_importacao=ORCAMENTO_IMPORTACAO):
+    u'''
+    Execução do benchmark.
+
+    ========
+    Entradas
+    ========
+
+    * repeticoes (int): Número de chamadas medidas de cada caso;
+    * filtro (str): Apenas os casos cujo nome contém o texto são executados;
+    * saida (file): Arquivo em que os registros são escritos (um registro JSON por linha);
+    * orcamento_importacao (float): Orçamento do caso Importacao, em segundos.
+
+    ======
+    Saídas
+    ======
+
+    * Retorna a lista de registros.
+    '''
+    nivel = diagnostico_padrao.nivel
+    diagnostico_padrao.nivel = 'silencioso' # Avisos da caracterização dos componentes e modelos
+    try:
+        registros = [Ambiente()]
+        saida.write(json.dumps(registros[0])+'\n')
+        if filtro is None or filtro in 'Importacao':
+            registros.append(Importacao(repeticoes,orcamento_importacao))
+            saida.write(json.dumps(registros[-1])+'\n')
+            saida.flush()
+        for caso in Casos():
+            if filtro is not None and filtro not in caso['caso']:
+                continue
+            registro = Medir(caso,repeticoes)
+            registros.append(registro)
+            saida.write(json.dumps(registro)+'\n')
+            saida.flush()
+    finally:
+        diagnostico_padrao.nivel = nivel
+    return registros
+
+if __name__ == '__main__':
+
+    argumentos = ArgumentParser(description=texto_utf8(u'Medição do desempenho dos cálculos de equilíbrio líquido-vapor.'))
+    argumentos.add_argument('-r','--repeticoes',type=int,default=20,help=texto_utf8(u'Número de chamadas medidas de cada caso.'))
+    argumentos.add_argument('-s','--saida',default=None,help=texto_utf8(u'Arquivo de saída (JSON lines). Padrão: saída padrão.'))
+    argumentos.add_argument('-f','--filtro',default=None,help=texto_utf8(u'Executa apenas os casos cujo nome contém o texto.'))
+    argumentos.add_argument('--orcamento-importacao',type=float,default=ORCAMENTO_IMPORTACAO,help=texto_utf8(u'Tempo máximo de importação das rotinas de cálculo, em segundos. Padrão: %g.'%ORCAMENTO_IMPORTACAO))
+    argumentos = argumentos.parse_args()
+
+    if argumentos.saida is None:
+        registros = executar(argumentos.repeticoes,argumentos.filtro,orcamento_importacao=argumentos.orcamento_importacao)
+    else:
+        with open(argumentos.saida,'w') as arquivo:
+            registros = executar(argumentos.repeticoes,argumentos.filtro,arquivo,argumentos.orcamento_importacao)
+    sys.exit(0 if all([registro.get('aprovado',True) for registro in registros]) else 1)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina para o registro dos diagnósticos (avisos de faixa de validade) emitidos durante
+os cálculos de equilíbrio líquido-vapor.
+
+Os eventos são registrados como contadores e, opcionalmente, como registros estruturados.
+Os avisos são emitidos, de forma resumida, apenas ao final de cada cálculo, de modo que as
+verificações realizadas dentro dos laços dos algoritmos possuem custo desprezível.
+
+Níveis de relatório disponíveis:
+
+- 'silencioso': os eventos são apenas contados;
+- 'resumo': os eventos são contados e, ao final do cálculo, é emitido um aviso por tipo de evento (padrão);
+- 'detalhado': além do resumo, são armazenados os registros estruturados de cada ocorrência.
+"""
+import sys
+from warnings import warn
+from functools import wraps
+from Erros import Erro_Nome
+
+# Mensagens dos eventos disponíveis. Os campos são preenchidos com os dados da última ocorrência.
+MENSAGENS = {'virial_pressao'           : u'A pressão do sistema (%(P)f bar) é superior à da validação da equação VIRIAL (%(P_lim)f bar), vide documentação da mesma.',
+             'psat_faixa_temperatura'   : u'A temperatura especificada está fora da faixa de aplicabilidade da equaçao de Psat. A temperatura de pertencer ao intervalo: (%(Tmin)f, %(Tmax)f).',
+             'modelo_faixa_temperatura' : u'A temperatura especificada está fora da faixa de aplicabilidade da mistura utilizada para o modelo desejado. A temperatura deve pertencer ao intervalo: (%(Tmin)f, %(Tmax)f).',
+             'nao_convergido'           : u'O algoritmo %(algoritmo)s não atingiu a tolerância (estado: %(status)s, critério de parada: %(residuo)g).'}
+
+def _Avisar(mensagem):
+    # Os avisos são emitidos na codificação da saída de erros (UTF-8 quando a saída é redirecionada), pois o módulo
+    # warnings descarta as mensagens que não podem ser escritas
+    warn(mensagem.encode(getattr(sys.stderr,'encoding',None) or 'utf-8','replace'))
+
+class Diagnostico:
+
+    def __init__(self,nivel='resumo',max_registros=1000):
+        u'''
+        Coletor de diagnósticos dos cálculos.
+
+        ========
+        Entradas
+        ========
+
+        * nivel (str): Nível de relatório: 'silencioso', 'resumo' ou 'detalhado';
+        * max_registros (int): Número máximo de registros estruturados armazenados no nível 'detalhado'.
+
+        =========
+        Atributos
+        =========
+
+        * ``contagem`` (dict): Número de ocorrências de cada evento;
+        * ``registros`` (list): Registros estruturados (dicionários) das ocorrências, apenas no nível 'detalhado'.
+
+        =======
+        Métodos
+        =======
+
+        * ``registrar``: Registra uma ocorrência de um evento, sem emitir aviso;
+        * ``avisar``: Registra uma ocorrência de um evento e emite o aviso imediatamente;
+        * ``emitir``: Emite um aviso resumido por tipo de evento registrado;
+        * ``relatorio``: Retorna os diagnósticos em forma de dicionário;
+        * ``limpar``: Apaga os diagnósticos registrados.
+
+        =======
+        Exemplo
+        =======
+
+        O coletor é passado à classe ``VLE``, vide documentação da classe: ::
+
+            >>> diagnostico = Diagnostico('detalhado')
+            >>> CalculoBolha = VLE('PontoBolha_T',Componentes,model_liq,model_vap,z=[0.95,0.05],Pressao=1.013,diagnostico=diagnostico)
+            >>> CalculoBolha.run()
+            >>> diagnostico.relatorio()
+        '''
+        niveis_disponiveis = ['silencioso','resumo','detalhado']
+        if nivel not in niveis_disponiveis:
+            raise Erro_Nome(u'O nível de relatório escolhido não está disponível. Níveis disponíveis: '+', '.join(niveis_disponiveis)+'.')
+
+        self.nivel         = nivel
+        self.max_registros = max_registros
+        self.__profundidade = 0 # Número de cálculos em execução (cálculos podem chamar outros cálculos)
+        self.limpar()
+
+    def limpar(self):
+        u'''
+        Método para apagar os diagnósticos registrados.
+        '''
+        self.contagem  = {}
+        self.registros = []
+        self.__ultimo  = {} # Dados da última ocorrência de cada evento, utilizados nas mensagens
+
+    def registrar(self,evento,ocorrencias=1,**dados):
+        u'''
+        Método para registrar as ocorrências de um evento. Não há emissão de aviso, vide ``emitir``.
+
+        ========
+        Entradas
+        ========
+
+        * evento (str): Nome do evento, conforme consta em ``MENSAGENS``;
+        * ocorrencias (int): Número de ocorrências registradas de uma só vez;
+        * dados: Dados da ocorrência (Ex.: T, P, componente).
+        '''
+        self.contagem[evento] = self.contagem.get(evento,0) + ocorrencias
+        self.__ultimo[evento] = dados
+        if self.nivel == 'detalhado' and len(self.registros) < self.max_registros:
+            dados['evento'] = evento
+            self.registros.append(dados)
+
+    def avisar(self,evento,**dados):
+        u'''
+        Método para registrar a ocorrência de um evento e emitir o aviso imediatamente (exceto no nível 'silencioso').
+        Utilizado nas validações que ocorrem fora dos laços dos algoritmos, como na caracterização dos componentes e modelos.
+        '''
+        self.registrar(evento,**dados)
+        if self.nivel != 'silencioso':
+            _Avisar(MENSAGENS[evento]%dados)
+
+    def emitir(self):
+        u'''
+        Método para emitir um aviso resumido para cada tipo de evento registrado (exceto no nível 'silencioso').
+        '''
+        if self.nivel == 'silencioso':
+            return
+        for evento in sorted(self.contagem.keys()):
+            _Avisar(MENSAGENS[evento]%self.__ultimo[evento]+u' Ocorrências: %d.'%self.contagem[evento])
+
+    def relatorio(self):
+        u'''
+        Método para acessar os diagnósticos.
+
+        ======
+        Saídas
+        ======
+
+        * Retorna um dicionário com as chaves ``nivel``, ``contagem`` e ``registros``.
+        '''
+        return {'nivel':self.nivel,'contagem':dict(self.contagem),'registros':list(self.registros)}
+
+    def iniciar(self):
+        u'''
+        Método chamado no início de um cálculo. Os diagnósticos são apagados apenas no início do cálculo mais externo.
+        '''
+        if self.__profundidade == 0:
+            self.limpar()
+        self.__profundidade += 1
+
+    def finalizar(self):
+        u'''
+        Método chamado ao final de um cálculo. Os avisos são emitidos apenas ao final do cálculo mais externo.
+        '''
+        self.__profundidade -= 1
+        if self.__profundidade == 0:
+            self.emitir()
+
+def solucao(metodo):
+    u'''
+    Decorador para os métodos de cálculo da classe ``VLE``. Delimita um cálculo para o coletor de
+    diagnósticos (atributo ``diagnostico``), de forma que os avisos sejam emitidos uma única vez ao final.
+    '''
+    @wraps(metodo)
+    def envoltorio(self,*args,**kwargs):
+        self.diagnostico.iniciar()
+        try:
+            return metodo(self,*args,**kwargs)
+        finally:
+            self.diagnostico.finalizar()
+    return envoltorio
+
+# Coletor utilizado na caracterização de componentes e modelos (rotina Conexao)
+diagnostico_padrao = Diagnostico()
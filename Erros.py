@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Exceções levantadas pelas rotinas de cálculo.
+
+As mensagens são textos unicode em português. No Python 2, ``str`` de uma exceção com mensagem unicode acentuada falha
+(as mensagens não tratadas são exibidas como ``<exception str() failed>``), de modo que as exceções abaixo convertem a
+mensagem para UTF-8. Cada exceção é uma subclasse da exceção padrão correspondente (Ex.: ``Erro_Valor`` de
+``ValueError``), e ``unicode(erro)`` continua retornando a mensagem original.
+
+A função ``texto_utf8`` realiza a mesma conversão para os textos das linhas de comando (descrições e ajudas do argparse
+e mensagens escritas na saída de erros): o argparse converte os textos unicode pela codificação ASCII quando a saída não é
+um terminal (Ex.: ``python Lote.py -h | less``), o que falha nos textos acentuados.
+"""
+
+def texto_utf8(texto):
+    u'''
+    Conversão de um texto unicode para UTF-8 (vide documentação da rotina). Os textos já codificados não são alterados.
+    '''
+    return texto.encode('utf-8') if isinstance(texto,unicode) else texto
+
+class _Mensagem_UTF8(object):
+
+    def __unicode__(self):
+        # O BaseException.__unicode__ recorre ao __str__ quando este é redefinido
+        if len(self.args) == 0:
+            return u''
+        if len(self.args) == 1:
+            return unicode(self.args[0])
+        return unicode(self.args)
+
+    def __str__(self):
+        return texto_utf8(unicode(self))
+
+class Erro_Valor(_Mensagem_UTF8,ValueError):
+    pass
+
+class Erro_Nome(_Mensagem_UTF8,NameError):
+    pass
+
+class Erro_Tipo(_Mensagem_UTF8,TypeError):
+    pass
+
+class Erro_Execucao(_Mensagem_UTF8,RuntimeError):
+    pass
@@ -17,11 +17,17 @@ Referências:
 
 @author: CaiqueFerreira
 """
-# Construção de gráficos
-from matplotlib.pyplot import figure, close, plot, xlabel, ylabel, title, xlim, legend, grid, show, figure, errorbar
 # Pacotes do sistema operacional
 from os import getcwd, sep, mkdir, path
 
+from Erros import Erro_Valor, Erro_Nome, Erro_Tipo
+# O matplotlib é importado apenas na construção do primeiro gráfico (vide _pyplot), de modo que a importação desta rotina
+# não adiciona o custo da importação do matplotlib aos cálculos.
+
+def _pyplot():
+    import matplotlib.pyplot # Construção de gráficos
+    return matplotlib.pyplot
+
 class Graficos:
 
     def __init__(self,**kwargs):
@@ -134,11 +140,14 @@ class Graficos:
         self.T_incertezas = kwargs.get(self.__keywordsEntrada[6])
         self.P_incertezas = kwargs.get(self.__keywordsEntrada[7])
         
-        # Cria caminho para salvar os gráficos
+        # Caminho para salvar os gráficos. O diretório é criado ao salvar o primeiro gráfico (vide __arquivo).
         self.base_path = getcwd() + sep +'Graficos termodinamicos'+sep
-        # Cria o dirétorio do caminho  
+
+    def __arquivo(self,nome):
+        # Cria o dirétorio do caminho e retorna o caminho do arquivo do gráfico
         if path.exists(self.base_path) is False:
             mkdir(self.base_path)
+        return self.base_path+nome
 
     def __validacaoArgumentosEntrada(self,keywargs):
         
@@ -150,7 +159,7 @@ class Graficos:
         keyincorreta  = [key for key in keywargs.keys() if not key in self.__keywordsEntrada]
         
         if len(keyincorreta) != 0:
-            raise NameError(u'keyword(s) incorretas: '+', '.join(keyincorreta)+'.'+u' Keywords disponíveis: '+', '.join(self.__keywordsEntrada)+'.')
+            raise Erro_Nome(u'keyword(s) incorretas: '+', '.join(keyincorreta)+'.'+u' Keywords disponíveis: '+', '.join(self.__keywordsEntrada)+'.')
 
         #==============================================================================
         # Validação se houve a presença dos pares das composiões e de suas incertezas
@@ -159,13 +168,13 @@ class Graficos:
         if self.__keywordsEntrada[0] in keywargs.keys() or self.__keywordsEntrada[1] in keywargs.keys():
             # Se as keywords 'x_experimentais','y_experimentais' não estiverem em keywargs.keys, erro.
             if not {self.__keywordsEntrada[0],self.__keywordsEntrada[1]}.issubset(keywargs.keys()):
-                raise ValueError(u'Caso seja definido alguma composição experimental, faz-se necessário definir todas, tanto do líquido quanto do vapor como argumentos de entrada.')
+                raise Erro_Valor(u'Caso seja definido alguma composição experimental, faz-se necessário definir todas, tanto do líquido quanto do vapor como argumentos de entrada.')
 
         # Caso definido alguma incerteza experimental, é necessário definir a outra, bem como as composições
         if self.__keywordsEntrada[4] in keywargs.keys() or self.__keywordsEntrada[5] in keywargs.keys():
             # Se as keywords 'x_experimentais','y_experimentais', 'x_incertezas','y_incertezas' não estiverem em keywargs.keys, erro.
             if not {self.__keywordsEntrada[0],self.__keywordsEntrada[1],self.__keywordsEntrada[4],self.__keywordsEntrada[5]}.issubset(keywargs.keys()):
-                raise ValueError(u'Caso seja definido alguma inerteza, faz-se neessário definir as composição experimentais para as fases líquida e vapor, bem como suas respectivas incertezas.')
+                raise Erro_Valor(u'Caso seja definido alguma inerteza, faz-se neessário definir as composição experimentais para as fases líquida e vapor, bem como suas respectivas incertezas.')
 
         #==============================================================================
         # Validação dos tipos de variáveis
@@ -174,35 +183,35 @@ class Graficos:
 
         if keywargs.get(self.__keywordsEntrada[0]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[0]),list):
-                 raise TypeError(u'As composições experimentais da fase líquida devem ser iseridas numa LISTA.')
+                 raise Erro_Tipo(u'As composições experimentais da fase líquida devem ser iseridas numa LISTA.')
 
         if keywargs.get(self.__keywordsEntrada[1]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[1]),list):
-                 raise TypeError(u'As composições experimentais da fase vapor devem ser iseridas numa LISTA.')
+                 raise Erro_Tipo(u'As composições experimentais da fase vapor devem ser iseridas numa LISTA.')
 
         if keywargs.get(self.__keywordsEntrada[2]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[2]),list):
-                 raise TypeError(u'As temperaturas devem ser iseridas numa LISTA.')
+                 raise Erro_Tipo(u'As temperaturas devem ser iseridas numa LISTA.')
 
         if keywargs.get(self.__keywordsEntrada[3]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[3]),list):
-                 raise TypeError(u'As pressões devem ser inseridas numa LISTA.')
+                 raise Erro_Tipo(u'As pressões devem ser inseridas numa LISTA.')
                  
         if keywargs.get(self.__keywordsEntrada[4]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[4]),list):
-                 raise TypeError(u'As incertezas das composições da fase líquida devem ser iseridas numa LISTA.')
+                 raise Erro_Tipo(u'As incertezas das composições da fase líquida devem ser iseridas numa LISTA.')
 
         if keywargs.get(self.__keywordsEntrada[5]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[5]),list):
-                 raise TypeError(u'As incertezas das composições da fase vapor devem ser iseridas numa LISTA.')
+                 raise Erro_Tipo(u'As incertezas das composições da fase vapor devem ser iseridas numa LISTA.')
 
         if keywargs.get(self.__keywordsEntrada[6]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[6]),list):
-                 raise TypeError(u'As incertezas das temperaturas devem ser iseridas numa LISTA.')
+                 raise Erro_Tipo(u'As incertezas das temperaturas devem ser iseridas numa LISTA.')
 
         if keywargs.get(self.__keywordsEntrada[7]) is not None:
             if not isinstance(keywargs.get(self.__keywordsEntrada[7]),list):
-                 raise TypeError(u'As incertezas das pressões devem ser inseridas numa LISTA.')
+                 raise Erro_Tipo(u'As incertezas das pressões devem ser inseridas numa LISTA.')
 
         #==============================================================================
         # Validação se houve a presença das incertezas sem os pontos experimentais
@@ -211,11 +220,11 @@ class Graficos:
         # Validação da temperatura
         if keywargs.get(self.__keywordsEntrada[2]) is None:
             if keywargs.get(self.__keywordsEntrada[6]) is not None:
-                raise ValueError(u'Foi inserida informação para a incerteza da temperatura, entretanto não foram inseridos dados de temperatura.')
+                raise Erro_Valor(u'Foi inserida informação para a incerteza da temperatura, entretanto não foram inseridos dados de temperatura.')
         # Validação da pressão
         if keywargs.get(self.__keywordsEntrada[3]) is None:
             if keywargs.get(self.__keywordsEntrada[7]) is not None:
-                raise ValueError(u'Foi inserida informação para a incerteza da pressão, entretanto não foram inseridos dados de pressão.')
+                raise Erro_Valor(u'Foi inserida informação para a incerteza da pressão, entretanto não foram inseridos dados de pressão.')
 
     def P_x_y(self,VLE,T,unidT='K'):
         '''
@@ -243,13 +252,14 @@ class Graficos:
         Chemical Engineering Thermodinamics. 7. ed. [S.l.]: Mc-Graw Hills,p. 254, 2004.
         '''
 
-        fig = figure()
+        pyplot = _pyplot()
+        fig = pyplot.figure()
         fig.add_subplot(1,1,1) 
         #==============================================================================
         #         Plotagem dos pontos calculados
         #==============================================================================
-        plot(VLE.Bolha.comp_molar[0],VLE.Bolha.Pressao,'-',color ='green')
-        plot(VLE.Orvalho.comp_molar[0],VLE.Orvalho.Pressao,'-',color ='blue')
+        pyplot.plot(VLE.Bolha.comp_molar[0],VLE.Bolha.Pressao,'-',color ='green')
+        pyplot.plot(VLE.Orvalho.comp_molar[0],VLE.Orvalho.Pressao,'-',color ='blue')
 
         #==============================================================================
         #         Plotagem dos pontos experimentais
@@ -257,17 +267,17 @@ class Graficos:
         
         if self.x_exp is not None and self.P_exp is not None and self.y_exp is not None:
 
-            errorbar(self.x_exp,self.P_exp,yerr=self.P_incertezas,xerr=self.x_incertezas,fmt='o', ecolor='g',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
-            errorbar(self.y_exp,self.P_exp,yerr=self.P_incertezas,xerr=self.y_incertezas,fmt='o', ecolor='b',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
+            pyplot.errorbar(self.x_exp,self.P_exp,yerr=self.P_incertezas,xerr=self.x_incertezas,fmt='o', ecolor='g',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
+            pyplot.errorbar(self.y_exp,self.P_exp,yerr=self.P_incertezas,xerr=self.y_incertezas,fmt='o', ecolor='b',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
                                                                     
-        xlabel(u'x,y')
-        ylabel(u'Pressão /bar')
-        title('Diagrama Pxy para {:s}-{:s} a {:.1f} {:s}'.format(VLE.Componente[0].nome,VLE.Componente[1].nome,T,unidT))
-        xlim(0,1)
-        legend([u'Pressão de orvalho',u'Pressão de bolha'],loc='best')
-        grid() # Adiciona a grade ao gráfico
-        fig.savefig(self.base_path+'Diagrama_P_x_y.png')
-        close()
+        pyplot.xlabel(u'x,y')
+        pyplot.ylabel(u'Pressão /bar')
+        pyplot.title(u'Diagrama Pxy para {:s}-{:s} a {:.1f} {:s}'.format(VLE.Componente[0].nome,VLE.Componente[1].nome,T,unidT))
+        pyplot.xlim(0,1)
+        pyplot.legend([u'Pressão de orvalho',u'Pressão de bolha'],loc='best')
+        pyplot.grid() # Adiciona a grade ao gráfico
+        fig.savefig(self.__arquivo('Diagrama_P_x_y.png'))
+        pyplot.close()
 
     def T_x_y(self,VLE,P,unidP='bar'):
         '''
@@ -296,13 +306,14 @@ class Graficos:
 
         '''
 
-        fig = figure()
+        pyplot = _pyplot()
+        fig = pyplot.figure()
         fig.add_subplot(1,1,1) 
         #==============================================================================
         #         Plotagem dos pontos calculados
         #==============================================================================
-        plot(VLE.Bolha.comp_molar[0],VLE.Bolha.Temp,'-',color ='green')
-        plot(VLE.Orvalho.comp_molar[0],VLE.Orvalho.Temp,'-',color ='blue')
+        pyplot.plot(VLE.Bolha.comp_molar[0],VLE.Bolha.Temp,'-',color ='green')
+        pyplot.plot(VLE.Orvalho.comp_molar[0],VLE.Orvalho.Temp,'-',color ='blue')
 
         #==============================================================================
         #         Plotagem dos pontos experimentais
@@ -310,17 +321,17 @@ class Graficos:
         
         if self.x_exp is not None and self.T_exp is not None and self.y_exp is not None:
             
-            errorbar(self.x_exp,self.T_exp,yerr=self.T_incertezas,xerr=self.x_incertezas,fmt='o', ecolor='g',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
-            errorbar(self.y_exp,self.T_exp,yerr=self.T_incertezas,xerr=self.y_incertezas,fmt='o', ecolor='b',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
-        
-        xlabel(u'x,y')
-        ylabel(u'Temperatura /K')
-        title('Diagrama Txy para {:s}-{:s} a {:.3f} {:s}'.format(VLE.Componente[0].nome,VLE.Componente[1].nome,P,unidP))
-        xlim(0,1)
-        legend([u'Temperatura de orvalho',u'Temperatura de bolha'],loc='best')
-        grid() # Adiciona a grade ao gráfico
-        fig.savefig(self.base_path+'Diagrama_T_x_y.png')
-        close()
+            pyplot.errorbar(self.x_exp,self.T_exp,yerr=self.T_incertezas,xerr=self.x_incertezas,fmt='o', ecolor='g',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
+            pyplot.errorbar(self.y_exp,self.T_exp,yerr=self.T_incertezas,xerr=self.y_incertezas,fmt='o', ecolor='b',markeredgecolor ='magenta', marker="o", markerfacecolor="w")
+        
+        pyplot.xlabel(u'x,y')
+        pyplot.ylabel(u'Temperatura /K')
+        pyplot.title(u'Diagrama Txy para {:s}-{:s} a {:.3f} {:s}'.format(VLE.Componente[0].nome,VLE.Componente[1].nome,P,unidP))
+        pyplot.xlim(0,1)
+        pyplot.legend([u'Temperatura de orvalho',u'Temperatura de bolha'],loc='best')
+        pyplot.grid() # Adiciona a grade ao gráfico
+        fig.savefig(self.__arquivo('Diagrama_T_x_y.png'))
+        pyplot.close()
         
     def x_y(self,VLE,T,unidT='K'):
         '''
@@ -349,24 +360,25 @@ class Graficos:
         Chemical Engineering Thermodinamics. 7. ed. [S.l.]: Mc-Graw Hills,p. 254, 2004.
 
         '''
-        fig = figure() # Adiciona a figura
+        pyplot = _pyplot()
+        fig = pyplot.figure() # Adiciona a figura
         
         fig.add_subplot(1,1,1)
-        plot(VLE.Orvalho.comp_molar[0],VLE.Bolha.comp_molar[0],'-') 
-        xlabel(u'Composição de {:s} na fase líquida'.format(VLE.Componentes[0].nome))
-        ylabel(u'Composição de {:s} na fase de vapor'.format(VLE.Componentes[0].nome))
-        title('Diagrama xy para {:s} a {:.1f} {:s}'.format(VLE.Componentes[0].nome,T,unidT))
-        xlim(0,1) # Dimensiona a imagem do gráfico        
-        grid() # Adiciona a grade ao gráfico
-
-        fig = figure() # Adiciona a figura
+        pyplot.plot(VLE.Orvalho.comp_molar[0],VLE.Bolha.comp_molar[0],'-') 
+        pyplot.xlabel(u'Composição de {:s} na fase líquida'.format(VLE.Componentes[0].nome))
+        pyplot.ylabel(u'Composição de {:s} na fase de vapor'.format(VLE.Componentes[0].nome))
+        pyplot.title(u'Diagrama xy para {:s} a {:.1f} {:s}'.format(VLE.Componentes[0].nome,T,unidT))
+        pyplot.xlim(0,1) # Dimensiona a imagem do gráfico        
+        pyplot.grid() # Adiciona a grade ao gráfico
+
+        fig = pyplot.figure() # Adiciona a figura
         fig.add_subplot(1,1,1)
-        plot(VLE.Orvalho.comp_molar[1],VLE.Bolha.comp_molar[1],'-')
-        xlabel(u'Composição de {:s} na fase líquida'.format(VLE.Componentes[1].nome))
-        ylabel(u'Composição de {:s} na fase de vapor'.format(VLE.Componentes[1].nome))
-        title('Diagrama xy para {:s} a {:.2f} {:s}'.format(VLE.Componentes[1].nome,T,unidT))
-        xlim(0,1) # Dimensiona a imagem do gráfico
-        grid() # Adiciona a grade ao gráfico
-        
-        fig.savefig(self.base_path+'Diagrama_x_y.png')
-        close()
\ No newline at end of file
+        pyplot.plot(VLE.Orvalho.comp_molar[1],VLE.Bolha.comp_molar[1],'-')
+        pyplot.xlabel(u'Composição de {:s} na fase líquida'.format(VLE.Componentes[1].nome))
+        pyplot.ylabel(u'Composição de {:s} na fase de vapor'.format(VLE.Componentes[1].nome))
+        pyplot.title(u'Diagrama xy para {:s} a {:.2f} {:s}'.format(VLE.Componentes[1].nome,T,unidT))
+        pyplot.xlim(0,1) # Dimensiona a imagem do gráfico
+        pyplot.grid() # Adiciona a grade ao gráfico
+        
+        fig.savefig(self.__arquivo('Diagrama_x_y.png'))
+        pyplot.close()
\ No newline at end of file
@@ -0,0 +1,505 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina com os kernels dos modelos de coeficiente de atividade.
+
+Um kernel é criado pelo método ``Kernel`` dos modelos (UNIQUAC, NRTL, WILSON, Van_Laar e UNIFAC, vide rotina ``Conexao``) e armazena,
+de forma pré-processada, as constantes do modelo: parâmetros dos componentes, vetores auxiliares e matrizes de parâmetros
+de interação. Assim, o cálculo do coeficiente de atividade não realiza buscas de atributos dos componentes nem comparações
+do nome do modelo e da forma da equação a cada chamada.
+
+Cada kernel possui dois métodos de cálculo:
+
+- ``gama(x,T)``: uma composição (lista), em Python puro com as funções do módulo math;
+- ``gama_lote(x,T)``: várias composições (array de dimensão (N,NC)), com operações vetoriais do numpy.
+
+Os parâmetros do modelo são fixados na criação do kernel. As matrizes que dependem apenas da temperatura (tau, G e Psi) são
+armazenadas em um cache de tamanho limitado, indexado pela temperatura, de modo que, nos cálculos a temperatura constante
+(Ex.: PontoBolha_P e Flash), apenas as operações que dependem da composição são refeitas a cada iteração. O kernel é
+compartilhado pelos objetos VLE criados com o mesmo modelo, e o cache é protegido por um lock, de modo que estes objetos
+podem ser executados em threads distintas.
+"""
+import math
+from threading import Lock
+from collections import OrderedDict
+from Erros import Erro_Nome
+from numpy import exp, log, zeros, array, asarray, einsum, diag, newaxis, column_stack
+
+R = 83.144621 # em cm3.bar/ K.mol
+
+class Kernel:
+
+    def __init__(self,NC,tamanho_cache=32):
+        '''
+        Classe base dos kernels. As classes filhas implementam ``_gama`` (uma composição, em Python puro) e ``gama_lote``.
+        
+        ========
+        Entradas
+        ========
+        
+        * NC (int): Número de componentes;
+        * tamanho_cache (int): Número máximo de temperaturas mantidas no cache das matrizes dependentes da temperatura.
+        
+        =========
+        Atributos
+        =========
+        
+        * ``cache_acertos``, ``cache_falhas`` (int): Número de consultas ao cache atendidas e não atendidas.
+        '''
+        self.NC = NC
+        self.indices = range(NC)
+        self.tamanho_cache = tamanho_cache
+        self._trava = Lock()
+        self.limpar_cache()
+
+    def limpar_cache(self):
+        '''
+        Método para apagar o cache das matrizes dependentes da temperatura.
+        '''
+        with self._trava:
+            self._cache = OrderedDict()
+            self.cache_acertos = 0
+            self.cache_falhas  = 0
+
+    def _Cache(self,chave,funcao,T):
+        '''
+        Consulta ao cache das matrizes dependentes da temperatura. Caso a chave não conste no cache, o valor é calculado por 
+        ``funcao(T)`` e armazenado, descartando as chaves mais antigas caso o cache esteja cheio. O valor é calculado fora do
+        lock: duas threads podem calcular a mesma chave, mas o cache não excede ``tamanho_cache``.
+        '''
+        with self._trava:
+            valor = self._cache.get(chave)
+            if valor is not None:
+                self.cache_acertos += 1
+                return valor
+            self.cache_falhas += 1
+        valor = funcao(T)
+        with self._trava:
+            self._cache.pop(chave,None)
+            while len(self._cache) >= self.tamanho_cache:
+                self._cache.popitem(last=False)
+            self._cache[chave] = valor
+        return valor
+
+    def _Cache_Lote(self,funcao,T):
+        '''
+        Consulta ao cache para as temperaturas de um lote (array de dimensão (N,1,1)). Caso todas as temperaturas sejam iguais,
+        as matrizes são obtidas do cache com a dimensão (1,NC,NC); caso contrário, são calculadas para cada temperatura.
+        '''
+        T0 = T[0,0,0]
+        if T.shape[0] == 1 or (T[-1,0,0] == T0 and (T == T0).all()):
+            return self._Cache(('lote',float(T0)),funcao,T[:1])
+        return funcao(T)
+
+    def gama(self,x,T):
+        '''
+        Cálculo dos coeficientes de atividade de uma composição. Retorna uma lista.
+
+        Os casos fora do domínio das funções do módulo math (Ex.: logaritmo de números negativos e composições nulas no modelo
+        de Van Laar) são calculados por ``gama_lote``, que segue as regras de ponto flutuante do numpy (nan e inf).
+        '''
+        try:
+            return self._gama(x,T)
+        except (ValueError,OverflowError,ZeroDivisionError):
+            return self.gama_lote([x],T)[0].tolist()
+
+class Kernel_UNIQUAC(Kernel):
+
+    def __init__(self,r,q,ql,parametro_int,formaEq,z_coordenacao=10.0):
+        '''
+        Kernel do modelo UNIQUAC [1].
+
+        ========
+        Entradas
+        ========
+
+        * r, q, ql (list): Parâmetros dos componentes;
+        * parametro_int (list): Matriz dos parâmetros de interação, conforme a forma da equação;
+        * formaEq (int): Forma da equação: 1 (diferença dos parâmetros a), 2 (tau) ou 3 (parâmetros a);
+        * z_coordenacao (float): Número de coordenação.
+
+        ===========
+        Referências
+        ===========
+
+        [1] ABRAMS, D. S.; PRAUSNITZ, J. M. Statistical thermodynamics of liquid
+        mixtures: A new expression for the excess Gibbs energy of partly or completely
+        miscible systems. AIChE Journal, v. 21, n. 1, p. 116–128, jan. 1975.
+        '''
+        if formaEq not in [1,2,3]:
+            raise Erro_Nome(u'Forma de equação do modelo UNIQUAC não disponível: %s. Formas disponíveis: 1, 2 e 3.'%formaEq)
+        Kernel.__init__(self,len(r))
+        self.formaEq = formaEq
+        self.z2      = z_coordenacao/2.0
+
+        self.r  = [float(valor) for valor in r]
+        self.q  = [float(valor) for valor in q]
+        self.ql = [float(valor) for valor in ql]
+        self.l  = [self.z2*(self.r[i] - self.q[i]) - (self.r[i] - 1) for i in self.indices]
+
+        a = array(parametro_int,dtype=float)
+        if formaEq == 3:
+            a = a - diag(a)[newaxis,:] # tau = exp(-(a_ij - a_jj)/T), equivalente à forma 1
+        # Forma 2: tau constante; formas 1 e 3: tau = exp(-b/T)
+        self.b = a.tolist()
+        self.b_array = a
+
+        self.r_array  = array(self.r)
+        self.q_array  = array(self.q)
+        self.ql_array = array(self.ql)
+        self.l_array  = array(self.l)
+
+    def tau(self,T):
+        '''
+        Matriz tau (lista de listas) na temperatura T.
+        '''
+        if self.formaEq == 2:
+            return self.b
+        return self._Cache(T,self._tau,T)
+
+    def _tau(self,T):
+        b = self.b
+        return [[math.exp(-b[i][j]/T) for j in self.indices] for i in self.indices]
+
+    def tau_lote(self,T):
+        '''
+        Matrizes tau para as temperaturas T (array de dimensão (N,1,1)), no formato (N,NC,NC), ou (1,NC,NC) na forma 2 e
+        quando todas as temperaturas são iguais.
+        '''
+        if self.formaEq == 2:
+            return self.b_array[newaxis,:,:]
+        return self._Cache_Lote(self._tau_lote,T)
+
+    def _tau_lote(self,T):
+        return exp(-self.b_array/T)
+
+    def _gama(self,x,T):
+        I = self.indices
+        r = self.r; q = self.q; ql = self.ql; l = self.l; z2 = self.z2
+        tau = self.tau(T)
+
+        soma_r  = sum([r[j]*x[j]  for j in I])
+        soma_q  = sum([q[j]*x[j]  for j in I])
+        soma_ql = sum([ql[j]*x[j] for j in I])
+        soma_l  = sum([l[j]*x[j]  for j in I])
+        tetal   = [ql[j]*x[j]/soma_ql for j in I]
+
+        S = [sum([tetal[k]*tau[k][j] for k in I]) for j in I] # S[j] = soma em k de tetal[k]*tau[k][j]
+        razao = [tetal[j]/S[j] for j in I]
+
+        gama = []
+        for i in I:
+            phi_x    = r[i]/soma_r                 # phi/x
+            teta_phi = (q[i]/soma_q)/phi_x         # teta/phi
+            A        = ql[i]*sum([razao[j]*tau[i][j] for j in I])
+
+            Combinatorial = math.log(phi_x) + z2*q[i]*math.log(teta_phi) + l[i] - phi_x*soma_l
+            Residual      = -ql[i]*math.log(S[i]) + ql[i] - A
+            gama.append(math.exp(Combinatorial + Residual))
+        return gama
+
+    def gama_lote(self,x,T):
+        '''
+        Cálculo dos coeficientes de atividade de várias composições (N,NC), com T único ou um por composição (N).
+        '''
+        x = asarray(x,dtype=float)
+        N = x.shape[0]
+        T = (zeros(N) + T)[:,newaxis,newaxis] # Temperatura no formato (N,1,1) para as matrizes de interação
+        r = self.r_array; q = self.q_array; ql = self.ql_array
+        tau = self.tau_lote(T)
+
+        phi_x    = r/x.dot(r)[:,newaxis]   # phi/x
+        teta_phi = (q/x.dot(q)[:,newaxis])/phi_x
+        tetal    = ql*x/x.dot(ql)[:,newaxis]
+
+        S = einsum('nk,nkj->nj',tetal,tau) # S[j] = soma em k de tetal[k]*tau[k][j]
+        A = ql*einsum('nj,nij->ni',tetal/S,tau)
+
+        Combinatorial = log(phi_x) + self.z2*q*log(teta_phi) + self.l_array - phi_x*x.dot(self.l_array)[:,newaxis]
+        Residual      = -ql*log(S) + ql - A
+        return exp(Combinatorial + Residual)
+
+class Kernel_NRTL(Kernel):
+
+    def __init__(self,parametro_int,alpha,formaEq):
+        '''
+        Kernel do modelo NRTL [1].
+
+        ========
+        Entradas
+        ========
+
+        * parametro_int (list): Matriz dos parâmetros de interação, conforme a forma da equação;
+        * alpha (list): Matriz dos parâmetros alpha;
+        * formaEq (int): Forma da equação: 1 (diferença dos parâmetros g), 2 (tau) ou 3 (parâmetros g).
+
+        ===========
+        Referências
+        ===========
+
+        [1] RENON, H.; PRAUSNITZ, J. M. Local compositions in thermodynamic excess
+        functions for liquid mixtures. AIChE Journal, v. 14, n. 1, p. 135–144, jan. 1968.
+        '''
+        if formaEq not in [1,2,3]:
+            raise Erro_Nome(u'Forma de equação do modelo NRTL não disponível: %s. Formas disponíveis: 1, 2 e 3.'%formaEq)
+        g = array(parametro_int,dtype=float)
+        Kernel.__init__(self,g.shape[0])
+        self.formaEq = formaEq
+
+        if formaEq == 3:
+            g = g - diag(g)[newaxis,:] # tau = (g_ij - g_jj)/(R*T), equivalente à forma 1
+        self.alpha       = [[float(valor) for valor in linha] for linha in alpha]
+        self.alpha_array = array(self.alpha)
+        if formaEq == 2:
+            # tau e G constantes, calculados uma única vez
+            self.tau_array = g
+            self.G_array   = exp(-self.alpha_array*g)
+            self.tau_cte   = g.tolist()
+            self.G_cte     = self.G_array.tolist()
+        else:
+            self.g_R       = (g/R).tolist() # tau = g_R/T
+            self.g_R_array = g/R
+
+    def tau_G(self,T):
+        '''
+        Matrizes tau e G (listas de listas) na temperatura T.
+        '''
+        if self.formaEq == 2:
+            return self.tau_cte, self.G_cte
+        return self._Cache(T,self._tau_G,T)
+
+    def _tau_G(self,T):
+        I = self.indices; g_R = self.g_R; alpha = self.alpha
+        tau = [[g_R[i][j]/T for j in I] for i in I]
+        G   = [[math.exp(-alpha[i][j]*tau[i][j]) for j in I] for i in I]
+        return tau, G
+
+    def tau_G_lote(self,T):
+        '''
+        Matrizes tau e G para as temperaturas T (array de dimensão (N,1,1)), no formato (N,NC,NC), ou (1,NC,NC) na forma 2 e
+        quando todas as temperaturas são iguais.
+        '''
+        if self.formaEq == 2:
+            return self.tau_array[newaxis,:,:], self.G_array[newaxis,:,:]
+        return self._Cache_Lote(self._tau_G_lote,T)
+
+    def _tau_G_lote(self,T):
+        tau = self.g_R_array/T
+        return tau, exp(-self.alpha_array*tau)
+
+    def _gama(self,x,T):
+        I = self.indices
+        tau, G = self.tau_G(T)
+
+        den    = [sum([G[k][i]*x[k] for k in I]) for i in I]          # soma em k de G[k][i]*x[k]
+        parte1 = [sum([tau[j][i]*G[j][i]*x[j] for j in I])/den[i] for i in I]
+        razao  = [x[j]/den[j] for j in I]
+        parte2 = [sum([razao[j]*G[i][j]*(tau[i][j] - parte1[j]) for j in I]) for i in I]
+        return [math.exp(parte1[i] + parte2[i]) for i in I]
+
+    def gama_lote(self,x,T):
+        '''
+        Cálculo dos coeficientes de atividade de várias composições (N,NC), com T único ou um por composição (N).
+        '''
+        x = asarray(x,dtype=float)
+        N = x.shape[0]
+        T = (zeros(N) + T)[:,newaxis,newaxis]
+        tau, G = self.tau_G_lote(T)
+
+        den    = einsum('nk,nki->ni',x,G)     # soma em k de G[k][i]*x[k]
+        num    = einsum('nj,nji->ni',x,tau*G) # soma em j de tau[j][i]*G[j][i]*x[j]
+        parte1 = num/den
+        parte2 = einsum('nj,nij->ni',x/den,G*(tau - parte1[:,newaxis,:]))
+        return exp(parte1 + parte2)
+
+class Kernel_Wilson(Kernel):
+
+    def __init__(self,parametro_int):
+        '''
+        Kernel do modelo de Wilson [1], com a matriz dos parâmetros LAMBDA (forma 1).
+
+        ===========
+        Referências
+        ===========
+
+        [1] WILSON, G. M. Vapor-Liquid Equilibrium. XI. A New Expression for the Excess
+        Free Energy of Mixing. Journal of the American Chemical Society, v. 86, n. 2, p.
+        127–130, jan. 1964.
+        '''
+        self.A       = [[float(valor) for valor in linha] for linha in parametro_int]
+        self.A_array = array(self.A)
+        Kernel.__init__(self,len(self.A))
+
+    def _gama(self,x,T):
+        I = self.indices; A = self.A
+        S     = [sum([x[j]*A[k][j] for j in I]) for k in I] # S[k] = soma em j de x[j]*A[k][j]
+        razao = [x[k]/S[k] for k in I]
+        return [math.exp(-math.log(S[i]) + 1.0 - sum([razao[k]*A[k][i] for k in I])) for i in I]
+
+    def gama_lote(self,x,T):
+        '''
+        Cálculo dos coeficientes de atividade de várias composições (N,NC). O modelo não depende de T.
+        '''
+        x = asarray(x,dtype=float)
+        S = x.dot(self.A_array.T) # S[k] = soma em j de x[j]*A[k][j]
+        return exp(-log(S) + 1.0 - (x/S).dot(self.A_array))
+
+class Kernel_Van_Laar(Kernel):
+
+    def __init__(self,parametro):
+        '''
+        Kernel do modelo de Van Laar [1], para misturas binárias. Os parâmetros A e B são parametro[0][1] e parametro[1][0].
+
+        ===========
+        Referências
+        ===========
+
+        [1] VAN LAAR, J. J. The Vapor pressure of binary mixtures. Z. Phys. Chem. 1910, 72, 723−751.
+        '''
+        Kernel.__init__(self,2)
+        self.A = float(parametro[0][1])
+        self.B = float(parametro[1][0])
+
+    def _gama(self,x,T):
+        A = self.A; B = self.B
+        return [math.exp((A/(R*T))*(1+(A/B)*(x[0]/x[1]))**-2),
+                math.exp((B/(R*T))*(1+(B/A)*(x[1]/x[0]))**-2)]
+
+    def gama_lote(self,x,T):
+        '''
+        Cálculo dos coeficientes de atividade de várias composições (N,2), com T único ou um por composição (N).
+        '''
+        x = asarray(x,dtype=float)
+        T = zeros(x.shape[0]) + T
+        A = self.A; B = self.B
+        return column_stack([exp((A/(R*T))*(1+(A/B)*(x[:,0]/x[:,1]))**-2),
+                             exp((B/(R*T))*(1+(B/A)*(x[:,1]/x[:,0]))**-2)])
+
+class Kernel_UNIFAC(Kernel):
+
+    def __init__(self,nu,R_k,Q_k,parametro_int,z_coordenacao=10.0):
+        '''
+        Kernel do modelo UNIFAC [1], de contribuição de grupos.
+
+        ========
+        Entradas
+        ========
+
+        * nu (list): Matriz (NC,NG) com o número de cada subgrupo em cada componente;
+        * R_k, Q_k (list): Parâmetros de volume e área dos subgrupos;
+        * parametro_int (list): Matriz (NG,NG) dos parâmetros de interação a_mn (K) entre os grupos principais dos subgrupos;
+        * z_coordenacao (float): Número de coordenação.
+
+        O termo combinatorial é o do modelo UNIQUAC, com r e q dos componentes calculados pela soma dos parâmetros dos subgrupos.
+        O termo residual dos componentes puros depende apenas da temperatura e é armazenado no cache, junto com a matriz Psi.
+
+        ===========
+        Referências
+        ===========
+
+        [1] FREDENSLUND, A.; JONES, R. L.; PRAUSNITZ, J. M. Group-contribution estimation of activity coefficients
+        in nonideal liquid mixtures. AIChE Journal, v. 21, n. 6, p. 1086–1099, nov. 1975.
+        '''
+        Kernel.__init__(self,len(nu))
+        self.nu  = [[float(valor) for valor in linha] for linha in nu]
+        self.R_k = [float(valor) for valor in R_k]
+        self.Q_k = [float(valor) for valor in Q_k]
+        self.a   = [[float(valor) for valor in linha] for linha in parametro_int]
+        self.NG      = len(self.Q_k)
+        self.grupos  = range(self.NG)
+        self.z2      = z_coordenacao/2.0
+
+        I = self.indices; G = self.grupos; nu = self.nu
+        self.r = [sum([nu[i][k]*self.R_k[k] for k in G]) for i in I]
+        self.q = [sum([nu[i][k]*self.Q_k[k] for k in G]) for i in I]
+        self.l = [self.z2*(self.r[i] - self.q[i]) - (self.r[i] - 1) for i in I]
+        # Frações de área dos grupos nos componentes puros
+        self.teta_puro = [[self.Q_k[k]*nu[i][k]/self.q[i] for k in G] for i in I]
+
+        self.nu_array  = array(self.nu)
+        self.Q_k_array = array(self.Q_k)
+        self.a_array   = array(self.a)
+        self.r_array   = array(self.r)
+        self.q_array   = array(self.q)
+        self.l_array   = array(self.l)
+        self.teta_puro_array = array(self.teta_puro)
+
+    def psi(self,T):
+        '''
+        Matriz Psi (lista de listas) e termo residual dos componentes puros (soma em k de nu[i][k]*ln(Gama_k^(i))) na
+        temperatura T.
+        '''
+        return self._Cache(T,self._psi,T)
+
+    def _psi(self,T):
+        G = self.grupos; a = self.a; nu = self.nu
+        Psi = [[math.exp(-a[m][n]/T) for n in G] for m in G]
+        residuo_puro = []
+        for i in self.indices:
+            lnGama = self._ln_Gama(self.teta_puro[i],Psi)
+            residuo_puro.append(sum([nu[i][k]*lnGama[k] for k in G]))
+        return Psi, residuo_puro
+
+    def _ln_Gama(self,teta,Psi):
+        G = self.grupos; Q = self.Q_k
+        S     = [sum([teta[m]*Psi[m][k] for m in G]) for k in G] # S[k] = soma em m de teta[m]*Psi[m][k]
+        razao = [teta[m]/S[m] for m in G]
+        return [Q[k]*(1.0 - math.log(S[k]) - sum([razao[m]*Psi[k][m] for m in G])) for k in G]
+
+    def psi_lote(self,T):
+        '''
+        Matrizes Psi, no formato (N,NG,NG), e termos residuais dos componentes puros, no formato (N,NC), para as temperaturas T
+        (array de dimensão (N,1,1)). Quando todas as temperaturas são iguais, N = 1.
+        '''
+        return self._Cache_Lote(self._psi_lote,T)
+
+    def _psi_lote(self,T):
+        Psi    = exp(-self.a_array/T)
+        lnGama = self._ln_Gama_lote(self.teta_puro_array[newaxis,:,:],Psi) # (N,NC,NG)
+        return Psi, (lnGama*self.nu_array).sum(axis=2)
+
+    def _ln_Gama_lote(self,teta,Psi):
+        S = einsum('nim,nmk->nik',teta,Psi) # S[k] = soma em m de teta[m]*Psi[m][k]
+        return self.Q_k_array*(1.0 - log(S) - einsum('nim,nkm->nik',teta/S,Psi))
+
+    def _gama(self,x,T):
+        I = self.indices; G = self.grupos
+        r = self.r; q = self.q; l = self.l; z2 = self.z2; nu = self.nu; Q = self.Q_k
+        Psi, residuo_puro = self.psi(T)
+
+        soma_r = sum([r[j]*x[j] for j in I])
+        soma_q = sum([q[j]*x[j] for j in I])
+        soma_l = sum([l[j]*x[j] for j in I])
+
+        area   = [Q[k]*sum([nu[j][k]*x[j] for j in I]) for k in G]
+        soma_a = sum(area)
+        lnGama = self._ln_Gama([area[k]/soma_a for k in G],Psi)
+
+        gama = []
+        for i in I:
+            phi_x    = r[i]/soma_r         # phi/x
+            teta_phi = (q[i]/soma_q)/phi_x # teta/phi
+
+            Combinatorial = math.log(phi_x) + z2*q[i]*math.log(teta_phi) + l[i] - phi_x*soma_l
+            Residual      = sum([nu[i][k]*lnGama[k] for k in G]) - residuo_puro[i]
+            gama.append(math.exp(Combinatorial + Residual))
+        return gama
+
+    def gama_lote(self,x,T):
+        '''
+        Cálculo dos coeficientes de atividade de várias composições (N,NC), com T único ou um por composição (N).
+        '''
+        x = asarray(x,dtype=float)
+        N = x.shape[0]
+        T = (zeros(N) + T)[:,newaxis,newaxis]
+        r = self.r_array; q = self.q_array
+        Psi, residuo_puro = self.psi_lote(T)
+
+        phi_x    = r/x.dot(r)[:,newaxis]
+        teta_phi = (q/x.dot(q)[:,newaxis])/phi_x
+
+        area   = x.dot(self.nu_array)*self.Q_k_array
+        lnGama = self._ln_Gama_lote((area/area.sum(axis=1)[:,newaxis])[:,newaxis,:],Psi)[:,0,:] # (N,NG)
+
+        Combinatorial = log(phi_x) + self.z2*q*log(teta_phi) + self.l_array - phi_x*x.dot(self.l_array)[:,newaxis]
+        Residual      = lnGama.dot(self.nu_array.T) - residuo_puro
+        return exp(Combinatorial + Residual)
@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina para a execução de cálculos de equilíbrio líquido-vapor em lote, a partir de um arquivo de especificações.
+
+As especificações são lidas em blocos e agrupadas por sistema (componentes e modelos), de modo que os componentes, os
+modelos e o objeto ``VLE`` de cada sistema são criados uma única vez em cada processo. Os grupos são divididos em tarefas,
+executadas por um conjunto de processos (multiprocessing), e os resultados são escritos à medida que as tarefas terminam
+(a ordem dos resultados não é a ordem das especificações; vide o campo ``id``).
+
+Formatos de entrada, identificados pela extensão do arquivo:
+
+- JSONL (.jsonl ou .json): um objeto JSON por linha. A entrada padrão ('-') é lida neste formato;
+- CSV (.csv): linha de cabeçalho com os nomes dos campos. As listas (``componentes`` e ``z``) são separadas por ';'.
+
+Campos das especificações:
+
+- ``id``: Identificação do cálculo. Padrão: número da linha;
+- ``algoritmo``: Cálculo, conforme o método ``run`` da classe ``VLE``: 'Coeficiente_Atividade', 'Coeficiente_Fugacidade',
+  'PontoBolha_P', 'PontoBolha_T', 'PontoOrvalho_P', 'PontoOrvalho_T' ou 'Flash';
+- ``componentes``: Nomes dos componentes, conforme constam no banco de dados;
+- ``modelo_liq``: Modelo da fase líquida (``MODELOS_LIQ``). Padrão: 'UNIQUAC';
+- ``forma``: Forma de equação do modelo da fase líquida. Padrão: a única forma disponível no banco de dados;
+- ``modelo_vap``: Modelo da fase vapor (``MODELOS_VAP``). Padrão: 'VIRIAL';
+- ``regra``: Regra de mistura da equação Virial. Padrão: 'Hayden_o_Connel';
+- ``z``: Composição (líquido, vapor ou global, conforme o algoritmo);
+- ``T``: Temperatura em Kelvin;
+- ``P``: Pressão em bar.
+
+Os componentes e os modelos são caracterizados na temperatura da primeira especificação de cada sistema executada pelo
+processo (298.15 K, caso esta não possua temperatura); a temperatura é utilizada apenas nas validações das faixas de
+aplicação.
+
+Cada resultado é um objeto JSON com os campos ``id``, ``algoritmo``, ``sistema``, ``T``, ``P``, ``x``, ``y``, ``beta``,
+``gama``, ``phi``, ``convergido``, ``iteracoes``, ``status``, ``avisos`` (contagem dos avisos do cálculo, vide rotina
+Diagnostico) e ``erro`` (mensagem de erro, caso o cálculo não possa ser realizado). Os campos que não se aplicam ao
+algoritmo ficam vazios.
+
+Cada resultado é gravado no arquivo de resultados assim que é obtido. Caso o lote seja interrompido (Ex.: término do
+processo em um servidor compartilhado), a execução com a opção ``-r`` (``--retomar``) lê os ``id`` dos resultados já
+gravados (vide ``concluidos``), acrescenta ao arquivo apenas os resultados das demais especificações e descarta uma última
+linha incompleta. Para isto, os ``id`` das especificações devem ser únicos (o padrão, número da linha, o é enquanto o
+arquivo de especificações não é alterado).
+
+Para lotes grandes, com a opção ``-m`` (``--mapeado``) os resultados são gravados em arrays mapeados em memória (vide
+rotina Resultados) em vez de (ou além de, com ``-s``) JSON: cada processo escreve os resultados das suas tarefas
+diretamente nos arrays, na linha correspondente à posição da especificação no arquivo (vide ``criar_resultados``). Com
+``-r``, as especificações cujas linhas já foram concluídas não são calculadas novamente.
+
+Exemplo (linha de comando): ::
+
+    python Lote.py especificacoes.jsonl -s resultados.jsonl -p 4
+    python Lote.py especificacoes.jsonl -s resultados.jsonl -p 4 -r
+    python Lote.py especificacoes.jsonl -m resultados -p 4
+"""
+import os
+import sys
+import csv
+import json
+from itertools import islice
+from collections import OrderedDict
+from multiprocessing import Pool
+
+from numpy import asarray, int8, int32
+
+from Resultados import Resultados, DESCRICAO
+
+from Conexao import Componente_Caracterizar, UNIQUAC, NRTL, WILSON, Van_Laar, UNIFAC, VIRIAL, SRK, Peng_Robinson
+from VLE import VLE
+from Diagnostico import Diagnostico
+from Erros import Erro_Valor, texto_utf8
+
+ALGORITMOS = ['Coeficiente_Atividade','Coeficiente_Fugacidade','PontoBolha_P','PontoBolha_T','PontoOrvalho_P','PontoOrvalho_T','Flash']
+
+# Construção dos modelos: nome -> função(Componentes,T,forma) ou função(Componentes,regra)
+MODELOS_LIQ = {'UNIQUAC' : lambda C,T,forma: UNIQUAC(C,T,forma),
+               'NRTL'    : lambda C,T,forma: NRTL(C,T,forma),
+               'WILSON'  : lambda C,T,forma: WILSON(C,T,forma),
+               'Van_Laar': lambda C,T,forma: Van_Laar(C),
+               'UNIFAC'  : lambda C,T,forma: UNIFAC(C)}
+MODELOS_VAP = {'VIRIAL'       : lambda C,regra: VIRIAL(C,regra),
+               'SRK'          : lambda C,regra: SRK(C),
+               'Peng-Robinson': lambda C,regra: Peng_Robinson(C)}
+
+T_PADRAO          = 298.15 # Temperatura de caracterização dos sistemas sem temperatura especificada / K
+MAXIMO_SISTEMAS   = 32     # Número de sistemas mantidos em cada processo
+
+_sistemas = OrderedDict() # Sistemas criados no processo: chave -> objeto VLE ou exceção da construção
+_mapeado  = None          # Resultados mapeados em memória em que o processo escreve (vide executar)
+
+def _Lista(valor,separador=';',tipo=float):
+    if valor is None or valor == '':
+        return None
+    if isinstance(valor,basestring):
+        return [tipo(item.strip()) for item in valor.split(separador)]
+    return [tipo(item) for item in valor]
+
+def _Numero(valor,tipo=float):
+    return None if valor is None or valor == '' else tipo(valor)
+
+def normalizar(especificacao,numero=None):
+    u'''
+    Função que retorna a especificação de um cálculo com os valores padrão dos campos ausentes (vide documentação da
+    rotina). As listas podem ser informadas como texto separado por ';'.
+    '''
+    especificacao = dict(especificacao)
+    return {'id'         : especificacao.get('id') if especificacao.get('id') not in (None,'') else numero,
+            'algoritmo'  : especificacao.get('algoritmo'),
+            'componentes': _Lista(especificacao.get('componentes'),tipo=unicode),
+            'modelo_liq' : especificacao.get('modelo_liq') or 'UNIQUAC',
+            'forma'      : _Numero(especificacao.get('forma'),int),
+            'modelo_vap' : especificacao.get('modelo_vap') or 'VIRIAL',
+            'regra'      : especificacao.get('regra') or 'Hayden_o_Connel',
+            'z'          : _Lista(especificacao.get('z')),
+            'T'          : _Numero(especificacao.get('T')),
+            'P'          : _Numero(especificacao.get('P'))}
+
+def ler_especificacoes(arquivo,formato=None):
+    u'''
+    Gerador das especificações (normalizadas, vide ``normalizar``) de um arquivo CSV ou JSONL.
+
+    ========
+    Entradas
+    ========
+
+    * arquivo (str ou file): Caminho do arquivo ('-' para a entrada padrão) ou arquivo aberto;
+    * formato (str): 'csv' ou 'jsonl'. Padrão: identificado pela extensão do arquivo ('jsonl' para arquivos abertos).
+    '''
+    if isinstance(arquivo,basestring):
+        if formato is None:
+            formato = 'csv' if arquivo.lower().endswith('.csv') else 'jsonl'
+        if arquivo == '-':
+            arquivo = sys.stdin
+        else:
+            with open(arquivo,'rb') as aberto:
+                for especificacao in ler_especificacoes(aberto,formato):
+                    yield especificacao
+            return
+
+    if formato == 'csv':
+        for numero, linha in enumerate(csv.DictReader(arquivo),1):
+            yield normalizar(dict([(chave.strip(),valor.strip().decode('utf-8')) for chave, valor in linha.items() if chave is not None and valor is not None]),numero)
+    else:
+        for numero, linha in enumerate(arquivo,1):
+            if linha.strip():
+                yield normalizar(json.loads(linha),numero)
+
+def chave_sistema(especificacao):
+    u'''
+    Chave do sistema (componentes e modelos) de uma especificação, utilizada no agrupamento dos cálculos.
+    '''
+    return (tuple(especificacao['componentes'] or ()),especificacao['modelo_liq'],especificacao['forma'],
+            especificacao['modelo_vap'],especificacao['regra'])
+
+def _Criar_Sistema(chave,T):
+    componentes, modelo_liq, forma, modelo_vap, regra = chave
+    if modelo_liq not in MODELOS_LIQ:
+        raise Erro_Valor(u'O modelo da fase líquida %s não está disponível. Modelos disponíveis: %s.'%(modelo_liq,', '.join(sorted(MODELOS_LIQ))))
+    if modelo_vap not in MODELOS_VAP:
+        raise Erro_Valor(u'O modelo da fase vapor %s não está disponível. Modelos disponíveis: %s.'%(modelo_vap,', '.join(sorted(MODELOS_VAP))))
+    if len(componentes) < 2:
+        raise Erro_Valor(u'Informe ao menos dois componentes.')
+    C = [Componente_Caracterizar(nome,T=T) for nome in componentes]
+    return VLE(ALGORITMOS[0],C,MODELOS_LIQ[modelo_liq](C,T,forma),MODELOS_VAP[modelo_vap](C,regra),
+               diagnostico=Diagnostico('silencioso'))
+
+def sistema(chave,T=None):
+    u'''
+    Função que retorna o objeto ``VLE`` do sistema (vide ``chave_sistema``), criado apenas na primeira chamada em cada
+    processo. Os erros da construção são guardados e levantados novamente nas chamadas seguintes.
+    '''
+    calculo = _sistemas.get(chave)
+    if calculo is None:
+        try:
+            calculo = _Criar_Sistema(chave,T_PADRAO if T is None else T)
+        except Exception as erro:
+            calculo = erro
+        if len(_sistemas) >= MAXIMO_SISTEMAS:
+            _sistemas.popitem(last=False)
+        _sistemas[chave] = calculo
+    if isinstance(calculo,Exception):
+        raise calculo
+    return calculo
+
+def _Condicao(calculo,algoritmo):
+    # Condição com os dados da convergência de cada algoritmo
+    if algoritmo.startswith('PontoBolha'):
+        return calculo.Bolha
+    if algoritmo.startswith('PontoOrvalho'):
+        return calculo.Orvalho
+    return calculo.condicao_global
+
+def _Valor(valor):
+    return None if valor is None else asarray(valor,dtype=float).tolist()
+
+def _Escalar(valor,tipo):
+    return None if valor is None else tipo(valor)
+
+def _Erro(erro):
+    return u'%s: %s'%(type(erro).__name__,unicode(erro))
+
+def calcular(especificacao):
+    u'''
+    Execução de um cálculo (especificação normalizada, vide ``normalizar``). Retorna o resultado (vide documentação da
+    rotina). Os erros são informados no campo ``erro`` do resultado.
+    '''
+    resultado = {'id':especificacao['id'],'algoritmo':especificacao['algoritmo'],
+                 'sistema':'-'.join(especificacao['componentes'] or ()),'T':especificacao['T'],'P':especificacao['P'],
+                 'x':None,'y':None,'beta':None,'gama':None,'phi':None,'convergido':None,'iteracoes':None,'status':None,
+                 'avisos':None,'erro':None}
+    try:
+        algoritmo = especificacao['algoritmo']
+        if algoritmo not in ALGORITMOS:
+            raise Erro_Valor(u'O algoritmo %s não está disponível. Algoritmos disponíveis: %s.'%(algoritmo,', '.join(ALGORITMOS)))
+        calculo = sistema(chave_sistema(especificacao),especificacao['T'])
+        if especificacao['z'] is None or len(especificacao['z']) != calculo.NC:
+            raise Erro_Valor(u'A composição z deve possuir %d elementos.'%calculo.NC)
+
+        calculo.Algoritmo, calculo.z, calculo.Temp, calculo.Pressao = algoritmo, especificacao['z'], especificacao['T'], especificacao['P']
+        calculo.diagnostico.limpar()
+        calculo.run()
+
+        if algoritmo == 'Coeficiente_Atividade':
+            resultado.update({'x':_Valor(especificacao['z']),'gama':_Valor(calculo.coefAct)})
+        elif algoritmo == 'Coeficiente_Fugacidade':
+            resultado.update({'y':_Valor(especificacao['z']),'phi':_Valor(calculo.coefFug)})
+        else:
+            condicao = _Condicao(calculo,algoritmo)
+            resultado.update({'T':float(calculo.liquido.Temp),'P':float(calculo.liquido.Pressao),
+                              'x':_Valor(calculo.liquido.comp_molar),'y':_Valor(calculo.vapor.comp_molar),
+                              'gama':_Valor(calculo.liquido.coefAct),'phi':_Valor(calculo.vapor.coeffug),
+                              'beta':_Valor(condicao.beta),'convergido':_Escalar(condicao.convergido,bool),
+                              'iteracoes':_Escalar(condicao.iteracoes,int),'status':condicao.status})
+        resultado['avisos'] = dict(calculo.diagnostico.contagem)
+    except Exception as erro:
+        resultado['erro'] = _Erro(erro)
+    return resultado
+
+def _Campos(NC):
+    return [('sistema',int32),('algoritmo',int8),('T',float),('P',float),('x',float,(NC,)),('y',float,(NC,)),
+            ('gama',float,(NC,)),('phi',float,(NC,)),('beta',float),('convergido',bool),('iteracoes',int32),
+            ('erro',bool),('concluido',bool)]
+
+def criar_resultados(diretorio,especificacoes,entrada=None):
+    u'''
+    Criação dos resultados mapeados em memória de um lote (vide rotina Resultados), com uma linha por especificação, na
+    ordem das especificações. As composições e os coeficientes possuem tantas colunas quanto o maior número de componentes
+    das especificações; as colunas excedentes de cada linha ficam com NaN. Retorna um objeto da classe ``Resultados``.
+
+    Campos: ``sistema`` (posição na lista ``sistemas`` da descrição), ``algoritmo`` (posição na lista ``algoritmos``),
+    ``T``, ``P``, ``x``, ``y``, ``gama``, ``phi``, ``beta``, ``convergido``, ``iteracoes``, ``erro`` (vide o campo
+    ``erro`` dos resultados em JSON) e ``concluido`` (indica as linhas já calculadas).
+    '''
+    N = NC = 0
+    sistemas = OrderedDict()
+    for especificacao in especificacoes:
+        N += 1
+        NC = max(NC,len(especificacao['componentes'] or ()))
+        sistemas.setdefault(chave_sistema(especificacao),len(sistemas))
+    descricao = {'calculo':'Lote','entrada':entrada,'algoritmos':ALGORITMOS,
+                 'sistemas':[dict(zip(['componentes','modelo_liq','forma','modelo_vap','regra'],chave)) for chave in sistemas]}
+    return Resultados.criar(diretorio,N,_Campos(max(NC,1)),descricao)
+
+def _Gravar(resultados,especificacao,resultado):
+    linha = especificacao['posicao']
+    resultados.escrever(linha,sistema=especificacao['indice_sistema'],
+                        algoritmo=ALGORITMOS.index(resultado['algoritmo']) if resultado['algoritmo'] in ALGORITMOS else -1,
+                        erro=resultado['erro'] is not None)
+    for campo in ('T','P','beta','convergido','iteracoes'):
+        if resultado[campo] is not None:
+            resultados[campo][linha] = resultado[campo]
+    for campo in ('x','y','gama','phi'):
+        if resultado[campo] is not None:
+            resultados[campo][linha,:len(resultado[campo])] = resultado[campo]
+    resultados.concluido[linha] = True
+
+def _Iniciar_Processo(diretorio):
+    global _mapeado
+    _mapeado = None if diretorio is None else Resultados(diretorio,'r+')
+
+def _Executar_Tarefa(tarefa):
+    resultados = [calcular(especificacao) for especificacao in tarefa]
+    if _mapeado is not None:
+        for especificacao, resultado in zip(tarefa,resultados):
+            _Gravar(_mapeado,especificacao,resultado)
+        _mapeado.sincronizar()
+    return resultados
+
+def _Posicoes(especificacoes,resultados):
+    # Posição de cada especificação nos resultados mapeados e do seu sistema na descrição. As linhas concluídas são ignoradas.
+    sistemas = dict([((tuple(sistema['componentes']),sistema['modelo_liq'],sistema['forma'],sistema['modelo_vap'],sistema['regra']),indice)
+                     for indice, sistema in enumerate(resultados.descricao['sistemas'])])
+    for posicao, especificacao in enumerate(especificacoes):
+        if posicao >= resultados.N:
+            raise Erro_Valor(u'O número de especificações é superior ao número de linhas dos resultados mapeados (%d).'%resultados.N)
+        if not resultados.concluido[posicao]:
+            especificacao['posicao']       = posicao
+            especificacao['indice_sistema'] = sistemas.get(chave_sistema(especificacao),-1)
+            yield especificacao
+
+def _Blocos(especificacoes,tamanho_bloco,tamanho_tarefa):
+    # Leitura das especificações em blocos. Cada bloco é agrupado por sistema e dividido em tarefas.
+    especificacoes = iter(especificacoes)
+    while True:
+        bloco = list(islice(especificacoes,tamanho_bloco))
+        if not bloco:
+            return
+        grupos = OrderedDict()
+        for especificacao in bloco:
+            grupos.setdefault(chave_sistema(especificacao),[]).append(especificacao)
+        yield [grupo[inicio:inicio+tamanho_tarefa] for grupo in grupos.values() for inicio in xrange(0,len(grupo),tamanho_tarefa)]
+
+def executar(especificacoes,processos=1,tamanho_bloco=1000,tamanho_tarefa=100,concluidos=None,mapeado=None):
+    u'''
+    Gerador dos resultados dos cálculos, na ordem em que as tarefas terminam.
+
+    ========
+    Entradas
+    ========
+
+    * especificacoes (iterável): Especificações normalizadas (vide ``ler_especificacoes`` e ``normalizar``);
+    * processos (int): Número de processos. Com um processo, os cálculos são executados no processo atual;
+    * tamanho_bloco (int): Número de especificações lidas e agrupadas por sistema de cada vez;
+    * tamanho_tarefa (int): Número máximo de especificações de cada tarefa enviada aos processos;
+    * concluidos (set): ``id`` das especificações que não devem ser calculadas (vide ``concluidos``);
+    * mapeado (str): Diretório dos resultados mapeados em memória (vide ``criar_resultados``), criados com as mesmas
+      especificações, na mesma ordem. Os resultados são escritos pelos processos nos arrays, e as linhas já concluídas
+      não são calculadas novamente.
+    '''
+    if concluidos:
+        especificacoes = (especificacao for especificacao in especificacoes if especificacao['id'] not in concluidos)
+    if mapeado is not None:
+        especificacoes = _Posicoes(especificacoes,Resultados(mapeado))
+    blocos = _Blocos(especificacoes,tamanho_bloco,tamanho_tarefa)
+    if processos <= 1:
+        _Iniciar_Processo(mapeado)
+        try:
+            for tarefas in blocos:
+                for tarefa in tarefas:
+                    for resultado in _Executar_Tarefa(tarefa):
+                        yield resultado
+        finally:
+            _Iniciar_Processo(None)
+        return
+
+    # Os blocos são enviados aos processos um de cada vez, de modo que a memória utilizada não depende do tamanho da entrada
+    conjunto = Pool(processos,_Iniciar_Processo,(mapeado,))
+    try:
+        for tarefas in blocos:
+            for resultados in conjunto.imap_unordered(_Executar_Tarefa,tarefas):
+                for resultado in resultados:
+                    yield resultado
+        conjunto.close()
+    finally:
+        conjunto.terminate()
+        conjunto.join()
+
+def concluidos(arquivo):
+    u'''
+    Função que retorna o conjunto dos ``id`` dos resultados gravados em um arquivo de resultados (vide ``escrever``),
+    utilizada na retomada de um lote interrompido. A leitura termina na primeira linha incompleta ou inválida (gravação
+    interrompida), que é removida do arquivo junto com as seguintes. Caso o arquivo não exista, o conjunto é vazio.
+    '''
+    ids = set()
+    if not os.path.exists(arquivo):
+        return ids
+    with open(arquivo,'r+b') as aberto:
+        posicao = 0
+        while True:
+            linha = aberto.readline()
+            if not linha.endswith('\n'):
+                break
+            try:
+                ids.add(json.loads(linha)['id'])
+            except (ValueError,KeyError,TypeError):
+                break
+            posicao = aberto.tell()
+        aberto.truncate(posicao)
+    return ids
+
+def escrever(resultados,saida=sys.stdout):
+    u'''
+    Escrita dos resultados no formato JSON, um registro por linha. Retorna o número de resultados e de erros. Caso a
+    saída seja None, os resultados são apenas contados (Ex.: com os resultados mapeados em memória, vide ``executar``).
+    '''
+    total = erros = 0
+    for resultado in resultados:
+        if saida is not None:
+            saida.write(json.dumps(resultado)+'\n')
+            saida.flush()
+        total += 1
+        erros += resultado['erro'] is not None
+    return total, erros
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    argumentos = ArgumentParser(description=texto_utf8(u'Execução de cálculos de equilíbrio líquido-vapor em lote (especificações em CSV ou JSONL).'))
+    argumentos.add_argument('entrada',help=texto_utf8(u"Arquivo de especificações (.csv ou .jsonl; '-' para a entrada padrão, em JSONL)."))
+    argumentos.add_argument('-s','--saida',default=None,help=texto_utf8(u'Arquivo de resultados (JSON lines). Padrão: saída padrão.'))
+    argumentos.add_argument('-p','--processos',type=int,default=1,help=texto_utf8(u'Número de processos. Padrão: 1.'))
+    argumentos.add_argument('-b','--bloco',type=int,default=1000,help=texto_utf8(u'Número de especificações agrupadas por sistema de cada vez. Padrão: 1000.'))
+    argumentos.add_argument('-t','--tarefa',type=int,default=100,help=texto_utf8(u'Número máximo de especificações por tarefa. Padrão: 100.'))
+    argumentos.add_argument('-r','--retomar',action='store_true',help=texto_utf8(u'Retoma um lote interrompido: calcula apenas as especificações cujos resultados não constam no arquivo de resultados (ou nos resultados mapeados).'))
+    argumentos.add_argument('-m','--mapeado',default=None,help=texto_utf8(u'Diretório dos resultados em arrays mapeados em memória (.npy e descricao.json). Sem -s, os resultados não são escritos em JSON.'))
+    argumentos = argumentos.parse_args()
+    if argumentos.retomar and argumentos.saida is None and argumentos.mapeado is None:
+        sys.stderr.write(texto_utf8(u'A opção --retomar exige o arquivo de resultados (-s) ou os resultados mapeados (-m).\n'))
+        sys.exit(2)
+    if argumentos.mapeado is not None and argumentos.entrada == '-':
+        sys.stderr.write(texto_utf8(u'A opção --mapeado exige um arquivo de especificações (a entrada é lida duas vezes).\n'))
+        sys.exit(2)
+
+    if argumentos.mapeado is not None and not (argumentos.retomar and os.path.exists(os.path.join(argumentos.mapeado,DESCRICAO))):
+        criar_resultados(argumentos.mapeado,ler_especificacoes(argumentos.entrada),os.path.abspath(argumentos.entrada))
+
+    retomados  = concluidos(argumentos.saida) if argumentos.retomar and argumentos.saida is not None else set()
+    resultados = executar(ler_especificacoes(argumentos.entrada),argumentos.processos,argumentos.bloco,argumentos.tarefa,retomados,argumentos.mapeado)
+    if argumentos.saida is None:
+        total, erros = escrever(resultados,None if argumentos.mapeado is not None else sys.stdout)
+    else:
+        with open(argumentos.saida,'a' if argumentos.retomar else 'w') as arquivo:
+            total, erros = escrever(resultados,arquivo)
+    if retomados:
+        sys.stderr.write('%d resultados retomados do arquivo de resultados.\n'%len(retomados))
+    sys.stderr.write('%d resultados, %d erros.\n'%(total,erros))
+    sys.exit(1 if erros else 0)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina de migração do esquema do banco de dados termodinâmico.
+
+A migração prepara o banco de dados para as buscas da rotina Conexao (vide rotina Banco) em bancos com muitos componentes
+e pares de componentes:
+
+- Remove as tabelas obsoletas (cópias de segurança ``*_bak``, ``*_bak0``, etc. e tabelas temporárias do SQLiteStudio);
+- Cria índices compostos com as colunas das buscas (Ex.: ID_componente_i, ID_componente_j e ID_forma nas tabelas de
+  parâmetros de interação binária), de modo que cada busca tem custo O(log n);
+- Executa ANALYZE, que atualiza as estatísticas utilizadas pelo SQLite na escolha dos índices.
+
+A migração pode ser executada mais de uma vez: os índices existentes são mantidos.
+
+A função ``verificar_planos`` executa EXPLAIN QUERY PLAN para as buscas da rotina Conexao e indica as buscas que percorrem
+a tabela inteira (SCAN) em vez de utilizar um índice ou a chave primária (SEARCH).
+
+Exemplo (linha de comando): ::
+
+    python Migracao.py -b THERMO_DATA_BANK_EXEMPLO.db
+    python Migracao.py -b THERMO_DATA_BANK_EXEMPLO.db --verificar
+"""
+import os
+import re
+import sys
+from sqlite3 import connect
+from argparse import ArgumentParser
+
+from Banco import BANCO, VARIAVEL, Banco_SQLite, caminho_banco
+from Erros import Erro_Valor, texto_utf8
+
+PAR       = ('ID_componente_i','ID_componente_j')
+PAR_FORMA = ('ID_componente_i','ID_componente_j','ID_forma')
+
+# Buscas realizadas pela rotina Conexao: (tabela, colunas dos filtros)
+CONSULTAS = [('Componentes',('Nome',)),
+             ('Componentes',('ID',)),
+             ('Grupo',('ID',)),
+             ('Propriedades_puras',('ID_componente',)),
+             ('Parametros_Psat_Prausnitz_4th_edition',('ID_componente',)),
+             ('Parametros_Psat_Prausnitz_4th_edition',('ID_componente','ID_forma')),
+             ('UNIQUAC_parametros_interacao_binaria',PAR),
+             ('UNIQUAC_parametros_interacao_binaria',PAR_FORMA),
+             ('NRTL',PAR),
+             ('NRTL',PAR_FORMA),
+             ('Wilson',PAR),
+             ('Wilson',PAR_FORMA),
+             ('Van_Laar',PAR),
+             ('Propriedade_mistura',PAR),
+             ('Tsonopoulos',PAR),
+             ('SRK',PAR),
+             ('Peng-Robinson',PAR),
+             ('UNIFAC_componente_subgrupo',('ID_componente',)),
+             ('UNIFAC_subgrupo',('ID',)),
+             ('UNIFAC_subgrupo',('Nome',)),
+             ('UNIFAC_parametros_interacao',('ID_grupo_principal_m','ID_grupo_principal_n'))]
+
+# Índices criados pela migração: (nome, tabela, colunas). As buscas por um prefixo das colunas também utilizam o índice.
+INDICES = [('indice_Propriedades_puras_componente','Propriedades_puras',('ID_componente',)),
+           ('indice_Psat_Prausnitz_componente_forma','Parametros_Psat_Prausnitz_4th_edition',('ID_componente','ID_forma')),
+           ('indice_UNIQUAC_par_forma','UNIQUAC_parametros_interacao_binaria',PAR_FORMA),
+           ('indice_NRTL_par_forma','NRTL',PAR_FORMA),
+           ('indice_Wilson_par_forma','Wilson',PAR_FORMA),
+           ('indice_Van_Laar_par','Van_Laar',PAR),
+           ('indice_Propriedade_mistura_par','Propriedade_mistura',PAR),
+           ('indice_Tsonopoulos_par','Tsonopoulos',PAR),
+           ('indice_SRK_par','SRK',PAR),
+           ('indice_Peng_Robinson_par','Peng-Robinson',PAR),
+           ('indice_UNIFAC_componente_subgrupo_componente','UNIFAC_componente_subgrupo',('ID_componente',)),
+           ('indice_UNIFAC_parametros_interacao_grupos','UNIFAC_parametros_interacao',('ID_grupo_principal_m','ID_grupo_principal_n'))]
+
+# Tabelas obsoletas: cópias de segurança e tabelas temporárias do SQLiteStudio
+OBSOLETAS = re.compile(r'(_bak\d*$)|(^sqlitestudio_temp_table)')
+
+def _Tabelas(conector):
+    return [linha[0] for linha in conector.execute("SELECT name FROM sqlite_master WHERE type='table'") if not linha[0].startswith('sqlite_')]
+
+def _Escrever(texto):
+    sys.stdout.write((texto+u'\n').encode('utf-8'))
+
+def migrar(banco=None,remover_obsoletas=True):
+    u'''
+    Função para migrar o banco de dados (vide documentação da rotina).
+
+    ========
+    Entradas
+    ========
+
+    * banco (str): Caminho do banco de dados. Padrão: ``caminho_banco()`` (vide rotina Banco);
+    * remover_obsoletas (bool): Remove as tabelas obsoletas.
+
+    ======
+    Saídas
+    ======
+
+    * Retorna um dicionário com as chaves ``removidas`` (tabelas obsoletas removidas), ``indices`` (índices criados) e
+      ``ausentes`` (tabelas de ``INDICES`` que não constam no banco de dados).
+    '''
+    if banco is None:
+        banco = caminho_banco()
+    if not os.path.exists(banco): # O SQLite criaria um banco de dados vazio
+        raise Erro_Valor(u'O banco de dados %s não existe. Informe o caminho pela função configurar_banco ou pela variável de ambiente %s.'%(banco,VARIAVEL))
+    conector = connect(banco)
+    try:
+        tabelas   = _Tabelas(conector)
+        removidas = sorted([tabela for tabela in tabelas if OBSOLETAS.search(tabela)]) if remover_obsoletas else []
+        for tabela in removidas:
+            conector.execute('DROP TABLE ['+tabela+']')
+
+        criados  = []
+        ausentes = []
+        for nome, tabela, colunas in INDICES:
+            if tabela not in tabelas:
+                ausentes.append(tabela)
+                continue
+            if not conector.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name=?",(nome,)).fetchall():
+                conector.execute('CREATE INDEX ['+nome+'] ON ['+tabela+'] ('+', '.join(['['+coluna+']' for coluna in colunas])+')')
+                criados.append(nome)
+        conector.commit()
+
+        conector.execute('ANALYZE')
+        conector.commit()
+    finally:
+        conector.close()
+    return {'removidas':removidas,'indices':criados,'ausentes':ausentes}
+
+def verificar_planos(banco=None):
+    u'''
+    Função para verificar os planos de execução das buscas da rotina Conexao (lista ``CONSULTAS``).
+
+    ======
+    Saídas
+    ======
+
+    * Retorna uma lista de dicionários, um por busca, com as chaves ``tabela``, ``filtros``, ``plano`` (descrição das
+      etapas do plano) e ``indexada`` (verdadeiro caso nenhuma etapa percorra a tabela inteira). As tabelas que não constam
+      no banco de dados são ignoradas.
+    '''
+    conexao = Banco_SQLite(banco)
+    try:
+        tabelas   = conexao.tabelas()
+        resultado = []
+        for tabela, filtros in CONSULTAS:
+            if tabela not in tabelas:
+                continue
+            plano = conexao.plano(tabela,'*',**dict([(coluna,0) for coluna in filtros]))
+            resultado.append({'tabela':tabela,'filtros':filtros,'plano':plano,
+                              'indexada':all([etapa.startswith('SEARCH') for etapa in plano])})
+    finally:
+        conexao.fechar()
+    return resultado
+
+if __name__ == '__main__':
+
+    argumentos = ArgumentParser(description=texto_utf8(u'Migração do esquema do banco de dados termodinâmico (índices, tabelas obsoletas e ANALYZE).'))
+    argumentos.add_argument('-b','--banco',default=None,help=texto_utf8(u'Banco de dados SQLite. Padrão: variável de ambiente %s ou %s.'%(VARIAVEL,BANCO)))
+    argumentos.add_argument('--manter-obsoletas',action='store_true',help=texto_utf8(u'Não remove as tabelas obsoletas.'))
+    argumentos.add_argument('--verificar',action='store_true',help=texto_utf8(u'Apenas verifica os planos de execução das buscas, sem migrar o banco.'))
+    argumentos = argumentos.parse_args()
+
+    if not argumentos.verificar:
+        relatorio = migrar(argumentos.banco,not argumentos.manter_obsoletas)
+        _Escrever(u'Tabelas removidas: '+(', '.join(relatorio['removidas']) or '-'))
+        _Escrever(u'Índices criados: '+(', '.join(relatorio['indices']) or '-'))
+        if relatorio['ausentes']:
+            _Escrever(u'Tabelas ausentes: '+', '.join(relatorio['ausentes']))
+
+    planos = verificar_planos(argumentos.banco)
+    for busca in planos:
+        _Escrever(u'%-4s %s (%s): %s'%('ok' if busca['indexada'] else 'SCAN',busca['tabela'],', '.join(busca['filtros']),'; '.join(busca['plano'])))
+    sys.exit(0 if all([busca['indexada'] for busca in planos]) else 1)
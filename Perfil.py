@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina para a análise do desempenho (profiling) dos cálculos de equilíbrio líquido-vapor.
+
+Quando ativado, o perfil substitui os métodos das etapas dos cálculos (coeficientes de atividade e fugacidade,
+coeficiente Virial, Psat, Tsat, método de Newton, consultas ao banco de dados, etc.) por versões instrumentadas,
+que contam as chamadas e acumulam o tempo de cada etapa. Quando desativado, os métodos originais são restaurados,
+de forma que não há custo algum para os cálculos.
+
+São registrados:
+
+- Por etapa: número de chamadas, tempo total (incluindo as etapas chamadas internamente) e tempo próprio;
+- Por chamada dos algoritmos (pontos de bolha e de orvalho, flash, Predicao, Predicao_Mapeada e Varredura_Flash): tempo
+  total e o número de chamadas e o tempo de cada etapa executada durante a chamada.
+
+Os cálculos executados em várias threads durante a ativação são registrados no mesmo perfil. As etapas em execução e os
+registros dos algoritmos em execução são mantidos por thread, de modo que o tempo próprio de cada etapa e as etapas de cada
+chamada dos algoritmos correspondem apenas à thread da chamada.
+
+Exemplo: ::
+
+    >>> perfil = Perfil()
+    >>> with perfil:
+    ...     Calculo.Predicao('pressao',1.013)
+    >>> perfil.relatorio()
+    >>> print perfil.texto()
+"""
+from collections import deque
+from threading import Lock, local
+from timeit import default_timer as relogio
+from Erros import Erro_Execucao
+
+import Banco
+import Conexao
+import VLE as _VLE
+
+# Etapas instrumentadas: (classe, método)
+ETAPAS = [(_VLE.VLE,'Coeficiente_Atividade'),
+          (_VLE.VLE,'Coeficiente_Atividade_Lote'),
+          (_VLE.VLE,'Coeficiente_Fugacidade'),
+          (_VLE.VLE,'Coeficiente_Fugacidade_Lote'),
+          (_VLE.VLE,'Second_Virial_Coef'),
+          (_VLE.VLE,'_Bvirial'),
+          (_VLE.VLE,'_Constantes_Virial'),
+          (_VLE.VLE,'_Phi_Cubica'),
+          (_VLE.VLE,'PhiSat'),
+          (_VLE.VLE,'PhiSat_Lote'),
+          (_VLE.VLE,'_Psat_Lote'),
+          (_VLE.VLE,'_Tsat_Lote'),
+          (_VLE.VLE,'_Rachford_Rice_Lote'),
+          (Conexao.Componente_Caracterizar,'Pvap_Prausnitz_4th'),
+          (Conexao.Componente_Caracterizar,'Tsat_Prausnitz_4th'),
+          (Conexao.Componente_Caracterizar,'solver')]
+
+# Consultas ao banco de dados: (classe, método, nome da etapa)
+CONSULTAS = [(Banco.Banco_SQLite,'consultar','sqlite'),
+             (Banco.Banco_Snapshot,'consultar','snapshot')]
+
+# Algoritmos instrumentados: além de etapas, cada chamada gera um registro próprio
+ALGORITMOS = [(_VLE.VLE,'PontoBolha_P'),
+              (_VLE.VLE,'PontoBolha_T'),
+              (_VLE.VLE,'PontoOrvalho_P'),
+              (_VLE.VLE,'PontoOrvalho_T'),
+              (_VLE.VLE,'Flash'),
+              (_VLE.VLE,'PontoBolha_P_Lote'),
+              (_VLE.VLE,'PontoBolha_T_Lote'),
+              (_VLE.VLE,'PontoOrvalho_P_Lote'),
+              (_VLE.VLE,'PontoOrvalho_T_Lote'),
+              (_VLE.VLE,'Flash_Lote'),
+              (_VLE.VLE,'Predicao'),
+              (_VLE.VLE,'Predicao_Mapeada'),
+              (_VLE.VLE,'Varredura_Flash')]
+
+class Perfil:
+
+    _ativo = None # Perfil ativo (apenas um perfil pode estar ativo por vez)
+
+    def __init__(self,max_invocacoes=1000):
+        u'''
+        Perfil de desempenho dos cálculos.
+
+        ========
+        Entradas
+        ========
+
+        * max_invocacoes (int): Número máximo de registros de chamadas dos algoritmos mantidos (os mais recentes).
+
+        =======
+        Métodos
+        =======
+
+        * ``ativar``: Instrumenta as etapas e algoritmos;
+        * ``desativar``: Restaura os métodos originais;
+        * ``limpar``: Apaga os dados registrados;
+        * ``relatorio``: Retorna os dados registrados em forma de dicionário;
+        * ``texto``: Retorna os dados das etapas em forma de tabela.
+
+        O perfil também pode ser utilizado com a instrução ``with``, vide documentação da rotina.
+        '''
+        self.max_invocacoes = max_invocacoes
+        self.__originais    = []
+        self.__trava        = Lock() # Acúmulo dos dados das etapas chamadas em threads distintas
+        self.limpar()
+
+    def limpar(self):
+        u'''
+        Método para apagar os dados registrados.
+        '''
+        self.etapas      = {}  # nome -> [chamadas, tempo, tempo_proprio]
+        self.invocacoes  = deque(maxlen=self.max_invocacoes)
+        self.__locais    = local() # Etapas e algoritmos em execução em cada thread (vide __execucao)
+
+    def __execucao(self):
+        u'''
+        Dados da thread corrente: ``pilha`` (tempo das etapas filhas de cada etapa em execução) e ``abertas`` (registros dos
+        algoritmos em execução).
+        '''
+        locais = self.__locais
+        if not hasattr(locais,'pilha'):
+            locais.pilha   = []
+            locais.abertas = []
+        return locais
+
+    #==============================================================================
+    #         INSTRUMENTAÇÃO
+    #==============================================================================
+    def __registrar(self,nome,tempo,tempo_filhos):
+        u'''
+        Acúmulo dos dados de uma chamada de etapa no perfil e nos registros dos algoritmos em execução.
+        '''
+        with self.__trava:
+            dados = self.etapas.get(nome)
+            if dados is None:
+                dados = self.etapas[nome] = [0,0.0,0.0]
+            dados[0] += 1
+            dados[1] += tempo
+            dados[2] += tempo - tempo_filhos
+        for registro in self.__execucao().abertas:
+            etapa = registro['etapas'].get(nome)
+            if etapa is None:
+                etapa = registro['etapas'][nome] = {'chamadas':0,'tempo':0.0}
+            etapa['chamadas'] += 1
+            etapa['tempo']    += tempo
+
+    def __envolver_etapa(self,original,nome):
+        execucao  = self.__execucao
+        registrar = self.__registrar
+        def envoltorio(*args,**kwargs):
+            pilha = execucao().pilha
+            pilha.append(0.0)
+            inicio = relogio()
+            try:
+                return original(*args,**kwargs)
+            finally:
+                tempo = relogio() - inicio
+                tempo_filhos = pilha.pop()
+                if pilha:
+                    pilha[-1] += tempo
+                registrar(nome,tempo,tempo_filhos)
+        envoltorio.__name__ = original.__name__
+        envoltorio.__doc__  = original.__doc__
+        return envoltorio
+
+    def __envolver_algoritmo(self,original,nome):
+        etapa    = self.__envolver_etapa(original,nome)
+        execucao = self.__execucao
+        def envoltorio(*args,**kwargs):
+            abertas  = execucao().abertas
+            registro = {'algoritmo':nome,'tempo':0.0,'etapas':{}}
+            abertas.append(registro)
+            inicio = relogio()
+            try:
+                return etapa(*args,**kwargs)
+            finally:
+                registro['tempo'] = relogio() - inicio
+                registro['etapas'].pop(nome,None) # A própria chamada não é uma etapa do registro
+                abertas.remove(registro)
+                self.invocacoes.append(registro)
+        envoltorio.__name__ = original.__name__
+        envoltorio.__doc__  = original.__doc__
+        return envoltorio
+
+    def ativar(self):
+        u'''
+        Método para instrumentar as etapas e algoritmos. Os dados são acumulados até que o método ``limpar`` seja chamado.
+        '''
+        if Perfil._ativo is self:
+            return
+        if Perfil._ativo is not None:
+            raise Erro_Execucao(u'Já existe um perfil ativo. Desative-o antes de ativar outro.')
+        Perfil._ativo = self
+
+        for classe, metodo in ETAPAS + ALGORITMOS:
+            original = classe.__dict__[metodo]
+            self.__originais.append((classe,metodo,original))
+            if (classe,metodo) in ALGORITMOS:
+                setattr(classe,metodo,self.__envolver_algoritmo(original,metodo))
+            else:
+                setattr(classe,metodo,self.__envolver_etapa(original,metodo))
+
+        # Consultas ao banco de dados (etapas 'sqlite' e 'snapshot')
+        for classe, metodo, nome in CONSULTAS:
+            original = classe.__dict__[metodo]
+            self.__originais.append((classe,metodo,original))
+            setattr(classe,metodo,self.__envolver_etapa(original,nome))
+
+    def desativar(self):
+        u'''
+        Método para restaurar os métodos originais.
+        '''
+        if Perfil._ativo is not self:
+            return
+        for objeto, nome, original in reversed(self.__originais):
+            setattr(objeto,nome,original)
+        self.__originais = []
+        Perfil._ativo = None
+
+    def __enter__(self):
+        self.ativar()
+        return self
+
+    def __exit__(self,*erro):
+        self.desativar()
+        return False
+
+    #==============================================================================
+    #         RELATÓRIOS
+    #==============================================================================
+    def relatorio(self):
+        u'''
+        Método para acessar os dados registrados.
+
+        ======
+        Saídas
+        ======
+
+        * Retorna um dicionário com as chaves:
+
+            * ``etapas``: Dicionário com os dados de cada etapa: ``chamadas``, ``tempo`` (s) e ``tempo_proprio`` (s, excluindo as etapas chamadas internamente);
+            * ``invocacoes``: Lista com os registros das chamadas dos algoritmos: ``algoritmo``, ``tempo`` (s) e ``etapas`` (chamadas e tempo de cada etapa durante a chamada).
+        '''
+        with self.__trava:
+            etapas = dict((nome,{'chamadas':dados[0],'tempo':dados[1],'tempo_proprio':dados[2]}) for nome, dados in self.etapas.items())
+        return {'etapas':etapas,'invocacoes':list(self.invocacoes)}
+
+    def texto(self):
+        u'''
+        Método que retorna os dados das etapas em forma de tabela, em ordem decrescente de tempo próprio.
+        '''
+        linhas = [u'%-30s %10s %12s %12s'%('Etapa','Chamadas','Tempo/s',u'Próprio/s')]
+        for nome, dados in sorted(self.etapas.items(),key=lambda item: -item[1][2]):
+            linhas.append('%-30s %10d %12.6f %12.6f'%(nome,dados[0],dados[1],dados[2]))
+        return '\n'.join(linhas)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina para o armazenamento dos resultados de varreduras e lotes em arrays mapeados em memória.
+
+Cada campo dos resultados (Ex.: x, y, T, P, gama e phi) é um arquivo .npy do diretório de resultados, criado com o tamanho
+final e preenchido à medida que os pontos são calculados, de modo que o tamanho dos resultados é limitado pelo disco e não
+pela memória. O arquivo ``descricao.json`` descreve os campos (tipo e dimensão) e o cálculo (sistema, modelos e
+parâmetros da varredura ou do lote).
+
+Os resultados podem ser abertos novamente, sem cópia, pelo numpy (``numpy.load('x.npy',mmap_mode='r')``) ou pela classe
+``Resultados``: ::
+
+    >>> resultados = Resultados('varredura_flash')
+    >>> resultados.descricao['sistema']['componentes']
+    >>> resultados.T[resultados.beta > 0.5].mean()
+
+Os campos reais são inicializados com NaN, os inteiros com -1 e os lógicos com False, de modo que os pontos ainda não
+calculados (ou sem o valor, Ex.: x em um cálculo de coeficiente de fugacidade) são identificados.
+"""
+import os
+import json
+
+from numpy import dtype, load, nan
+from numpy.lib.format import open_memmap
+
+DESCRICAO = 'descricao.json'
+
+def _Preenchimento(tipo):
+    tipo = dtype(tipo)
+    if tipo.kind == 'f':
+        return nan
+    if tipo.kind in 'iu':
+        return -1
+    return 0
+
+class Resultados:
+
+    def __init__(self,diretorio,modo='r'):
+        u'''
+        Resultados de uma varredura ou de um lote gravados em arrays mapeados em memória (vide documentação da rotina).
+
+        ========
+        Entradas
+        ========
+
+        * diretorio (str): Diretório dos resultados;
+        * modo (str): Modo de abertura dos arrays: 'r' (somente leitura) ou 'r+' (leitura e escrita).
+
+        =========
+        Atributos
+        =========
+
+        * ``diretorio``: Conforme a entrada;
+        * ``descricao`` (dict): Conteúdo do arquivo ``descricao.json``;
+        * ``N`` (int): Número de pontos;
+        * ``campos`` (list): Nomes dos campos;
+        * Um array mapeado em memória (numpy.memmap) por campo, de nome igual ao do campo, com uma linha por ponto.
+
+        =======
+        Métodos
+        =======
+
+        * ``criar``: Cria os arquivos dos resultados e os abre para escrita;
+        * ``escrever``: Escreve os valores dos campos de um conjunto de pontos;
+        * ``sincronizar``: Grava no disco as alterações dos arrays.
+        '''
+        self.diretorio = diretorio
+        with open(os.path.join(diretorio,DESCRICAO),'rb') as arquivo:
+            self.descricao = json.load(arquivo)
+        self.N      = self.descricao['N']
+        self.campos = [campo['nome'] for campo in self.descricao['campos']]
+        for nome in self.campos:
+            setattr(self,nome,load(os.path.join(diretorio,nome+'.npy'),mmap_mode=modo))
+
+    def __getitem__(self,nome):
+        if nome not in self.campos:
+            raise KeyError(u'O campo %s não consta nos resultados. Campos disponíveis: %s.'%(nome,', '.join(self.campos)))
+        return getattr(self,nome)
+
+    @staticmethod
+    def criar(diretorio,N,campos,descricao=None):
+        u'''
+        Método para criar os arquivos dos resultados. Retorna um objeto da classe ``Resultados`` aberto para escrita.
+
+        ========
+        Entradas
+        ========
+
+        * diretorio (str): Diretório dos resultados. É criado, caso não exista. Os resultados existentes são substituídos;
+        * N (int): Número de pontos;
+        * campos (list): Campos, na forma (nome, tipo) ou (nome, tipo, dimensão de cada ponto). Ex.: ('T',float), ('x',float,(NC,));
+        * descricao (dict): Descrição do cálculo, gravada no arquivo ``descricao.json`` junto com a dos campos.
+        '''
+        if not os.path.isdir(diretorio):
+            os.makedirs(diretorio)
+        conteudo = dict(descricao or {})
+        conteudo['N']      = int(N)
+        conteudo['campos'] = []
+        for campo in campos:
+            nome, tipo, forma = campo[0], dtype(campo[1]), tuple(campo[2]) if len(campo) > 2 else ()
+            array = open_memmap(os.path.join(diretorio,nome+'.npy'),mode='w+',dtype=tipo,shape=(int(N),)+forma)
+            array[...] = _Preenchimento(tipo)
+            array.flush()
+            del array
+            conteudo['campos'].append({'nome':nome,'tipo':tipo.str,'forma':list(forma)})
+
+        # A descrição é gravada por último: os resultados sem descrição são incompletos
+        with open(os.path.join(diretorio,DESCRICAO),'wb') as arquivo:
+            json.dump(conteudo,arquivo,indent=1,sort_keys=True)
+        return Resultados(diretorio,'r+')
+
+    def escrever(self,linhas,**valores):
+        u'''
+        Método para escrever os valores dos campos (keywords) nas linhas ``linhas`` (índice, fatia ou array de índices).
+        Ex.: ``resultados.escrever(slice(0,100),T=T,x=x)``.
+        '''
+        for nome, valor in valores.items():
+            self[nome][linhas] = valor
+
+    def sincronizar(self):
+        u'''
+        Método para gravar no disco as alterações dos arrays abertos para escrita.
+        '''
+        for nome in self.campos:
+            if getattr(self,nome).mode != 'r':
+                getattr(self,nome).flush()
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Rotina para o cálculo rápido dos pontos de bolha e de orvalho de misturas binárias por interpolação em tabelas
+pré-calculadas (Ex.: em simulações dinâmicas de colunas, em que os mesmos cálculos são repetidos milhões de vezes).
+
+A tabela é calculada uma única vez, pelos algoritmos em lote da classe ``VLE``, em uma grade regular de composições
+(fração molar do componente 1, de 0 a 1) e de pressões (curvas T-x-y) ou de temperaturas (curvas P-x-y). Cada consulta
+é respondida por interpolação bilinear na célula da grade que contém o ponto, em Python puro, com custo de poucos
+microssegundos. Nas curvas P-x-y é interpolado o logaritmo da pressão, aproximadamente linear com a temperatura.
+
+O erro da interpolação de cada célula é estimado na construção, pela comparação entre o valor interpolado e o valor
+calculado no centro da célula. As consultas fora da tabela, ou em células cujo erro estimado é superior à tolerância (ou
+com pontos não convergidos), são respondidas pelo algoritmo em lote correspondente (cálculo exato). O erro retornado
+nessas consultas é o resíduo final do algoritmo, ou NaN caso o algoritmo não tenha convergido.
+
+Exemplo: ::
+
+    >>> Calculo = VLE('PontoBolha_T',Componentes,UNIQUAC(Componentes,340.0,1),VIRIAL(Componentes),Pressao=1.013)
+    >>> tabela  = Tabela_Binaria(Calculo,'pressao',0.8,1.2)
+    >>> T, y1, erro = tabela.bolha_ponto(0.3,1.013)
+    >>> tabela.salvar('tabela_acetona_etanol.npz')
+"""
+import json
+from math import exp as exp_escalar
+
+from numpy import log, exp, linspace, column_stack, asarray, zeros, maximum, abs, inf, nan, where, nonzero, floor, clip, savez_compressed, load
+
+from Erros import Erro_Valor, Erro_Nome
+
+def _Texto(sistema):
+    # Descrição do sistema (vide VLE._Descricao_Sistema) em JSON
+    return json.dumps(sistema,sort_keys=True,default=lambda valor: asarray(valor).tolist())
+
+class Tabela_Binaria:
+
+    def __init__(self,calculo,Constante=None,minimo=None,maximo=None,pontos_composicao=201,pontos_variavel=41,tolerancia=1e-4):
+        u'''
+        Tabela dos pontos de bolha e de orvalho de uma mistura binária.
+
+        ========
+        Entradas
+        ========
+
+        * calculo (VLE): Objeto da classe ``VLE`` da mistura binária, utilizado na construção da tabela e nos cálculos exatos;
+        * Constante (str): Variável da grade, mantida constante em cada curva: 'pressao' (curvas T-x-y, são calculadas as
+          temperaturas) ou 'temperatura' (curvas P-x-y, são calculadas as pressões);
+        * minimo, maximo (float): Faixa da variável da grade (bar ou Kelvin);
+        * pontos_composicao (int): Número de pontos da grade de composições;
+        * pontos_variavel (int): Número de pontos da grade da variável;
+        * tolerancia (float): Erro máximo estimado das células utilizadas na interpolação. O erro de cada célula é o
+          maior entre o erro relativo da temperatura (ou pressão) e o erro absoluto da composição.
+
+        =========
+        Atributos
+        =========
+
+        * ``composicao`` e ``variavel`` (array): Eixos da grade;
+        * ``bolha`` e ``y_bolha`` (array): Temperatura (ou pressão) e fração molar do componente 1 na fase vapor no ponto
+          de bolha de cada ponto da grade, cuja composição é a da fase líquida;
+        * ``orvalho`` e ``x_orvalho`` (array): Temperatura (ou pressão) e fração molar do componente 1 na fase líquida no
+          ponto de orvalho de cada ponto da grade, cuja composição é a da fase vapor;
+        * ``erro_bolha`` e ``erro_orvalho`` (array): Erro estimado de cada célula da grade (infinito nas células com
+          pontos não convergidos);
+        * ``exatos`` (int): Número de consultas respondidas pelo cálculo exato.
+
+        =======
+        Métodos
+        =======
+
+        * ``bolha_ponto`` e ``orvalho_ponto``: Consulta de um ponto. Retornam (temperatura ou pressão, composição da outra fase, erro estimado);
+        * ``bolha_lote`` e ``orvalho_lote``: Consulta de vários pontos de uma só vez (arrays);
+        * ``salvar`` e ``carregar``: Gravação da tabela em um arquivo .npz e leitura da tabela gravada.
+        '''
+        self.calculo    = calculo
+        self.Constante  = Constante
+        self.tolerancia = tolerancia
+        self.exatos     = 0
+        if Constante is None:
+            return # Utilizado por carregar
+
+        if calculo.NC != 2:
+            raise Erro_Valor(u'A tabela está disponível apenas para misturas binárias (a mistura possui %d componentes).'%calculo.NC)
+        if Constante not in ('pressao','temperatura'):
+            raise Erro_Nome(u'keyword(s) incorretas para as constantes: '+Constante+u'. Keywords das constantes disponíveis: pressao, temperatura.')
+
+        self.composicao = linspace(0.0,1.0,pontos_composicao)
+        self.variavel   = linspace(minimo,maximo,pontos_variavel)
+        self.sistema    = calculo._Descricao_Sistema()
+
+        # Pontos da grade e centros das células, calculados de uma só vez
+        nos     = self.__Calcular(self.composicao,self.variavel)
+        centros = self.__Calcular((self.composicao[1:]+self.composicao[:-1])/2,(self.variavel[1:]+self.variavel[:-1])/2)
+        self.bolha, self.y_bolha, self.orvalho, self.x_orvalho = nos[:4]
+
+        # Erro estimado de cada célula: diferença entre o valor interpolado (média dos 4 vértices) e o calculado no centro
+        media = lambda valor: (valor[:-1,:-1]+valor[1:,:-1]+valor[:-1,1:]+valor[1:,1:])/4
+        media_principal = (lambda valor: exp(media(log(valor)))) if Constante == 'temperatura' else media
+        invalida = lambda convergido: ~(convergido[:-1,:-1] & convergido[1:,:-1] & convergido[:-1,1:] & convergido[1:,1:])
+        self.erro_bolha   = where(invalida(nos[4]) | ~centros[4],inf,
+                                  maximum(abs(media_principal(self.bolha)/centros[0]-1),abs(media(self.y_bolha)-centros[1])))
+        self.erro_orvalho = where(invalida(nos[5]) | ~centros[5],inf,
+                                  maximum(abs(media_principal(self.orvalho)/centros[2]-1),abs(media(self.x_orvalho)-centros[3])))
+        self.__Preparar()
+
+    def __Calcular(self,composicao,variavel):
+        # Pontos de bolha e de orvalho de todas as combinações (composição, variável), em arrays (composição, variável)
+        forma = (composicao.size,variavel.size)
+        z1    = (composicao[:,None]+zeros(forma)).ravel().clip(1e-13,1-1e-13) # Composições nulas não são admitidas pelos modelos
+        valor = (variavel[None,:]+zeros(forma)).ravel()
+        z     = column_stack((z1,1-z1))
+
+        bolha, y1, convergido_bolha = self.__Exato('bolha',z,valor)[:3]
+        orvalho, x1, convergido_orvalho = self.__Exato('orvalho',z,valor)[:3]
+        return [bolha.reshape(forma),y1.reshape(forma),orvalho.reshape(forma),x1.reshape(forma),
+                convergido_bolha.reshape(forma),convergido_orvalho.reshape(forma)]
+
+    def __Exato(self,ponto,z,valor):
+        # Cálculo pelos algoritmos em lote: (temperatura ou pressão, fração molar do componente 1 na outra fase, convergência,
+        # resíduo final)
+        calculo  = self.calculo
+        variavel = 'Temp' if self.Constante == 'pressao' else 'Pressao'
+        if ponto == 'bolha':
+            (calculo.PontoBolha_T_Lote if self.Constante == 'pressao' else calculo.PontoBolha_P_Lote)(z,valor)
+            condicao = calculo.Bolha
+        else:
+            (calculo.PontoOrvalho_T_Lote if self.Constante == 'pressao' else calculo.PontoOrvalho_P_Lote)(z,valor)
+            condicao = calculo.Orvalho
+        return (asarray(getattr(condicao,variavel),dtype=float), condicao.comp_molar[:,0].copy(), asarray(condicao.convergido,dtype=bool),
+                asarray(condicao.residuo,dtype=float))
+
+    def __Preparar(self):
+        # Tabelas em listas do Python e constantes da grade regular, utilizadas nas consultas de um ponto
+        self.__n_c, self.__n_v = self.composicao.size, self.variavel.size
+        self.__v0      = float(self.variavel[0])
+        self.__escala_c = (self.__n_c-1)/float(self.composicao[-1]-self.composicao[0])
+        self.__escala_v = (self.__n_v-1)/float(self.variavel[-1]-self.variavel[0])
+        self.__logaritmo = self.Constante == 'temperatura'
+        principal = (lambda valor: log(valor)) if self.__logaritmo else (lambda valor: valor)
+        self.__lote     = {'bolha'  :(principal(self.bolha),self.y_bolha,self.erro_bolha),
+                           'orvalho':(principal(self.orvalho),self.x_orvalho,self.erro_orvalho)}
+        self.__tabelas  = dict([(ponto,tuple([tabela.tolist() for tabela in tabelas])) for ponto, tabelas in self.__lote.items()])
+
+    def __Ponto(self,ponto,composicao,valor):
+        u = composicao*self.__escala_c
+        w = (valor-self.__v0)*self.__escala_v
+        if 0.0 <= u <= self.__n_c-1 and 0.0 <= w <= self.__n_v-1:
+            i = min(int(u),self.__n_c-2)
+            j = min(int(w),self.__n_v-2)
+            principal, fracao, erro = self.__tabelas[ponto]
+            if erro[i][j] <= self.tolerancia:
+                u -= i
+                w -= j
+                a, b = principal[i], principal[i+1]
+                c, d = fracao[i], fracao[i+1]
+                valor = (a[j]*(1-w)+a[j+1]*w)*(1-u)+(b[j]*(1-w)+b[j+1]*w)*u
+                return (exp_escalar(valor) if self.__logaritmo else valor,
+                        (c[j]*(1-w)+c[j+1]*w)*(1-u)+(d[j]*(1-w)+d[j+1]*w)*u,
+                        erro[i][j])
+
+        # Cálculo exato
+        resultado = self.__Lote_Exato(ponto,asarray([composicao],dtype=float),asarray([valor],dtype=float))
+        return float(resultado[0][0]), float(resultado[1][0]), float(resultado[2][0])
+
+    def __Lote_Exato(self,ponto,composicao,valor):
+        if self.calculo is None:
+            raise Erro_Valor(u'O ponto (%g, %g) não pode ser interpolado e a tabela não possui um objeto VLE para o cálculo exato (vide carregar).'%(composicao[0],valor[0]))
+        self.exatos += composicao.size
+        composicao = composicao.clip(1e-13,1-1e-13)
+        principal, fracao, convergido, residuo = self.__Exato(ponto,column_stack((composicao,1-composicao)),valor)
+        return principal, fracao, where(convergido,residuo,nan) # Erro do cálculo exato: resíduo final do algoritmo
+
+    def bolha_ponto(self,x1,valor):
+        u'''
+        Ponto de bolha de uma composição da fase líquida (fração molar do componente 1) na pressão (ou temperatura) ``valor``.
+        Retorna a temperatura (ou pressão), a fração molar do componente 1 na fase vapor e o erro estimado. No cálculo
+        exato, o erro é o resíduo final do algoritmo (NaN caso o algoritmo não tenha convergido).
+        '''
+        return self.__Ponto('bolha',x1,valor)
+
+    def orvalho_ponto(self,y1,valor):
+        u'''
+        Ponto de orvalho de uma composição da fase vapor (fração molar do componente 1) na pressão (ou temperatura) ``valor``.
+        Retorna a temperatura (ou pressão), a fração molar do componente 1 na fase líquida e o erro estimado. No cálculo
+        exato, o erro é o resíduo final do algoritmo (NaN caso o algoritmo não tenha convergido).
+        '''
+        return self.__Ponto('orvalho',y1,valor)
+
+    def __Lote(self,ponto,composicao,valor):
+        composicao = asarray(composicao,dtype=float).ravel()
+        valor      = zeros(composicao.size) + valor
+        principal, fracao, erro_celula = self.__lote[ponto]
+
+        u = composicao*self.__escala_c
+        w = (valor-self.__v0)*self.__escala_v
+        dentro = (u >= 0) & (u <= self.__n_c-1) & (w >= 0) & (w <= self.__n_v-1)
+        i = clip(floor(u),0,self.__n_c-2).astype(int)
+        j = clip(floor(w),0,self.__n_v-2).astype(int)
+        u, w = clip(u-i,0,1), clip(w-j,0,1)
+        interpolar = lambda tabela: ((tabela[i,j]*(1-w)+tabela[i,j+1]*w)*(1-u)+(tabela[i+1,j]*(1-w)+tabela[i+1,j+1]*w)*u)
+
+        resultado = [exp(interpolar(principal)) if self.__logaritmo else interpolar(principal),interpolar(fracao),where(dentro,erro_celula[i,j],inf)]
+        exatos = nonzero(resultado[2] > self.tolerancia)[0]
+        if exatos.size:
+            calculado = self.__Lote_Exato(ponto,composicao[exatos],valor[exatos])
+            resultado[0][exatos], resultado[1][exatos], resultado[2][exatos] = calculado
+        return tuple(resultado)
+
+    def bolha_lote(self,x1,valor):
+        u'''
+        Forma de ``bolha_ponto`` para várias composições (array) e um valor único ou um por composição. Os pontos que não
+        podem ser interpolados são calculados de uma só vez pelo algoritmo em lote.
+        '''
+        return self.__Lote('bolha',x1,valor)
+
+    def orvalho_lote(self,y1,valor):
+        u'''
+        Forma de ``orvalho_ponto`` para várias composições (array) e um valor único ou um por composição.
+        '''
+        return self.__Lote('orvalho',y1,valor)
+
+    def salvar(self,arquivo):
+        u'''
+        Método para salvar a tabela em um arquivo comprimido (.npz).
+        '''
+        savez_compressed(arquivo,Constante=self.Constante,tolerancia=self.tolerancia,sistema=_Texto(self.sistema),
+                         composicao=self.composicao,variavel=self.variavel,bolha=self.bolha,y_bolha=self.y_bolha,
+                         orvalho=self.orvalho,x_orvalho=self.x_orvalho,erro_bolha=self.erro_bolha,erro_orvalho=self.erro_orvalho)
+
+    @staticmethod
+    def carregar(arquivo,calculo=None):
+        u'''
+        Método para carregar uma tabela salva pelo método ``salvar``. Retorna um objeto da classe ``Tabela_Binaria``.
+        O objeto ``calculo`` (VLE), utilizado nos cálculos exatos, deve ser do mesmo sistema (componentes, modelos e
+        parâmetros) da tabela. Sem ``calculo``, as consultas que não podem ser interpoladas levantam um ValueError.
+        '''
+        dados  = load(arquivo)
+        tabela = Tabela_Binaria(calculo,None,tolerancia=float(dados['tolerancia']))
+        tabela.Constante = str(dados['Constante'])
+        tabela.sistema   = json.loads(str(dados['sistema']))
+        if calculo is not None and json.loads(_Texto(calculo._Descricao_Sistema())) != tabela.sistema:
+            raise Erro_Valor(u'O objeto VLE inserido não corresponde ao sistema da tabela (componentes, modelos ou parâmetros).')
+        for chave in ['composicao','variavel','bolha','y_bolha','orvalho','x_orvalho','erro_bolha','erro_orvalho']:
+            setattr(tabela,chave,dados[chave])
+        tabela._Tabela_Binaria__Preparar()
+        return tabela
@@ -9,20 +9,32 @@ Rotinas para Cálculo do Equilíbrio de fases em Misturas através da abordagem
 Modelos termodinâmicos:
     - UNIQUAC
     - VIRIAL
+    - SRK e Peng-Robinson
     - NRTL
     - WILSON
     - Van Laar
+    - UNIFAC
 
 Métodos:
     - Second_Virial_Coef: Cálculo do segundo coeficiente do Virial
     - Coeficiente_Atividade: Cálculo do Coeficiente de Atividade
+    - Coeficiente_Atividade_Lote: Cálculo do Coeficiente de Atividade para várias composições de uma só vez
     - Coeficiente_Fugacidade: Cálculo do Coeficiente de Fugacidade
+    - Coeficiente_Fugacidade_Lote: Cálculo do Coeficiente de Fugacidade para vários estados (y, P, T) de uma só vez
     - Flash: Cáculo de um flash (Incompleto)
+    - Flash_Lote: Cálculo de flash de várias alimentações de uma só vez, com classificação das fases
     - PhiSat: Cálculo do coeficiente de fugacidade nas condições de saturação
     - PontoBolha_P: Cálculo do ponto de bolha (T conhecido) (Dado: x, T/K -> Cálcula: y, P/bar)
     - PontoOrvalho_P: Cálculo do ponto de orvalho (T conhecido) (Dado: y, T/K -> Cálcula: x, P/bar)
     - PontoBolha_T: Cálculo do ponto de bolha (P conhecido) (Dado: x, P/bar -> Cálcula: y, T/K)
     - PontoOrvalho_T: Cálculo do ponto de orvalho (P conhecido) (Dado: y, P/bar -> Cálcula: x, T/K)
+    - PontoBolha_P_Lote, PontoBolha_T_Lote: Cálculo do ponto de bolha de várias composições de uma só vez
+    - PontoOrvalho_P_Lote, PontoOrvalho_T_Lote: Cálculo do ponto de orvalho de várias composições de uma só vez
+    - Predicao: Cálculo das curvas (binário) ou superfícies (grade de composições, 3 ou mais componentes) de bolha e orvalho
+    - Predicao_Iterativa: Forma iterativa de Predicao, que entrega os resultados em blocos à medida que são calculados
+    - Ponto_Controle: Gravação dos blocos de Predicao/Predicao_Iterativa em disco, para a retomada de varreduras interrompidas
+    - Predicao_Mapeada: Forma de Predicao que grava os resultados em arrays mapeados em memória (vide rotina Resultados)
+    - Varredura_Flash: Flash de uma grade de composições, temperaturas e pressões, gravado em arrays mapeados em memória
 
 Referências:
 [1] PRAUSNITZ, J. M. et al. Computer Calculations for multicomponent vapor-liquid and liquid-liquid equilibria. [s.l.] Prendice-Hall, 1980. p. 353
@@ -30,14 +42,17 @@ Referências:
     and Development, v. 14, n. 3, p. 209–216, jul. 1975.
 [3] SMITH, J. M.; NESS, H. C. VAN; ABBOTT, M. M. Introduction to Chemical Engineering Thermodinamics. 7th. ed. [s.l.] Mc-Graw Hills, [s.d.]. 
 """
-# Sistema
-import sys
-reload(sys)
-sys.setdefaultencoding("utf-8") # Forçar o sistema utilizar o coding utf-8
-
+import os
+import json
+from hashlib import sha1
+from math import factorial
 from threading import Thread
-from warnings import warn
-from numpy import log, exp, size, abs, zeros, linspace
+from collections import deque
+from itertools import combinations, islice
+from Diagnostico import Diagnostico, solucao
+from Erros import Erro_Valor, Erro_Nome
+from Resultados import Resultados
+from numpy import log, exp, sqrt, cbrt, cos, arccos, pi, size, abs, zeros, ones, linspace, array, asarray, einsum, unique, newaxis, nonzero, column_stack, eye, ix_, where, errstate, diff, int32, savez, savez_compressed, load, concatenate, inf, isfinite, array_equal, repeat, tile
 
 class Condicao:
     
@@ -61,7 +76,11 @@ class Condicao:
         
         * ``Numero_componentes``(int): Número de componentes utilizado
         * ``Massa_molar``       (list): lista com as massas molares dos componentes;
-        * ``beta``              (float): relação entre vapor e líquido.
+        * ``beta``              (float): relação entre vapor e líquido;
+        * ``iteracoes``         (int ou array): número de iterações realizadas pelo algoritmo (um valor por ponto nos algoritmos em lote);
+        * ``convergido``        (bool ou array): indica se o algoritmo atingiu a tolerância (um valor por ponto nos algoritmos em lote);
+        * ``status``            (str ou array): estado final do algoritmo: 'convergido', 'max_iter', 'divergido' ou 'oscilante' (vide ``Convergencia``);
+        * ``residuo``           (float ou array): valor final do critério de parada do algoritmo.
 
         =========
         Atributos
@@ -79,13 +98,13 @@ class Condicao:
         # VALIDAÇÃO
         # ----------------------------------------------------
         # Keywords disponíveis
-        keywordsEntrada = ['massa_molar','numero_componentes','beta']
+        keywordsEntrada = ['massa_molar','numero_componentes','beta','iteracoes','convergido','status','residuo']
 
         # Validação se houve keywords digitadas incorretamente:
         keyincorreta  = [key for key in kwargs.keys() if not key in keywordsEntrada]
 
         if len(keyincorreta) != 0:
-            raise NameError(u'keyword(s) incorretas: '+', '.join(keyincorreta)+'.'+u' Keywords disponíveis: '+', '.join(keywordsEntrada)+'.')
+            raise Erro_Nome(u'keyword(s) incorretas: '+', '.join(keyincorreta)+'.'+u' Keywords disponíveis: '+', '.join(keywordsEntrada)+'.')
 
         # ----------------------------------------------------
         # EXECUÇÃO
@@ -97,6 +116,10 @@ class Condicao:
         self.coefAct = coefAct        
         self.comp_molar = composicao        
         self.beta     = kwargs.get('beta')
+        self.iteracoes  = kwargs.get('iteracoes')
+        self.convergido = kwargs.get('convergido')
+        self.status     = kwargs.get('status')
+        self.residuo    = kwargs.get('residuo')
 
         # Caracterização dos kwargs
         mm_comp = kwargs.get(keywordsEntrada[0])
@@ -107,9 +130,337 @@ class Condicao:
             mm_medio = sum([self.comp_molar[0]*mm_comp[0],self.comp_molar[1]*mm_comp[1]]) # em g/mol
             self.comp_massica = [mm_comp[i]*self.comp_molar[i]/mm_medio for i in xrange(NC)]
 
+class Convergencia:
+    
+    def __init__(self,N,tolAlg,maxiter,janela=10,diagnostico=None,algoritmo=None,traco=None):
+        '''
+        Acompanhamento da convergência dos algoritmos iterativos, para um ou vários pontos iterados simultaneamente.
+        A cada iteração, o critério de parada (resíduo) de cada ponto é comparado à tolerância e ao menor valor já obtido.
+        O estado de cada ponto é:
+        
+        * ``'iterando'``: o ponto ainda deve ser iterado;
+        * ``'convergido'``: o resíduo atingiu a tolerância;
+        * ``'max_iter'``: o número máximo de iterações foi atingido;
+        * ``'divergido'``: o resíduo deixou de ser finito, ou não diminuiu durante ``janela`` iterações e é mais de 10 vezes superior ao menor valor obtido;
+        * ``'oscilante'``: o resíduo não diminuiu durante ``janela`` iterações, sem crescer (oscilação ou estagnação).
+        
+        Desta forma, os pontos que não convergem são interrompidos logo que isto é detectado, sem consumir o número máximo de iterações.
+        Apenas os valores correntes são armazenados, de modo que a memória utilizada não depende do número de iterações.
+        
+        ========
+        Entradas
+        ========
+        
+        * N (int): Número de pontos iterados;
+        * tolAlg (float): Tolerância do resíduo;
+        * maxiter (int): Número máximo de iterações;
+        * janela (int): Número de iterações sem redução do resíduo para a interrupção. Caso seja 0 ou None, a detecção é desativada;
+        * diagnostico (Diagnostico): Coletor em que os pontos não convergidos são registrados (evento 'nao_convergido');
+        * algoritmo (str): Nome do algoritmo, utilizado no registro;
+        * traco (deque): Buffer circular em que cada iteração é registrada, para depuração. Caso seja None, as iterações não são registradas.
+        
+        =========
+        Atributos
+        =========
+        
+        * ``ativo`` (array): Indica os pontos que ainda devem ser iterados (N);
+        * ``estado`` (array): Estado de cada ponto (N);
+        * ``iteracoes`` (array): Número de iterações de cada ponto (N);
+        * ``residuo`` (array): Último resíduo de cada ponto (N).
+        '''
+        self.tolAlg      = tolAlg
+        self.maxiter     = maxiter
+        self.janela      = janela
+        self.diagnostico = diagnostico
+        self.algoritmo   = algoritmo
+        self.traco       = traco
+        
+        self.residuo       = zeros(N) + inf
+        self.melhor        = zeros(N) + inf # Menor resíduo obtido
+        self.sem_progresso = zeros(N,dtype=int) # Iterações desde a última redução do resíduo
+        self.iteracoes     = zeros(N,dtype=int)
+        self.estado        = array(['iterando']*N,dtype=object)
+        self.ativo         = ones(N,dtype=bool)
+        
+    def atualizar(self,residuo,k=None,valor=None):
+        '''
+        Método para registrar o resíduo de uma iteração dos pontos ``k`` (por padrão, os pontos ativos). Retorna o array ``ativo``.
+        O valor da variável iterada (``valor``) é utilizado apenas no registro do traço.
+        '''
+        if k is None:
+            k = nonzero(self.ativo)[0]
+        residuo = zeros(len(k)) + residuo
+        
+        self.residuo[k]    = residuo
+        self.iteracoes[k] += 1
+        with errstate(invalid='ignore'): # Resíduos não finitos são classificados abaixo
+            melhorou = residuo < self.melhor[k]
+            self.melhor[k]        = where(melhorou,residuo,self.melhor[k])
+            self.sem_progresso[k] = where(melhorou,0,self.sem_progresso[k]+1)
+            
+            # Classificação, da menor para a maior prioridade
+            estado = self.estado[k]
+            estado[self.iteracoes[k] >= self.maxiter] = 'max_iter'
+            if self.janela:
+                estagnado = self.sem_progresso[k] >= self.janela
+                crescente = residuo > 10*self.melhor[k]
+                estado[estagnado &  crescente] = 'divergido'
+                estado[estagnado & ~crescente] = 'oscilante'
+            estado[~isfinite(residuo)]     = 'divergido'
+            estado[residuo <= self.tolAlg] = 'convergido'
+        self.estado[k] = estado
+        self.ativo[k]  = estado == 'iterando'
+        
+        if self.traco is not None:
+            self.traco.append({'algoritmo':self.algoritmo,'indice':array(k),'iteracao':self.iteracoes[k],'residuo':residuo,
+                               'valor':None if valor is None else zeros(len(k)) + valor})
+        return self.ativo
+        
+    def telemetria(self,escalar=False):
+        '''
+        Método que retorna os dados da convergência na forma das keywords da classe ``Condicao`` (``iteracoes``, ``convergido``, 
+        ``status`` e ``residuo``), com um valor por ponto ou, caso ``escalar`` seja True, os valores do único ponto. Os pontos não 
+        convergidos são registrados no coletor de diagnósticos.
+        '''
+        convergido = self.estado == 'convergido'
+        if self.diagnostico is not None and not convergido.all():
+            falhas = nonzero(~convergido)[0]
+            self.diagnostico.registrar('nao_convergido',falhas.size,algoritmo=self.algoritmo,status=self.estado[falhas[-1]],
+                                       residuo=self.residuo[falhas[-1]])
+        if escalar:
+            return {'iteracoes':int(self.iteracoes[0]),'convergido':bool(convergido[0]),'status':self.estado[0],'residuo':float(self.residuo[0])}
+        return {'iteracoes':self.iteracoes,'convergido':convergido,'status':self.estado,'residuo':self.residuo}
+
+def Grade_Simplex(NC,resolucao,minimo=1e-13):
+    '''
+    Geração de uma grade baricêntrica regular sobre o simplex das composições.
+    
+    ========
+    Entradas
+    ========
+    
+    * NC (int): Número de componentes;
+    * resolucao (int): Número de divisões de cada aresta do simplex;
+    * minimo (float): Fração molar mínima, utilizada nos vértices e arestas do simplex (composições nulas não são admitidas pelos modelos).
+    
+    ======
+    Saídas
+    ======
+    
+    * indice (array de inteiros): Índice de cada ponto na grade, de dimensão (M,NC). A soma de cada linha é igual a ``resolucao``;
+    * composicao (array): Composições de cada ponto, de dimensão (M,NC).
+    
+    O número de pontos é M = (resolucao+NC-1)!/(resolucao!(NC-1)!).
+    '''
+    # Cada ponto corresponde a uma escolha das posições das NC-1 divisórias entre resolucao+NC-1 posições
+    return _Pontos_Simplex(list(combinations(xrange(resolucao+NC-1),NC-1)),NC,resolucao,minimo)
+
+def _Numero_Pontos_Simplex(NC,resolucao):
+    '''
+    Número de pontos da grade de ``Grade_Simplex``, sem gerá-la.
+    '''
+    return factorial(resolucao+NC-1)//(factorial(resolucao)*factorial(NC-1))
+
+def _Eixo_Binario():
+    '''
+    Eixo das composições [z, 1-z] de ``VLE.Predicao`` para misturas binárias.
+    '''
+    z_1 = linspace(1e-13,0.1,1000) # Devido à união das pontas, o passo nas extremidades é menor
+    z_2 = linspace(0.1,0.9,500)
+    z_3 = linspace(0.9,0.9999999999999,1000) # Devido à união das pontas, o passo nas extremidades é menor
+    z   = concatenate((z_1,z_2,z_3)) # Formação do eixo X, eixo das composições, completo
+    return column_stack((z,1-z))
+
+def _Pontos_Simplex(divisorias,NC,resolucao,minimo=1e-13):
+    '''
+    Conversão das posições das divisórias (vide ``Grade_Simplex``) nos índices e composições dos pontos da grade.
+    Permite gerar a grade por partes, a partir do iterador ``combinations``.
+    '''
+    divisorias = array(divisorias,dtype=int32).reshape(-1,NC-1)
+    M          = divisorias.shape[0]
+    extremos   = column_stack((zeros(M,dtype=int32)-1,divisorias,zeros(M,dtype=int32)+resolucao+NC-1))
+    indice     = diff(extremos,axis=1) - 1
+    
+    composicao = (indice/float(resolucao)).clip(minimo,None)
+    composicao = composicao/composicao.sum(axis=1)[:,newaxis]
+    return indice, composicao
+
+class Varredura:
+    
+    def __init__(self,indice,composicao,Constante,Valor_cte,Bolha,Orvalho):
+        '''
+        Armazenamento dos resultados de uma varredura da grade de composições (vide ``Grade_Simplex`` e ``VLE.Predicao``).
+        Os resultados são armazenados em arrays com uma linha por ponto da grade.
+        
+        ========
+        Entradas
+        ========
+        
+        * indice (array de inteiros): Índices dos pontos da grade, de dimensão (M,NC);
+        * composicao (array): Composições globais dos pontos da grade, de dimensão (M,NC);
+        * Constante (str): Nome da variável mantida constante: 'temperatura' ou 'pressao';
+        * Valor_cte (float): Valor da variável mantida constante;
+        * Bolha, Orvalho: Objetos da classe ``Condicao`` calculados pelos algoritmos em lote.
+        
+        =========
+        Atributos
+        =========
+        
+        * ``indice``, ``composicao``, ``Constante``, ``Valor_cte``: Conforme as entradas;
+        * ``bolha`` (array): Pressão (temperatura constante) ou temperatura (pressão constante) do ponto de bolha (M);
+        * ``orvalho`` (array): Pressão (temperatura constante) ou temperatura (pressão constante) do ponto de orvalho (M);
+        * ``y_bolha`` (array): Composição da fase vapor no ponto de bolha (M,NC);
+        * ``x_orvalho`` (array): Composição da fase líquida no ponto de orvalho (M,NC);
+        * ``convergido`` (array): Indica se ambos os cálculos (bolha e orvalho) convergiram em cada ponto (M).
+        
+        =======
+        Métodos
+        =======
+        
+        * ``localizar``: Retorna a linha correspondente a um índice da grade;
+        * ``salvar``: Salva os arrays em um arquivo .npz;
+        * ``carregar``: Carrega uma varredura salva por ``salvar``.
+        '''
+        self.indice     = indice
+        self.composicao = composicao
+        self.Constante  = Constante
+        self.Valor_cte  = Valor_cte
+        if Bolha is None:
+            return # Utilizado por carregar
+        
+        variavel = 'Pressao' if Constante == 'temperatura' else 'Temp'
+        self.bolha      = asarray(getattr(Bolha,variavel),dtype=float)
+        self.orvalho    = asarray(getattr(Orvalho,variavel),dtype=float)
+        self.y_bolha    = Bolha.comp_molar
+        self.x_orvalho  = Orvalho.comp_molar
+        self.convergido = Bolha.convergido & Orvalho.convergido
+        
+    def localizar(self,indice):
+        '''
+        Método para encontrar a linha dos arrays correspondente a um índice da grade (Ex.: [2,3,15] para NC = 3 e resolucao = 20).
+        '''
+        linha = nonzero((self.indice == asarray(indice)).all(axis=1))[0]
+        if linha.size == 0:
+            raise Erro_Valor(u'O índice inserido não consta na grade.')
+        return int(linha[0])
+        
+    def salvar(self,arquivo):
+        '''
+        Método para salvar os arrays da varredura em um arquivo comprimido (.npz).
+        '''
+        savez_compressed(arquivo,indice=self.indice,composicao=self.composicao,Constante=self.Constante,Valor_cte=self.Valor_cte,
+                         bolha=self.bolha,orvalho=self.orvalho,y_bolha=self.y_bolha,x_orvalho=self.x_orvalho,convergido=self.convergido)
+    
+    @staticmethod
+    def carregar(arquivo):
+        '''
+        Método para carregar uma varredura salva pelo método ``salvar``. Retorna um objeto da classe ``Varredura``.
+        '''
+        dados = load(arquivo)
+        varredura = Varredura(dados['indice'],dados['composicao'],str(dados['Constante']),float(dados['Valor_cte']),None,None)
+        for chave in ['bolha','orvalho','y_bolha','x_orvalho','convergido']:
+            setattr(varredura,chave,dados[chave])
+        return varredura
+
+class Ponto_Controle:
+    
+    CAMPOS = ['Pressao','Temp','comp_molar','coeffug','coefAct','iteracoes','convergido','status','residuo']
+    
+    def __init__(self,diretorio,especificacao):
+        '''
+        Pontos de controle (checkpoints) de uma varredura (vide ``VLE.Predicao`` e ``VLE.Predicao_Iterativa``). Cada bloco 
+        calculado é gravado em um arquivo .npz do diretório, de modo que uma varredura interrompida (Ex.: término do processo
+        em um servidor compartilhado) pode ser retomada com a mesma especificação, sem calcular novamente os blocos já gravados.
+        
+        ========
+        Entradas
+        ========
+        
+        * diretorio (str): Diretório dos arquivos. É criado, caso não exista;
+        * especificacao (dict): Especificação da varredura (componentes, modelos, constante, resolução, tamanho dos blocos 
+          e tolerâncias). É gravada no arquivo ``especificacao.json`` e comparada à especificação gravada, caso o diretório 
+          já tenha sido utilizado. Caso sejam diferentes, é levantado um ValueError.
+        
+        =======
+        Métodos
+        =======
+        
+        * ``carregar``: Retorna os objetos ``Condicao`` (bolha e orvalho) de um bloco gravado, ou None;
+        * ``salvar``: Grava um bloco calculado.
+        
+        Os arquivos são gravados em um arquivo temporário e renomeados ao final, de modo que um bloco interrompido durante a
+        gravação não é considerado.
+        '''
+        self.diretorio     = diretorio
+        self.especificacao = json.loads(json.dumps(especificacao,default=lambda valor: asarray(valor).tolist())) # Mesmos tipos (unicode, listas) da especificação gravada
+        if not os.path.isdir(diretorio):
+            os.makedirs(diretorio)
+        
+        arquivo = os.path.join(diretorio,'especificacao.json')
+        if os.path.exists(arquivo):
+            with open(arquivo,'rb') as aberto:
+                gravada = json.load(aberto)
+            if gravada != self.especificacao:
+                diferentes = sorted([chave for chave in set(gravada)|set(self.especificacao) if gravada.get(chave) != self.especificacao.get(chave)])
+                raise Erro_Valor(u'O diretório %s contém os pontos de controle de outra varredura (diferenças: %s). Utilize outro diretório ou remova o existente.'%(diretorio,', '.join(diferentes)))
+        else:
+            self.__Gravar(arquivo,lambda aberto: json.dump(self.especificacao,aberto,indent=1,sort_keys=True))
+    
+    def __Gravar(self,arquivo,escrita):
+        temporario = arquivo+'.tmp'
+        with open(temporario,'wb') as aberto:
+            escrita(aberto)
+            aberto.flush()
+            os.fsync(aberto.fileno())
+        os.rename(temporario,arquivo)
+    
+    def __Arquivo(self,inicio):
+        return os.path.join(self.diretorio,'bloco_%09d.npz'%inicio)
+    
+    def carregar(self,inicio,composicao):
+        '''
+        Método que retorna os objetos ``Condicao`` (bolha, orvalho) do bloco que começa na posição ``inicio`` do eixo de
+        composições, ou None caso o bloco não tenha sido gravado. As composições gravadas são comparadas às do bloco (``composicao``).
+        '''
+        arquivo = self.__Arquivo(inicio)
+        if not os.path.exists(arquivo):
+            return None
+        with load(arquivo) as dados:
+            if not array_equal(dados['composicao'],composicao):
+                raise Erro_Valor(u'As composições do bloco %d gravado em %s não correspondem às da varredura.'%(inicio,self.diretorio))
+            
+            condicoes = []
+            for fase in ('Bolha','Orvalho'):
+                valores = dict([(campo,dados[fase+'_'+campo] if fase+'_'+campo in dados.files else None) for campo in self.CAMPOS])
+                if valores['status'] is not None:
+                    valores['status'] = valores['status'].astype(object) # Como em Convergencia
+                condicoes.append(Condicao(*[valores[campo] for campo in self.CAMPOS[:5]],**dict([(campo,valores[campo]) for campo in self.CAMPOS[5:]])))
+        return tuple(condicoes)
+    
+    def salvar(self,inicio,composicao,Bolha,Orvalho):
+        '''
+        Método para gravar o bloco que começa na posição ``inicio``: composições e objetos ``Condicao`` de bolha e de orvalho.
+        '''
+        dados = {'composicao':composicao}
+        for fase, condicao in (('Bolha',Bolha),('Orvalho',Orvalho)):
+            for campo in self.CAMPOS:
+                if getattr(condicao,campo) is not None:
+                    dados[fase+'_'+campo] = asarray(getattr(condicao,campo))
+            if fase+'_status' in dados:
+                dados[fase+'_status'] = dados[fase+'_status'].astype(str) # Arrays de objetos exigem pickle
+        self.__Gravar(self.__Arquivo(inicio),lambda aberto: savez(aberto,**dados))
+
+def _Concatenar_Condicoes(condicoes):
+    '''
+    União dos objetos ``Condicao`` calculados pelos algoritmos em lote para blocos de composições (um valor por ponto).
+    '''
+    valores = dict([(campo,None if getattr(condicoes[0],campo) is None else concatenate([getattr(condicao,campo) for condicao in condicoes]))
+                    for campo in Ponto_Controle.CAMPOS])
+    return Condicao(*[valores[campo] for campo in Ponto_Controle.CAMPOS[:5]],**dict([(campo,valores[campo]) for campo in Ponto_Controle.CAMPOS[5:]]))
+
 class VLE(Thread):        
 
-    def __init__(self,Algoritmo,Componentes,model_liq, model_vap,z=None,Temp=None,Pressao=None,estgama=None,estphi=None, estBeta = 0.5, tolAlg=1e-10, toleq=1e-4, maxiter=100, z_coordenacao = 10.0 ):    
+    def __init__(self,Algoritmo,Componentes,model_liq, model_vap,z=None,Temp=None,Pressao=None,estgama=None,estphi=None, estBeta = 0.5, tolAlg=1e-10, toleq=1e-4, maxiter=100, z_coordenacao = 10.0, diagnostico=None, janela_estagnacao=10, tamanho_traco=0 ):    
         '''
         ************************
         Vapor-Liquid Equilibrium
@@ -140,7 +491,7 @@ class VLE(Thread):
                 >>> Componentes = [Comp1,Comp2]
                 
         * model_liq (list): É um objeto do grupo de classes de modelos da rotina ``Conexao``. Vide documentação dos modelos presentes nesta rotina. 
-          Os modelos para a fase líquida disponíveis na rotina são: UNIQUAC[1] , NRTL[2], WILSON[3] e Van_Laar[4];
+          Os modelos para a fase líquida disponíveis na rotina são: UNIQUAC[1] , NRTL[2], WILSON[3], Van_Laar[4] e UNIFAC;
 
             * Exemplo da entrada model_liq: ::
             
@@ -154,7 +505,7 @@ class VLE(Thread):
                 >>> model_liq = Van_Laar(Componentes)
                 
         * model_vap (list): É um objeto do grupo de classes de modelos da rotina ``Conexao``. Vide documentação dos modelos presentes nesta rotina.
-          Os modelos para a fase de vapor disponíveis na rotina são: VIRIAL[5];
+          Os modelos para a fase de vapor disponíveis na rotina são: VIRIAL[5], SRK[8] e Peng_Robinson[9];
             
             * Exemplo da entrada model_vap: ::
             
@@ -175,7 +526,10 @@ class VLE(Thread):
         * tolAlg (float): Tolerância do algoritmo, a tolerância desejada para a operação dos métodos;
         * toleq (float): Tolerância do equilíbrio, a tolerância desejada para o equilíbrio;
         * maxiter (int): Número máximo de iterações desejadas para a operação dos métodos;
-        * z_coordenacao (float): Número de coordenação do componente.
+        * z_coordenacao (float): Número de coordenação do componente;
+        * diagnostico (Diagnostico): Coletor dos avisos de faixa de validade emitidos durante os cálculos, vide documentação da rotina ``Diagnostico``;
+        * janela_estagnacao (int): Número de iterações sem redução do critério de parada após as quais um algoritmo é interrompido como divergente ou oscilante, vide documentação da classe ``Convergencia``;
+        * tamanho_traco (int): Número de iterações mantidas no traço dos algoritmos (atributo ``traco``), para depuração.
         
         
         ===============
@@ -190,7 +544,10 @@ class VLE(Thread):
             * tolAlg = 1e-10;
             * toleq = 1e-4;
             * maxiter = 100;
-            * z_coordenacao = 10.0.
+            * z_coordenacao = 10.0;
+            * diagnostico: Pode ser None. Neste caso, é criado um coletor com o nível 'resumo';
+            * janela_estagnacao = 10. Caso seja 0 ou None, os algoritmos são interrompidos apenas pela tolerância ou pelo número máximo de iterações;
+            * tamanho_traco = 0. Neste caso, as iterações não são registradas.
         
         =========
         Atributos
@@ -230,16 +587,26 @@ class VLE(Thread):
             * Método que realiza o cálculo do segundo coeficiente Virial, de acordo com as regras de Hayden O'Connel[6] e Tsonopoulos[7], vide documentação do método.
         * ``Coeficiente_Atividade``:
             * Método para cálcular do coeficiente de atividade, vide documentação do método.
+        * ``Coeficiente_Atividade_Lote``:
+            * Método para cálcular do coeficiente de atividade de várias composições de uma só vez, vide documentação do método.
         * ``Coeficiente_Fugacidade``:
             * Método para cálcular do coeficiente de fugacidade, vide documentação do método.
+        * ``Coeficiente_Fugacidade_Lote``:
+            * Método para cálcular do coeficiente de fugacidade de vários estados de uma só vez, vide documentação do método.
         * ``Flash``:
             * Método para realizar o cálculo de flash, vide documentação do método.
+        * ``Flash_Lote``:
+            * Método para realizar o cálculo de flash de várias alimentações de uma só vez, vide documentação do método.
         * ``Phisat``:
             Método que realiza o cálculo de phisat (coeficiente de fugacidade nas condições de saturação).
         * ``PontoBolha_P``:
             Método para realizar o cálculo do ponto de bolha dado x e T.
         * ``PontoBolha_T``:
             Método para realizar o cálculo do ponto de bolha dado x e P.
+        * ``PontoBolha_P_Lote`` e ``PontoBolha_T_Lote``:
+            Métodos para realizar o cálculo do ponto de bolha de várias composições de uma só vez.
+        * ``PontoOrvalho_P_Lote`` e ``PontoOrvalho_T_Lote``:
+            Métodos para realizar o cálculo do ponto de orvalho de várias composições de uma só vez.
         * ``PontoOrvalho_P``:
             Método para realizar o cálculo do ponto de orvalho dado y e T.
         * ``PontoOrvalho_T``:
@@ -372,6 +739,12 @@ class VLE(Thread):
         
         [7] TSONOPOULOS, C.; HEIDMAN, J.L. From the Virial to the cubic equation of state. 
         Fluid Phase Equilib. 57 (1990) 261–276.
+        
+        [8] SOAVE, G. Equilibrium constants from a modified Redlich-Kwong equation of state. 
+        Chem. Eng. Sci. 27 (1972) 1197–1203.
+        
+        [9] PENG, D.-Y.; ROBINSON, D. B. A New Two-Constant Equation of State. 
+        Ind. Eng. Chem. Fundam. 15 (1976) 59–64.
 
         '''
         Thread.__init__(self)
@@ -406,17 +779,94 @@ class VLE(Thread):
 
         if self.model_liq.nome_modelo == 'UNIQUAC':                
             self.coordnumber     = z_coordenacao # Número de coordenação do componente               
+        
+        # Kernel do modelo da fase líquida, com as constantes do modelo pré-processadas (vide rotina Kernel)
+        self.z_coordenacao = z_coordenacao
+        self.kernel_liq    = self.model_liq.Kernel(z_coordenacao)
             
         self.estBeta = estBeta # estimativa para a fração entre líquido e vapor
         self.toleq   = toleq   # Tolerância do equilíbrio
         self.tolAlg = tolAlg   # Tolerância do algortimo            
         self.maxiter = maxiter # Número máximo de iterações
+        self.janela_estagnacao = janela_estagnacao # Iterações sem progresso para a interrupção dos algoritmos
+        # Buffer circular com as últimas iterações dos algoritmos (algoritmo, índices, iteração, resíduo e valor da variável iterada)
+        self.traco   = deque(maxlen=tamanho_traco) if tamanho_traco else None
+
+        self._constantes_virial = None # Parâmetros do Virial independentes da temperatura (vide _Constantes_Virial)
+        self._constantes_cubica = None # Parâmetros das equações cúbicas independentes da temperatura (vide _Constantes_Cubica)
+
+        # Coletor dos avisos de faixa de validade. Os avisos são emitidos ao final de cada cálculo.
+        if diagnostico is None:
+            self.diagnostico = Diagnostico()
+        else:
+            self.diagnostico = diagnostico
             
-    def Second_Virial_Coef(self):
+    def Subsistema(self,indices,Algoritmo=None,z=None,Temp=None,Pressao=None):
+        '''
+        Módulo que retorna o cálculo (objeto ``VLE``) de uma parte dos componentes deste sistema (Ex.: os componentes de
+        uma seção de coluna). Os modelos do subsistema são recortados dos modelos deste sistema (vide método ``Subsistema``
+        da classe ``Modelo`` da rotina Conexao), sem novas buscas no Banco de dados, assim como os parâmetros do Virial e das
+        equações cúbicas independentes da temperatura já calculados. As tolerâncias, o número máximo de iterações e o
+        coletor de diagnósticos são os deste sistema.
+        
+        ========
+        Entradas
+        ========
+        
+        * indices (list): Índices dos componentes do subsistema, na ordem desejada;
+        * Algoritmo (str): O nome do cálculo. Caso não seja informado, é utilizado o deste sistema;
+        * z (list): Composição do subsistema;
+        * Temp (float): Temperatura em Kelvin. Caso não seja informada, é utilizada a deste sistema;
+        * Pressao (float): Pressão em bar. Caso não seja informada, é utilizada a deste sistema.
+        
+        =======
+        Exemplo
+        =======
+        
+        ::
+        
+            >>> Planta  = VLE('PontoBolha_P',Componentes,model_liq,model_vap,Temp=340.0)
+            >>> Secao   = Planta.Subsistema([0,3,4],z=[0.2,0.5,0.3])
+            >>> Secao.run()
+        '''
+        indices    = [int(i) for i in indices]
+        subsistema = VLE(self.Algoritmo if Algoritmo is None else Algoritmo,[self.Componente[i] for i in indices],
+                         self.model_liq.Subsistema(indices),self.model_vap.Subsistema(indices),z=z,
+                         Temp=self.Temp if Temp is None else Temp,Pressao=self.Pressao if Pressao is None else Pressao,
+                         estBeta=self.estBeta,tolAlg=self.tolAlg,toleq=self.toleq,maxiter=self.maxiter,
+                         z_coordenacao=self.z_coordenacao,diagnostico=self.diagnostico,janela_estagnacao=self.janela_estagnacao,
+                         tamanho_traco=self.traco.maxlen if self.traco is not None else 0)
+        
+        # Os parâmetros de Hayden O'Connel e das cúbicas de cada par dependem apenas do par. Os de Tsonopoulos dependem da
+        # polaridade dos dois primeiros componentes e são calculados novamente, caso necessário.
+        recorte = lambda constantes: dict([(chave,valor[ix_(indices,indices)] if valor.ndim == 2 else valor[indices])
+                                           for chave,valor in constantes.items()])
+        if self._constantes_virial is not None and self.model_vap.regra_mistura == 'Hayden_o_Connel':
+            subsistema._constantes_virial = recorte(self._constantes_virial)
+        if self._constantes_cubica is not None:
+            subsistema._constantes_cubica = recorte(self._constantes_cubica)
+        return subsistema
+
+    def _Monitor(self,N,maxiter,algoritmo=None):
+        '''
+        Criação do acompanhamento da convergência de um algoritmo (vide ``Convergencia``). Os pontos não convergidos e o 
+        traço das iterações são registrados apenas quando o nome do algoritmo é inserido (os laços internos não são registrados).
+        '''
+        if algoritmo is None:
+            return Convergencia(N,self.tolAlg,maxiter,self.janela_estagnacao)
+        return Convergencia(N,self.tolAlg,maxiter,self.janela_estagnacao,self.diagnostico,algoritmo,self.traco)
+
+    def Second_Virial_Coef(self,T=None):
         '''
         Módulo para calcular o segundo coeficiente da equação Viral de acordo com as regras disponíveis.
         Estas são: Hayden O'Connel[1] e Tsonopoulos[2].
     
+        ========
+        Entradas
+        ========
+        
+        * T (float): Temperatura em Kelvin. Caso não seja informada, é utilizada a temperatura do sistema (``Temp``).
+        
         ======
         Saídas
         ======
@@ -435,10 +885,24 @@ class VLE(Thread):
         Fluid Phase Equilib. 57 (1990) 261–276.
         
         '''
-            
+        if T is None:
+            T = self.Temp
+
+        self.Bvirial = self._Bvirial([T])[0].tolist()
+
+    def _Constantes_Virial(self):
+        '''
+        Módulo para calcular os parâmetros do segundo coeficiente Virial que independem da temperatura, segundo as regras
+        de Hayden O'Connel e Tsonopoulos (vide documentação de ``Second_Virial_Coef``).
+        
+        Os parâmetros são calculados apenas na primeira chamada e armazenados no atributo ``_constantes_virial`` (dicionário de arrays NC x NC),
+        de forma que as avaliações de B em diferentes temperaturas se reduzem a operações vetoriais.
+        '''
+        if self._constantes_virial is not None:
+            return self._constantes_virial
+
         if self.model_vap.regra_mistura == 'Hayden_o_Connel':
             
-            R = 83.144621 # em cm3.bar/ K.mol
                     
             # T     = Temperatura / K
             # ek    = energia característica da interação i-j, K
@@ -524,27 +988,12 @@ class VLE(Thread):
                         E[i][j] = exp(Eta[i][j]*(650.0/(ek[i][j]+300.0) - 4.27))
                     elif Eta[i][j] >= 4.5:
                         E[i][j] = exp(Eta[i][j]*(42800.0/(ek[i][j]+22400.0) - 4.27))
-                  
-            # Parâmetros dependentes da temperatura:
-            T_ast   = [[self.Temp/ek[i][j]                  for j in xrange(self.NC)] for i in xrange(self.NC)]
-            T_astll = [[1/T_ast[i][j] - 1.6*w[i][j] for j in xrange(self.NC)] for i in xrange(self.NC)]
-            
-            #Cálculos dos BF's:
-            BFnonpolar = [[ b0[i][j]*(0.94 - 1.47*T_astll[i][j] - 0.85*(T_astll[i][j]**2.0) + 1.015*(T_astll[i][j]**3.0))           for j in xrange(self.NC)] for i in xrange(self.NC)]
-            BFpolar    = [[-b0[i][j]*mi_astl[i][j]*(0.74 - 3.0*T_astll[i][j] + 2.1*(T_astll[i][j]**2.0) + 2.1*(T_astll[i][j]**3.0)) for j in xrange(self.NC)] for i in xrange(self.NC)]
-         
-            # Cálculos para BD:
-            Bmetastable_Bbound = [[b0[i][j]*A[i][j]*exp(deltah[i][j]/T_ast[i][j]) for j in xrange(self.NC)] for i in xrange(self.NC)]
-            Bchemical          = [[b0[i][j]*E[i][j]*(1 - exp(1500.0*Eta[i][j]/self.Temp)) for j in xrange(self.NC)] for i in xrange(self.NC)]
-            # -----------------------------------------------------------------------------------------------------------------------------------------------------------
-         
-            BD            = [[Bmetastable_Bbound[i][j] + Bchemical[i][j] for j in xrange(self.NC)] for i in xrange(self.NC)] # D bound or dimerizes molecules (Chemical forces)
-            BF            = [[BFnonpolar[i][j]         + BFpolar[i][j]   for j in xrange(self.NC)] for i in xrange(self.NC)] # Free molecules
-            self.Bvirial  = [[BF[i][j]                 + BD[i][j]        for j in xrange(self.NC)] for i in xrange(self.NC)]
-            
+
+            self._constantes_virial = {'ek':array(ek),'w':array(w),'b0':array(b0),'mi_astl':array(mi_astl),'A':array(A),
+                                       'deltah':array(deltah),'E':array(E),'Eta':array(Eta)}
+
         elif self.model_vap.regra_mistura == 'Tsonopoulos' :
             
-            R = 82.05746 # cm3.atm.K−1.mol−1            
             
             # Caracteristica da mistura quanto à polaridade. Ex.: mistura Polar-Polar.
             Caracteristica_mistura = self.Componente[0].polaridade + '-' +self.Componente[1].polaridade
@@ -552,7 +1001,6 @@ class VLE(Thread):
             w               = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
                 
             Tc              = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
-            Tr              = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
             Pc              = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)] 
             Vc              = [0.0 for j in xrange(self.NC)]
                 
@@ -562,11 +1010,7 @@ class VLE(Thread):
             parametro_a     = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
             parametro_b     = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)] 
                 
-            # Funções da corelação de Tsonopoulos. Todas em função de Tr.
                 
-            parametro_f0    = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
-            parametro_f1    = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
-            parametro_f2    = [[0.0 for j in xrange(self.NC)] for i in xrange(self.NC)]
                  
             # Parâmetro de interação binária
                  
@@ -586,7 +1030,6 @@ class VLE(Thread):
                         mi[j]          = self.Componente[j].dipole_moment    
                         
                         mi_reduzido[j] = (10**5)*(mi[j]**2)*Pc[i][j]/(Tc[i][j])**2
-                        Tr[i][j]       = self.Temp/Tc[i][j]
                         
             # PARÂMETROS DE ASSOCIAÇÃO
             
@@ -644,7 +1087,6 @@ class VLE(Thread):
                             w[i][j]            = 0.5*(w[i][i]+w[j][j])
                             
                             Tc[i][j]           = (Tc[i][i]*Tc[j][j])**0.5*(1-k_int_binaria[i][j])
-                            Tr[i][j]           = self.Temp/Tc[i][j]
                             
                             Pc[i][j]           = 4*( Tc[i][j]*(Pc[i][i]*Vc[i]/Tc[i][i] + Pc[j][j]*Vc[j]/Tc[j][j])/((Vc[i]**(1.0/3.0) + Vc[j]**(1.0/3.0))**3) )
                     
@@ -659,7 +1101,6 @@ class VLE(Thread):
                             w[i][j]            = 0.5*(w[i][i]+w[j][j])
                             
                             Tc[i][j]           = (Tc[i][i]*Tc[j][j])**0.5*(1-k_int_binaria[i][j])
-                            Tr[i][j]           = self.Temp/Tc[i][j]
                             Pc[i][j]           = 4*( Tc[i][j]*(Pc[i][i]*Vc[i]/Tc[i][i] + Pc[j][j]*Vc[j]/Tc[j][j])/(Vc[i]**(1.0/3.0) + Vc[j]**(1.0/3.0) )**3 )
         
                     elif Caracteristica_mistura in ['Apolar-Polar','Polar-Apolar']: 
@@ -671,30 +1112,71 @@ class VLE(Thread):
                             w[i][j]            = 0.5*(w[i][i]+w[j][j])
                             
                             Tc[i][j]           = (Tc[i][i]*Tc[j][j])**0.5*(1-k_int_binaria[i][j])
-                            Tr[i][j]           = self.Temp/Tc[i][j]
                             Pc[i][j]           = 4*( Tc[i][j]*(Pc[i][i]*Vc[i]/Tc[i][i] + Pc[j][j]*Vc[j]/Tc[j][j])/( Vc[i]**(1.0/3.0) + Vc[j]**(1.0/3.0) ) ** 3.0 )
- 
-       
-            # PARAMETROS CÁLCULO Bij
-                   
-            for i in xrange(self.NC):
-                for j in xrange(self.NC):
-                    
-                    # Funções da corelação de Tsonopoulos. Todas em função de Tr.
-                    parametro_f0[i][j]    = 0.1445 - 0.330/Tr[i][j] - 0.1385/(Tr[i][j])**2 - 0.0121/(Tr[i][j])**3 - 0.000607/(Tr[i][j])**8
-                    parametro_f1[i][j]    = 0.0637 + 0.331/(Tr[i][j])**2 - 0.423/(Tr[i][j])**3 - 0.008/(Tr[i][j])**8
-                    parametro_f2[i][j]    = parametro_a[i][j]/(Tr[i][j])**6 - parametro_b[i][j]/(Tr[i][j])**8
-            
+
+            self._constantes_virial = {'Tc':array(Tc),'Pc':array(Pc),'w':array(w),'parametro_a':array(parametro_a),'parametro_b':array(parametro_b)}
+
+        return self._constantes_virial
+
+    def _Bvirial(self,T):
+        '''
+        Módulo para calcular o segundo coeficiente Virial para um conjunto de temperaturas de uma só vez.
+        
+        ========
+        Entradas
+        ========
+        
+        * T (list ou array): Temperaturas em Kelvin.
+        
+        ======
+        Saídas
+        ======
+        
+        * Retorna um array de dimensão (len(T),NC,NC) com os valores dos coeficientes puros e cruzados para cada temperatura.
+        '''
+        cte = self._Constantes_Virial()
+        T   = asarray(T,dtype=float).reshape(-1,1,1)
+
+        if self.model_vap.regra_mistura == 'Hayden_o_Connel':
+
+            b0 = cte['b0']
+            # Parâmetros dependentes da temperatura:
+            T_ast   = T/cte['ek']
+            T_astll = 1.0/T_ast - 1.6*cte['w']
+
+            #Cálculos dos BF's:
+            BFnonpolar = b0*(0.94 - 1.47*T_astll - 0.85*(T_astll**2.0) + 1.015*(T_astll**3.0))
+            BFpolar    = -b0*cte['mi_astl']*(0.74 - 3.0*T_astll + 2.1*(T_astll**2.0) + 2.1*(T_astll**3.0))
+
+            # Cálculos para BD:
+            Bmetastable_Bbound = b0*cte['A']*exp(cte['deltah']/T_ast)
+            Bchemical          = b0*cte['E']*(1 - exp(1500.0*cte['Eta']/T))
+
+            BD = Bmetastable_Bbound + Bchemical # D bound or dimerizes molecules (Chemical forces)
+            BF = BFnonpolar         + BFpolar   # Free molecules
+            return BF + BD
+
+        elif self.model_vap.regra_mistura == 'Tsonopoulos' :
+
+            R  = 82.05746 # cm3.atm.K−1.mol−1
+            Tc = cte['Tc']
+            Tr = T/Tc
+
+            # Funções da corelação de Tsonopoulos. Todas em função de Tr.
+            parametro_f0 = 0.1445 - 0.330/Tr - 0.1385/(Tr)**2 - 0.0121/(Tr)**3 - 0.000607/(Tr)**8
+            parametro_f1 = 0.0637 + 0.331/(Tr)**2 - 0.423/(Tr)**3 - 0.008/(Tr)**8
+            parametro_f2 = cte['parametro_a']/(Tr)**6 - cte['parametro_b']/(Tr)**8
+
             # CÁLCULO DO Bij
-            
-            self.Bvirial = [[ (Tc[i][j]*R/Pc[i][j])*(parametro_f0[i][j] + w[i][j]*parametro_f1[i][j] + parametro_f2[i][j]) for j in xrange(self.NC)] for i in xrange(self.NC)]
+            return (Tc*R/cte['Pc'])*(parametro_f0 + cte['w']*parametro_f1 + parametro_f2)
 
 
 
     def Coeficiente_Atividade(self,x,T):
         '''
         Módulo para calcular o coeficiente de atividade de acordo com os modelos disponíveis.
-        Estes são: UNIQUAC[1] , NRTL[2], Wilson[3] e Van Laar[4].
+        Estes são: UNIQUAC[1] , NRTL[2], Wilson[3], Van Laar[4] e UNIFAC[5]. O cálculo é realizado pelo kernel do modelo
+        (atributo ``kernel_liq``, vide rotina ``Kernel``), criado na construção da classe.
         
         ========
         Entradas
@@ -729,138 +1211,37 @@ class VLE(Thread):
         
         [4] VAN LAAR, J. J. The Vapor pressure of binary mixtures. Z. Phys.
         Chem. 1910, 72, 723−751.  
+        
+        [5] FREDENSLUND, A.; JONES, R. L.; PRAUSNITZ, J. M. Group-contribution estimation of activity coefficients
+        in nonideal liquid mixtures. AIChE Journal, v. 21, n. 6, p. 1086–1099, nov. 1975.
                 
-        '''                        
-        # Modelo UNIQUAC
-        if self.model_liq.nome_modelo == 'UNIQUAC':
-            
-            if self.model_liq.formaEq == 1:
-#                R = 8.314462 # em J · K−1 · mol−1
-                # Caso tenha em mãos a diferenca do parametro a. A formaEq 1 é a mais recorrente.
-                a     = self.model_liq.parametro_int
-    
-                tau   = [[exp(-a[i][j]/(T)) for j in xrange(self.NC)] for i in xrange(self.NC)] 
-                
-                phi   = [self.Componente[i].r  * x[i] / sum([self.Componente[j].r  * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                
-                teta  = [self.Componente[i].q  * x[i] / sum([self.Componente[j].q  * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                tetal = [self.Componente[i].ql * x[i] / sum([self.Componente[j].ql * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                l     = [(self.coordnumber/2.0)*(self.Componente[i].r - self.Componente[i].q) - (self.Componente[i].r - 1)  for i in xrange(self.NC)]
-    
-                A     = [self.Componente[i].ql*sum([tetal[j]*tau[i][j]/sum([tetal[k]*tau[k][j] for k in xrange(self.NC)]) for j in xrange(self.NC)]) for i in xrange(self.NC)]
-                
-                Combinatorial = [log(phi[i]/x[i]) + (self.coordnumber/2.0)*self.Componente[i].q*log(teta[i]/phi[i]) + l[i] - (phi[i]/x[i]) * sum([x[j]*l[j] for j in xrange(self.NC)]) for i in xrange(self.NC)]
-                Residual      = [-self.Componente[i].ql*log(sum([tetal[j]*tau[j][i] for j in xrange(self.NC)])) + self.Componente[i].ql - A[i]      for i in xrange(self.NC)] 
-    
-                Coeficiente_Atividade = [exp(Combinatorial[i]+Residual[i]) for i in xrange(self.NC)]
-                
-            elif self.model_liq.formaEq == 2:
-                # Caso tenha em mãos o parametro tau 
-                tau     = self.model_liq.parametro_int
-    
-                phi   = [self.Componente[i].r  * x[i] / sum([self.Componente[j].r  * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                teta  = [self.Componente[i].q  * x[i] / sum([self.Componente[j].q  * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                tetal = [self.Componente[i].ql * x[i] / sum([self.Componente[j].ql * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                l     = [(self.coordnumber/2.0)*(self.Componente[i].r - self.Componente[i].q) - (self.Componente[i].r - 1)  for i in xrange(self.NC)]
-    
-                A     = [self.Componente[i].ql*sum([tetal[j]*tau[i][j]/sum([tetal[k]*tau[k][j] for k in xrange(self.NC)]) for j in xrange(self.NC)]) for i in xrange(self.NC)]
-                
-                Combinatorial = [log(phi[i]/x[i]) + (self.coordnumber/2.0)*self.Componente[i].q*log(teta[i]/phi[i]) + l[i] - (phi[i]/x[i]) * sum([x[j]*l[j] for j in xrange(self.NC)]) for i in xrange(self.NC)]
-                Residual      = [-self.Componente[i].ql*log(sum([tetal[j]*tau[j][i] for j in xrange(self.NC)])) + self.Componente[i].ql - A[i]      for i in xrange(self.NC)] 
-    
-                Coeficiente_Atividade = [exp(Combinatorial[i]+Residual[i]) for i in xrange(self.NC)]
+        '''
+        return self.kernel_liq.gama(x,T)
 
-            elif self.model_liq.formaEq == 3:
-                # Caso tenha em mãos o parametro a do componente puro
-                a_ij  = self.model_liq.parametro_int
-    
-                tau   = [[exp(-(a_ij[i][j]-a_ij[j][j])/T) for j in xrange(self.NC)] for i in xrange(self.NC)]
-                phi   = [self.Componente[i].r  * x[i] / sum([self.Componente[j].r  * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                teta  = [self.Componente[i].q  * x[i] / sum([self.Componente[j].q  * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                tetal = [self.Componente[i].ql * x[i] / sum([self.Componente[j].ql * x[j] for j in xrange(self.NC)])        for i in xrange(self.NC)]
-                l     = [(self.coordnumber/2.0)*(self.Componente[i].r - self.Componente[i].q) - (self.Componente[i].r - 1)  for i in xrange(self.NC)]
-    
-                A     = [self.Componente[i].ql*sum([tetal[j]*tau[i][j]/sum([tetal[k]*tau[k][j] for k in xrange(self.NC)]) for j in xrange(self.NC)]) for i in xrange(self.NC)]
-                
-                Combinatorial = [log(phi[i]/x[i]) + (self.coordnumber/2.0)*self.Componente[i].q*log(teta[i]/phi[i]) + l[i] - (phi[i]/x[i]) * sum([x[j]*l[j] for j in xrange(self.NC)]) for i in xrange(self.NC)]
-                Residual      = [-self.Componente[i].ql*log(sum([tetal[j]*tau[j][i] for j in xrange(self.NC)])) + self.Componente[i].ql - A[i]      for i in xrange(self.NC)] 
-    
-                Coeficiente_Atividade = [exp(Combinatorial[i]+Residual[i]) for i in xrange(self.NC)]                
-        #==============================================================================
-        # Modelo NRTL
-        #==============================================================================
+    def Coeficiente_Atividade_Lote(self,x,T):
+        '''
+        Módulo para calcular o coeficiente de atividade de várias composições de uma só vez, com as mesmas equações de
+        ``Coeficiente_Atividade``, pelo kernel do modelo. As somas em i, j e k são realizadas por contrações vetoriais.
         
-        if self.model_liq.nome_modelo == 'NRTL':
-            
-            R = 83.144621# em cm3.bar/ K.mol
-            alpha       = self.model_liq.alpha            
-            
-            if self.model_liq.formaEq == 1:
-                # Caso tenha em mãos a diferenca do parametro g. A formaEq 1 é a mais recorrente.
-                g      = self.model_liq.parametro_int                                
-                
-                tau    =  [[g[i][j]/(R*T) for j in xrange(self.NC)] for i in xrange(self.NC)]
-                G      = [[exp(-alpha[i][j]*tau[i][j]) for j in xrange(self.NC)] for i in xrange(self.NC)]
-    
-                parte1 = [(sum([tau[j][i]*G[j][i]*x[j] for j in xrange(self.NC)]))/(sum([G[k][i]*x[k] for k in xrange(self.NC)])) for i in xrange(self.NC)]
-                parte2 = [sum( [( x[j]*G[i][j]/sum([G[k][j]*x[k] for k in xrange(self.NC)]) )*(tau[i][j] -sum([x[k]*tau[k][j]*G[k][j] for k in xrange(self.NC)])/sum([G[k][j]*x[k] for k in xrange(self.NC)]) )   for j in xrange(self.NC)] ) for i in xrange(self.NC)]
-    
-                Coeficiente_Atividade = [exp( parte1[i] + parte2[i] ) for i in xrange(self.NC)]             
-                
-            elif self.model_liq.formaEq == 2:
-                # Caso tenha em mãos o parametro tau 
-                tau    = self.model_liq.parametro_int                                
-            
-                G      = [[exp(-alpha[i][j]*tau[i][j]) for j in xrange(self.NC)] for i in xrange(self.NC)]
-                
-                parte1 = [(sum([tau[j][i]*G[j][i]*x[j] for j in xrange(self.NC)]))/(sum([G[k][i]*x[k] for k in xrange(self.NC)])) for i in xrange(self.NC)]
-                parte2 = [sum( [( x[j]*G[i][j]/sum([G[k][j]*x[k] for k in xrange(self.NC)]) )*(tau[i][j] -sum([x[k]*tau[k][j]*G[k][j] for k in xrange(self.NC)])/sum([G[k][j]*x[k] for k in xrange(self.NC)]) )   for j in xrange(self.NC)] ) for i in xrange(self.NC)]
-    
-                Coeficiente_Atividade = [exp( parte1[i] + parte2[i] ) for i in xrange(self.NC)]  
-                
-            elif self.model_liq.formaEq == 3:
-                # Caso tenha em mãos o parametro g do componente puro 
-                g_ij      = self.model_liq.parametro_int                                
-                
-                tau    =  [[(g_ij[i][j]-g_ij[j][j])/(R*T) for j in xrange(self.NC)] for i in xrange(self.NC)]
-                G      = [[exp(-alpha[i][j]*tau[i][j]) for j in xrange(self.NC)] for i in xrange(self.NC)]
-                    
-                parte1 = [(sum([tau[j][i]*G[j][i]*x[j] for j in xrange(self.NC)]))/(sum([G[k][i]*x[k] for k in xrange(self.NC)])) for i in xrange(self.NC)]
-                parte2 = [sum( [( x[j]*G[i][j]/sum([G[k][j]*x[k] for k in xrange(self.NC)]) )*(tau[i][j] -sum([x[k]*tau[k][j]*G[k][j] for k in xrange(self.NC)])/sum([G[k][j]*x[k] for k in xrange(self.NC)]) )   for j in xrange(self.NC)] ) for i in xrange(self.NC)]
-    
-                Coeficiente_Atividade = [exp( parte1[i] + parte2[i] ) for i in xrange(self.NC)]
-                
-        #==============================================================================
-        # Modelo de Wilson                               
-        #==============================================================================
+        ========
+        Entradas
+        ========
         
-        if self.model_liq.nome_modelo == 'Wilson':
-            
-            if self.model_liq.formaEq == 1:
-            # Caso tenha em mãos o parametro LAMBDA. 
-                A          =   self.model_liq.parametro_int
-            
-                Coeficiente_Atividade = [exp( -log( sum([x[j]*A[i][j] for j in xrange(self.NC)]) ) + 1.0 - sum([ x[k]*A[k][i]/(sum([x[j]*A[k][j] for j in xrange(self.NC)])) for k in xrange(self.NC) ]) ) for i in xrange(self.NC) ]
-               
-       # Modelo Van Laar
-        if self.model_liq.nome_modelo == 'Van Laar':
-            
-            R  = 83.144621 # em cm3.bar/ K.mol
-            
-            p_VL = self.model_liq.Parametro
-            # Onde A é o parâmetro p_VL[0][1] e B é o parâmetro p_VL[1][0]
-            
-            Coeficiente_Atividade_aux   =    [[exp( ( p_VL[i][j]/(R*T) )*( 1+(p_VL[i][j]/p_VL[j][i])*\
-            (x[i]/x[j]) )**-2 ) for j in xrange(self.NC) if i!=j] for i in xrange(self.NC)]
-                        
-            Coeficiente_Atividade       =    [Coeficiente_Atividade_aux[0][0],Coeficiente_Atividade_aux[1][0]]
-                
-        return Coeficiente_Atividade
+        * x (list ou array): Composições da fase líquida, de dimensão (N,NC);
+        * T (float ou array): Temperatura(s) em Kelvin, um valor único ou um por composição (N).
+        
+        ======
+        Saídas
+        ======
+        
+        * O método retorna um array de dimensão (N,NC) com os coeficientes de atividade dos componentes em cada composição.
+        '''
+        return self.kernel_liq.gama_lote(x,T)
 
     def Coeficiente_Fugacidade(self,y,P,T):
         '''
         Módulo para calcular o coeficiente de fugacidade de acordo com as equações de estado disponíveis.
-        Estas são: Virial[1].
+        Estas são: Virial[1], SRK e Peng-Robinson (vide ``_Phi_Cubica``).
     
         ========
         Entradas
@@ -889,7 +1270,7 @@ class VLE(Thread):
         R = 83.144621 # em cm3.bar/ K.mol
         if self.model_vap.nome_modelo == 'Virial':
             NC = size(y)
-            self.Second_Virial_Coef()
+            self.Second_Virial_Coef(T)
             B = self.Bvirial
             Bmixture = sum([sum([y[i]*y[j]*B[i][j] for j in xrange(NC)])      for i in xrange(NC)])
             A        = [ 2*sum([y[j]*B[i][j] for j in xrange(NC)]) - Bmixture for i in xrange(NC)]
@@ -897,51 +1278,285 @@ class VLE(Thread):
             
             # Validação grosseira das condições de pressão:
             P_lim = (T/2.0)*sum([y[i]*self.Componente[i].Pc for i in xrange(NC)])/sum([y[i]*self.Componente[i].Tc for i in xrange(NC)])
-            if P <= P_lim:
-                warn(u'A pressão do sistema é inferior à da validação da equação VIRIAL, vide documentação da mesma.')
-            else:
-                warn(u'A pressão do sistema é superior à da validação da equação VIRIAL, vide documentação da mesma.')
+            if P > P_lim:
+                self.diagnostico.registrar('virial_pressao',P=P,T=T,P_lim=P_lim)
+        
+        elif self.model_vap.nome_modelo in ['SRK','Peng-Robinson']:
+            phi = self._Phi_Cubica([y],P,T)[0].tolist()
                 
         return phi
-        
-    def PhiSat(self,T):
+
+    def Coeficiente_Fugacidade_Lote(self,y,P,T):
         '''
-        Módulo para calcular o coeficiente de fugacidade nas condições de saturação segundo [1] e [2].
+        Módulo para calcular o coeficiente de fugacidade de vários estados (y, P, T) de uma só vez, com as mesmas equações de
+        ``Coeficiente_Fugacidade``. O segundo coeficiente Virial é calculado uma única vez para cada temperatura distinta
+        e as somas em i e j são realizadas por contrações vetoriais.
+    
+        ========
+        Entradas
+        ========
+        
+        * y (list ou array): Composições da fase de vapor, de dimensão (N,NC);
+        * P (float ou array): Pressão(ões) em bar, um valor único ou um por estado (N);
+        * T (float ou array): Temperatura(s) em Kelvin, um valor único ou um por estado (N).
         
         ======
         Saídas
         ======
         
-        * O método retorna os valores dos coeficientes de fugacidade dos componentes em forma de lista.
-        
-        ===========
-        Referências
-        ===========
-        
-        [1] PRAUSNITZ, J. M. et al. Computer Calculations for multicomponent vapor-liquid and liquid-liquid equilibria. [s.l.] Prendice-Hall, 1980. p. 353
+        * O método retorna um array de dimensão (N,NC) com os coeficientes de fugacidade dos componentes em cada estado.
         
-        [2] SMITH, J. M.; NESS, H. C. VAN; ABBOTT, M. M. Introduction to Chemical Engineering Thermodinamics. 7th. ed. [s.l.] Mc-Graw Hills, [s.d.]. 
+        =======
+        Exemplo
+        =======
         
-        ''' 
-        # Cálculo de phisat (coeficiente de fugacidade nas condições de saturação)
-        # Utilizado o mesmo modelo de phi, quando x->1.
-        phisat = []
-        for i in xrange(self.NC):
-            comp    = zeros((1,self.NC)) + 0.00000001
-            comp    = comp.tolist()[0]
-            comp[i] = 0.99999            
-            fator  = (1-comp[i])/((self.NC-1)*0.00000001)
-            for j in xrange(self.NC):
-                if i != j:
-                    comp[j] = fator*0.00000001
-            phisat.append(self.Coeficiente_Fugacidade(comp,self.Componente[i].Pvap_Prausnitz_4th(T),T)[i])
-        self.phisat = phisat
+        Utilizando os mesmos componentes e modelos do Exemplo 1 da classe ``VLE``: ::
         
-    
-    def PontoBolha_P(self,x,T):
+            >>> Calculo = VLE('Coeficiente_Fugacidade',Componentes,model_liq,model_vap)
+            >>> Calculo.Coeficiente_Fugacidade_Lote([[0.1,0.9],[0.5,0.5],[0.9,0.1]],1.013,[330.0,335.0,340.0])
         '''
-        Módulo para calcular o ponto de bolha segundo [1] e [2], quando a temperatura e composição são conhecidas. 
-        
+        R = 83.144621 # em cm3.bar/ K.mol
+        y = asarray(y,dtype=float)
+        N = y.shape[0]
+        P = zeros(N) + P
+        T = zeros(N) + T
+
+        if self.model_vap.nome_modelo == 'Virial':
+            # Segundo coeficiente Virial para cada temperatura distinta
+            T_unicas, indice = unique(T,return_inverse=True)
+            B  = self._Bvirial(T_unicas)[indice]
+            
+            By       = einsum('nij,nj->ni',B,y)
+            Bmixture = einsum('ni,ni->n',y,By)
+            A        = 2*By - Bmixture[:,newaxis]
+            phi      = exp(A*(P/(R*T))[:,newaxis])
+            
+            # Validação grosseira das condições de pressão:
+            Pc    = array([Componente.Pc for Componente in self.Componente])
+            Tc    = array([Componente.Tc for Componente in self.Componente])
+            P_lim = (T/2.0)*y.dot(Pc)/y.dot(Tc)
+            acima = P > P_lim
+            if acima.any():
+                k = acima.argmax()
+                self.diagnostico.registrar('virial_pressao',ocorrencias=int(acima.sum()),P=P[k],T=T[k],P_lim=P_lim[k])
+
+        elif self.model_vap.nome_modelo in ['SRK','Peng-Robinson']:
+            phi = self._Phi_Cubica(y,P,T)
+
+        return phi
+
+    def _Constantes_Cubica(self):
+        '''
+        Módulo para calcular os parâmetros das equações de estado cúbicas (SRK e Peng-Robinson) que independem da temperatura.
+        Os parâmetros são calculados apenas na primeira chamada e armazenados no atributo ``_constantes_cubica``.
+        
+        ======
+        Saídas
+        ======
+        
+        * Retorna um dicionário com as chaves: ``ac`` (parâmetro a no ponto crítico), ``b``, ``m`` (coeficiente da função alpha), ``Tc`` e ``kij``.
+        '''
+        if self._constantes_cubica is not None:
+            return self._constantes_cubica
+        
+        R  = 83.144621 # em cm3.bar/ K.mol
+        Tc = array([Componente.Tc for Componente in self.Componente])
+        Pc = array([Componente.Pc for Componente in self.Componente])
+        w  = array([Componente.w  for Componente in self.Componente])
+        c  = self.model_vap.coef_m
+        
+        self._constantes_cubica = {'ac' : self.model_vap.Omega_a*(R*Tc)**2/Pc,
+                                   'b'  : self.model_vap.Omega_b*R*Tc/Pc,
+                                   'm'  : c[0] + c[1]*w + c[2]*w**2,
+                                   'Tc' : Tc,
+                                   'kij': array(self.model_vap.k_int_binaria,dtype=float)}
+        return self._constantes_cubica
+
+    def _Raiz_Cubica(self,c2,c1,c0,fase='vapor'):
+        '''
+        Solução analítica (Cardano e método trigonométrico) de várias equações cúbicas Z**3 + c2*Z**2 + c1*Z + c0 = 0
+        de uma só vez. 
+        
+        ========
+        Entradas
+        ========
+        
+        * c2, c1, c0 (array): Coeficientes das equações (N);
+        * fase (str): 'vapor' para a maior raiz real ou 'liquido' para a menor raiz real.
+        
+        ======
+        Saídas
+        ======
+        
+        * Retorna um array (N) com a raiz escolhida de cada equação.
+        '''
+        # Equação reduzida t**3 + p*t + q = 0, com Z = t - c2/3
+        p = c1 - c2**2/3.0
+        q = 2.0*c2**3/27.0 - c2*c1/3.0 + c0
+        D = (q/2.0)**2 + (p/3.0)**3 # Discriminante
+        
+        with errstate(invalid='ignore',divide='ignore'):
+            # Uma raiz real (D > 0)
+            sD  = sqrt(where(D > 0,D,0.0))
+            t_1 = cbrt(-q/2.0 + sD) + cbrt(-q/2.0 - sD)
+            # Três raízes reais (D <= 0)
+            r   = sqrt(where(D > 0,0.0,-p/3.0))
+            ang = arccos((-q/2.0/where(r > 0,r**3,1.0)).clip(-1.0,1.0))/3.0
+            if fase == 'vapor':
+                t_3 = 2*r*cos(ang)
+            else:
+                t_3 = 2*r*cos(ang + 2*pi/3.0)
+        
+        return where(D > 0,t_1,t_3) - c2/3.0
+
+    def _Phi_Cubica(self,y,P,T,fase='vapor'):
+        '''
+        Módulo para calcular o coeficiente de fugacidade de vários estados (y, P, T) de uma só vez segundo as equações de estado 
+        cúbicas na forma generalizada (vide documentação da classe ``Cubica`` da rotina ``Conexao``), com a regra de mistura 
+        quadrática para o parâmetro a e linear para o parâmetro b. O fator de compressibilidade é obtido pela solução analítica
+        da equação cúbica (``_Raiz_Cubica``).
+        
+        ========
+        Entradas
+        ========
+        
+        * y (list ou array): Composições, de dimensão (N,NC);
+        * P (float ou array): Pressão(ões) em bar;
+        * T (float ou array): Temperatura(s) em Kelvin;
+        * fase (str): 'vapor' (maior raiz) ou 'liquido' (menor raiz).
+        
+        ======
+        Saídas
+        ======
+        
+        * O método retorna um array de dimensão (N,NC) com os coeficientes de fugacidade dos componentes em cada estado.
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] REID, R.C.; PRAUSNITZ, J.M.; POLING, B.E. The properties of Gases and Liquids, 4th edition, McGraw-Hill, 1987.
+        '''
+        R = 83.144621 # em cm3.bar/ K.mol
+        y = asarray(y,dtype=float)
+        N = y.shape[0]
+        P = zeros(N) + P
+        T = zeros(N) + T
+        u = self.model_vap.u
+        w = self.model_vap.w
+        cte = self._Constantes_Cubica()
+        
+        # Parâmetros dos componentes puros e cruzados
+        a   = cte['ac']*(1 + cte['m']*(1 - sqrt(T[:,newaxis]/cte['Tc'])))**2   # (N,NC)
+        aij = sqrt(a[:,:,newaxis]*a[:,newaxis,:])*(1 - cte['kij'])            # (N,NC,NC)
+        b   = cte['b']
+        
+        # Regras de mistura
+        ay  = einsum('nij,nj->ni',aij,y)
+        am  = einsum('ni,ni->n',y,ay)
+        bm  = y.dot(b)
+        A   = am*P/(R*T)**2
+        B   = bm*P/(R*T)
+        
+        # Fator de compressibilidade
+        Z = self._Raiz_Cubica(-(1 + B - u*B),A + w*B**2 - u*B - u*B**2,-(A*B + w*B**2 + w*B**3),fase)
+        
+        # Coeficiente de fugacidade
+        d      = sqrt(u**2 - 4*w)
+        bi_bm  = b[newaxis,:]/bm[:,newaxis]
+        delta  = 2*ay/am[:,newaxis]
+        termo  = (A/(B*d)*log((2*Z + B*(u + d))/(2*Z + B*(u - d))))[:,newaxis]
+        
+        return exp(bi_bm*(Z - 1)[:,newaxis] - log(Z - B)[:,newaxis] + termo*(bi_bm - delta))
+        
+    def PhiSat(self,T):
+        '''
+        Módulo para calcular o coeficiente de fugacidade nas condições de saturação segundo [1] e [2].
+        
+        ======
+        Saídas
+        ======
+        
+        * O método retorna os valores dos coeficientes de fugacidade dos componentes em forma de lista.
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] PRAUSNITZ, J. M. et al. Computer Calculations for multicomponent vapor-liquid and liquid-liquid equilibria. [s.l.] Prendice-Hall, 1980. p. 353
+        
+        [2] SMITH, J. M.; NESS, H. C. VAN; ABBOTT, M. M. Introduction to Chemical Engineering Thermodinamics. 7th. ed. [s.l.] Mc-Graw Hills, [s.d.]. 
+        
+        ''' 
+        # Cálculo de phisat (coeficiente de fugacidade nas condições de saturação)
+        # Utilizado o mesmo modelo de phi, quando x->1.
+        phisat = []
+        for i in xrange(self.NC):
+            comp    = zeros((1,self.NC)) + 0.00000001
+            comp    = comp.tolist()[0]
+            comp[i] = 0.99999            
+            fator  = (1-comp[i])/((self.NC-1)*0.00000001)
+            for j in xrange(self.NC):
+                if i != j:
+                    comp[j] = fator*0.00000001
+            phisat.append(self.Coeficiente_Fugacidade(comp,self.Componente[i].Pvap_Prausnitz_4th(T),T)[i])
+        self.phisat = phisat
+
+    def PhiSat_Lote(self,T):
+        '''
+        Módulo para calcular o coeficiente de fugacidade nas condições de saturação para várias temperaturas de uma só vez,
+        com as mesmas composições de ``PhiSat``.
+        
+        ========
+        Entradas
+        ========
+        
+        * T (list ou array): Temperaturas em Kelvin (N).
+        
+        ======
+        Saídas
+        ======
+        
+        * O método retorna um array de dimensão (N,NC) com os coeficientes de fugacidade nas condições de saturação.
+        '''
+        T    = asarray(T,dtype=float).reshape(-1)
+        N    = T.size
+        # Composições utilizadas no cálculo de phisat de cada componente (componente i -> 0.99999)
+        comp = ones((self.NC,self.NC))*(1-0.99999)/(self.NC-1) + eye(self.NC)*(0.99999 - (1-0.99999)/(self.NC-1))
+        y    = comp[newaxis,:,:].repeat(N,axis=0).reshape(N*self.NC,self.NC)
+        P    = self._Psat_Lote(T).reshape(N*self.NC)
+        phi  = self.Coeficiente_Fugacidade_Lote(y,P,T.repeat(self.NC))
+        return phi.reshape(N,self.NC,self.NC)[:,range(self.NC),range(self.NC)]
+
+    def _Psat_Lote(self,T):
+        '''
+        Pressão de vapor (bar) dos componentes para um vetor de temperaturas (N). Retorna um array de dimensão (N,NC).
+        '''
+        T = asarray(T,dtype=float)
+        return column_stack([Componente.Pvap_Prausnitz_4th(T) for Componente in self.Componente])
+
+    def _Tsat_Lote(self,P,j):
+        '''
+        Temperatura de saturação (K) do componente j para um vetor de pressões (N).
+        '''
+        return asarray(self.Componente[j].Tsat_Prausnitz_4th(asarray(P,dtype=float)),dtype=float)
+
+    def _Tsat_Referencia(self,P,ref):
+        '''
+        Temperatura de saturação (K) para um vetor de pressões (N), em que cada pressão se refere ao componente de índice ref (N).
+        '''
+        T = zeros(size(P))
+        for j in unique(ref):
+            k    = nonzero(ref == j)[0]
+            T[k] = self._Tsat_Lote(P[k],j)
+        return T
+        
+    
+    @solucao
+    def PontoBolha_P(self,x,T):
+        '''
+        Módulo para calcular o ponto de bolha segundo [1] e [2], quando a temperatura e composição são conhecidas. 
+        
         ========
         Entradas
         ========
@@ -972,33 +1587,41 @@ class VLE(Thread):
         #==============================================================================                
         x = [x[i]/(sum([x[i] for i in xrange(self.NC)])) for i in xrange(self.NC)] # Normalização das composições
         self.PhiSat(T)
-        P        = []
         coefAct  = self.Coeficiente_Atividade(x,T)
+        # Termo x*gamma*Psat*phisat, constante ao longo das iterações
+        f        = [x[i]*coefAct[i]*self.Componente[i].Pvap_Prausnitz_4th(T)*self.phisat[i] for i in xrange(self.NC)]
         # Caracterização da fase
         coeffug  = self.estphi
         
-        cont   = 0; deltaP = 10000
-        while (deltaP > self.tolAlg) and (cont<self.maxiter+1):
+        # Apenas a iteração corrente é armazenada
+        monitor = self._Monitor(1,self.maxiter+1,'PontoBolha_P')
+        P = 0.0; deltaP = 10000
+        while monitor.ativo[0]:
+            P_anterior = P
             # Atualização do valor de P por VLE
-            P.append(sum([x[i]*coefAct[i]*self.Componente[i].Pvap_Prausnitz_4th(T)*self.phisat[i]/coeffug[i]        for i in xrange(self.NC)]))
+            P       = sum([f[i]/coeffug[i] for i in xrange(self.NC)])
             # Cálculo de y por VLE
-            y       = [x[i]*coefAct[i]*self.Componente[i].Pvap_Prausnitz_4th(T)*self.phisat[i]/(coeffug[i]*P[cont]) for i in xrange(self.NC)]
+            y       = [f[i]/(coeffug[i]*P) for i in xrange(self.NC)]
             # Normalização do valor de y
             y        = [y[i]/(sum([y[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
             # Atualização de phi por EoS
-            coeffug = self.Coeficiente_Fugacidade(y,P[cont],T)
-            if cont>1:
-                deltaP = abs(P[cont] - P[cont-1])
-            cont+=1
+            coeffug = self.Coeficiente_Fugacidade(y,P,T)
+            if monitor.iteracoes[0]>1:
+                deltaP = abs(P - P_anterior)
+            monitor.atualizar(deltaP,valor=P)
             
         # Caracterização das fases
-        self.Bolha   = Condicao(P[cont-1],T,y,coeffug,None)
-        self.liquido = Condicao(P[cont-1],T,x,None,coefAct)
+        self.Bolha   = Condicao(P,T,y,coeffug,None,**monitor.telemetria(escalar=True))
+        self.liquido = Condicao(P,T,x,None,coefAct)
         self.vapor   = self.Bolha
 
+    @solucao
     def PontoBolha_T(self,x,P,Testimativa=None):
         ''' 
         Módulo para calcular o ponto de bolha segundo [1] e [2], quando a pressão e composição são conhecidas.
+        A temperatura é atualizada pela pressão de saturação de um componente de referência, escolhido automaticamente
+        a cada iteração como o de maior contribuição para a pressão (x*Psat) na temperatura corrente, de modo que o
+        algoritmo se aplica a qualquer número de componentes e a referência acompanha a variação da temperatura.
 
         ========
         Entradas
@@ -1037,38 +1660,178 @@ class VLE(Thread):
         x = [x[i]/(sum([x[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
         
         if Testimativa is None:
-            T = [sum([self.Componente[i].Tsat_Prausnitz_4th(P)*x[i] for i in xrange(self.NC)])]
+            T = sum([self.Componente[i].Tsat_Prausnitz_4th(P)*x[i] for i in xrange(self.NC)])
         else:
             T = Testimativa
             
         coeffug  = self.estphi
-        cont   = 0; deltaT = 10        
-        while (deltaT > self.tolAlg) and (cont<self.maxiter+1):
+        # Apenas a iteração corrente é armazenada
+        monitor  = self._Monitor(1,self.maxiter+1,'PontoBolha_T')
+        while monitor.ativo[0]:
             # cálculo da pressão de saturação P_i^(sat) por Prausnitz
-            psat_ini     = [self.Componente[i].Pvap_Prausnitz_4th(T[cont]) for i in xrange(self.NC)]            
+            psat_ini     = [self.Componente[i].Pvap_Prausnitz_4th(T) for i in xrange(self.NC)]            
+            # Componente de referência para a atualização de T: maior contribuição para a pressão (x*Psat)
+            ref          = max(xrange(self.NC), key = lambda i: x[i]*psat_ini[i])
             # Cálculo de phisat
-            self.PhiSat(T[cont])
+            self.PhiSat(T)
             # Cálculo de gamma por modelos termodinâmicos
-            coefAct  = self.Coeficiente_Atividade(x,T[cont])            
+            coefAct  = self.Coeficiente_Atividade(x,T)            
             # Predição de y por VLE
             y        = [x[i]*coefAct[i]*psat_ini[i]*self.phisat[i]/(coeffug[i]*P) for i in xrange(self.NC)]            
             # Normalização do valor de y
             y        = [y[i]/(sum([y[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
             # Atualização de phi por EoS
-            coeffug  = self.Coeficiente_Fugacidade(y,P,T[cont])
-            # Cálculo da pressão de saturação P_j^(sat) por VLE
-            psat     = [P/(sum([(x[i]*coefAct[i]*self.phisat[i]*psat_ini[i])/(psat_ini[j]*coeffug[i]) for i in xrange(self.NC)])) for j in xrange(self.NC)]            
-            # Atualização do valor de T por Prausnitz
-            T.append(self.Componente[1].Tsat_Prausnitz_4th(psat[1]))
+            coeffug  = self.Coeficiente_Fugacidade(y,P,T)
+            # Cálculo da pressão de saturação P_ref^(sat) do componente de referência por VLE
+            psat     = P/(sum([(x[i]*coefAct[i]*self.phisat[i]*psat_ini[i])/(psat_ini[ref]*coeffug[i]) for i in xrange(self.NC)]))
+            # Atualização do valor de T por Prausnitz e de deltaT
+            T_novo   = self.Componente[ref].Tsat_Prausnitz_4th(psat)
+            deltaT   = abs((T_novo - T)/T)
+            T        = T_novo
+            monitor.atualizar(deltaT,valor=T)
+            
+        # Caracterização das fases
+        self.liquido = Condicao(P,T,x,None,coefAct)
+        self.Bolha   = Condicao(P,T,y,coeffug,None,**monitor.telemetria(escalar=True))
+        self.vapor   = self.Bolha
+
+    @solucao
+    def PontoBolha_P_Lote(self,x,T):
+        '''
+        Módulo para calcular o ponto de bolha de várias composições de uma só vez, quando a temperatura é conhecida. 
+        O algoritmo é o mesmo de ``PontoBolha_P``, porém todas as composições são iteradas simultaneamente. Cada
+        composição deixa de ser iterada assim que atinge a tolerância (``tolAlg``) ou o número máximo de iterações.
+        
+        ========
+        Entradas
+        ========
+        
+        * x (list ou array): Composições da fase líquida, de dimensão (N,NC);
+        * T (float ou array): Temperatura(s) em Kelvin, um valor único ou um por composição (N).
+            
+        ======
+        Saídas
+        ======
+        
+        As seguintes saídas são em forma de atributos, cujos valores são arrays com uma linha por composição.
+        
+        * ``vapor``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``liquido``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``Bolha``: Um objeto da classe ``Condicao``, vide documentação da classe.
+        
+        Os atributos ``iteracoes`` e ``convergido`` de ``Bolha`` informam o número de iterações e a convergência de cada composição.
+        '''
+        #==============================================================================
+        #------------------ Estimativas iniciais --------------------------------------
+        #==============================================================================
+        x = asarray(x,dtype=float)
+        x = x/x.sum(axis=1)[:,newaxis] # Normalização das composições
+        N = x.shape[0]
+        T = zeros(N) + T
+        
+        coefAct = self.Coeficiente_Atividade_Lote(x,T)
+        # Termo x*gamma*Psat*phisat, constante ao longo das iterações
+        f       = x*coefAct*self._Psat_Lote(T)*self.PhiSat_Lote(T)
+        coeffug = zeros((N,self.NC)) + self.estphi
+        
+        P       = zeros(N)
+        y       = zeros((N,self.NC))
+        deltaP  = zeros(N) + 10000
+        monitor = self._Monitor(N,self.maxiter+1,'PontoBolha_P_Lote')
+        ativo   = monitor.ativo
+        while ativo.any():
+            k = nonzero(ativo)[0] # Composições ainda não convergidas
+            P_anterior = P[k]
+            # Atualização do valor de P por VLE
+            P[k] = (f[k]/coeffug[k]).sum(axis=1)
+            # Cálculo e normalização de y por VLE
+            y[k] = f[k]/(coeffug[k]*P[k][:,newaxis])
+            y[k] = y[k]/y[k].sum(axis=1)[:,newaxis]
+            # Atualização de phi por EoS
+            coeffug[k] = self.Coeficiente_Fugacidade_Lote(y[k],P[k],T[k])
+            deltaP[k]  = where(monitor.iteracoes[k]>1,abs(P[k] - P_anterior),deltaP[k])
+            ativo = monitor.atualizar(deltaP[k],k,P[k])
+            
+        # Caracterização das fases
+        self.Bolha   = Condicao(P,T,y,coeffug,None,**monitor.telemetria())
+        self.liquido = Condicao(P,T,x,None,coefAct)
+        self.vapor   = self.Bolha
+
+    @solucao
+    def PontoBolha_T_Lote(self,x,P,Testimativa=None):
+        '''
+        Módulo para calcular o ponto de bolha de várias composições de uma só vez, quando a pressão é conhecida. 
+        O algoritmo é o mesmo de ``PontoBolha_T``, porém todas as composições são iteradas simultaneamente. Cada
+        composição deixa de ser iterada assim que atinge a tolerância (``tolAlg``) ou o número máximo de iterações.
+        
+        ========
+        Entradas
+        ========
+        
+        * x (list ou array): Composições da fase líquida, de dimensão (N,NC);
+        * P (float ou array): Pressão(ões) em bar, um valor único ou um por composição (N);
+        * Testimativa (float ou array): Estimativa para temperatura em Kelvin.
+            
+        ======
+        Saídas
+        ======
+        
+        As seguintes saídas são em forma de atributos, cujos valores são arrays com uma linha por composição.
+        
+        * ``vapor``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``liquido``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``Bolha``: Um objeto da classe ``Condicao``, vide documentação da classe.
+        
+        Os atributos ``iteracoes`` e ``convergido`` de ``Bolha`` informam o número de iterações e a convergência de cada composição.
+        '''
+        #==============================================================================
+        #------------------ Estimativas iniciais --------------------------------------
+        #==============================================================================
+        x = asarray(x,dtype=float)
+        x = x/x.sum(axis=1)[:,newaxis] # Normalização das composições
+        N = x.shape[0]
+        P = zeros(N) + P
+        
+        if Testimativa is None:
+            T = sum([self._Tsat_Lote(P,i)*x[:,i] for i in xrange(self.NC)])
+        else:
+            T = zeros(N) + Testimativa
+            
+        coeffug = zeros((N,self.NC)) + self.estphi
+        coefAct = zeros((N,self.NC))
+        y       = zeros((N,self.NC))
+        deltaT  = zeros(N) + 10
+        monitor = self._Monitor(N,self.maxiter+1,'PontoBolha_T_Lote')
+        ativo   = monitor.ativo
+        while ativo.any():
+            k = nonzero(ativo)[0] # Composições ainda não convergidas
+            # cálculo da pressão de saturação P_i^(sat) por Prausnitz
+            psat_ini   = self._Psat_Lote(T[k])
+            # Componente de referência de cada composição: maior contribuição para a pressão (x*Psat)
+            ref        = (x[k]*psat_ini).argmax(axis=1)
+            # Cálculo de gamma por modelos termodinâmicos
+            coefAct[k] = self.Coeficiente_Atividade_Lote(x[k],T[k])
+            # Termo x*gamma*Psat*phisat
+            f          = x[k]*coefAct[k]*psat_ini*self.PhiSat_Lote(T[k])
+            # Predição e normalização de y por VLE
+            y[k]       = f/(coeffug[k]*P[k][:,newaxis])
+            y[k]       = y[k]/y[k].sum(axis=1)[:,newaxis]
+            # Atualização de phi por EoS
+            coeffug[k] = self.Coeficiente_Fugacidade_Lote(y[k],P[k],T[k])
+            # Cálculo da pressão de saturação P_ref^(sat) por VLE e atualização do valor de T por Prausnitz
+            psat       = P[k]*psat_ini[range(k.size),ref]/(f/coeffug[k]).sum(axis=1)
+            T_novo     = self._Tsat_Referencia(psat,ref)
             # Atualização do valor de deltaT
-            deltaT  = abs((T[cont+1] - T[cont])/T[cont])
-            cont+=1
+            deltaT[k]  = abs((T_novo - T[k])/T[k])
+            T[k]       = T_novo
+            ativo = monitor.atualizar(deltaT[k],k,T_novo)
             
         # Caracterização das fases
-        self.liquido = Condicao(P,T[cont],x,None,coefAct)
-        self.Bolha   = Condicao(P,T[cont],y,coeffug,None)
+        self.liquido = Condicao(P,T,x,None,coefAct)
+        self.Bolha   = Condicao(P,T,y,coeffug,None,**monitor.telemetria())
         self.vapor   = self.Bolha
         
+    @solucao
     def PontoOrvalho_P(self,y,T):
         ''' 
         Módulo para calcular o ponto de orvalho segundo [1] e [2], quando a temperatura e composição são conhecidas.
@@ -1107,33 +1870,40 @@ class VLE(Thread):
         # Normalização do valor de y
         y        = [y[i]/(sum([y[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
         self.PhiSat(T)
-        P        = [self.Pressao]
+        # Termo Psat*phisat, constante ao longo das iterações
+        f        = [self.Componente[i].Pvap_Prausnitz_4th(T)*self.phisat[i] for i in xrange(self.NC)]
+        P        = self.Pressao
         coeffug  = self.estphi
         coefAct  = self.estgama        
-        cont   = 1; deltaP = 10000
+        # Apenas a iteração corrente é armazenada
+        monitor  = self._Monitor(1,self.maxiter,'PontoOrvalho_P')
         
-        while (deltaP > self.tolAlg) and (cont<self.maxiter+1):
+        while monitor.ativo[0]:
+            P_anterior = P
             # Atualização do valor de P por VLE
-            P.append(1/sum([y[i]*coeffug[i]/(coefAct[i]*self.Componente[i].Pvap_Prausnitz_4th(T)*self.phisat[i])    for i in xrange(self.NC)]))
+            P       = 1/sum([y[i]*coeffug[i]/(coefAct[i]*f[i])   for i in xrange(self.NC)])
             # Cálculo de x por VLE
-            x       = [y[i]*coeffug[i]*P[cont]/(coefAct[i]*self.Componente[i].Pvap_Prausnitz_4th(T)*self.phisat[i]) for i in xrange(self.NC)]
+            x       = [y[i]*coeffug[i]*P/(coefAct[i]*f[i]) for i in xrange(self.NC)]
             # Normalização de x
             x       = [x[i]/(sum([x[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
             # Cálculo de phi por EoS
-            coeffug = self.Coeficiente_Fugacidade(y,P[cont],T)
+            coeffug = self.Coeficiente_Fugacidade(y,P,T)
             # Cálculo de gamma por modelos termodinamicos
             coefAct = self.Coeficiente_Atividade(x,T)
             
-            deltaP = abs(P[cont] - P[cont-1])
-            cont+=1
+            monitor.atualizar(abs(P - P_anterior),valor=P)
 
-        self.vapor   = Condicao(P[cont-1],T,y,coeffug,None)
-        self.Orvalho = Condicao(P[cont-1],T,x,None,coefAct)
+        self.vapor   = Condicao(P,T,y,coeffug,None)
+        self.Orvalho = Condicao(P,T,x,None,coefAct,**monitor.telemetria(escalar=True))
         self.liquido = self.Orvalho
         
+    @solucao
     def PontoOrvalho_T(self,y,P,Testimativa=None):
         ''' 
         Módulo para calcular o ponto de orvalho segundo [1] e [2], quando a pressão e composição são conhecidas.
+        A temperatura é atualizada pela pressão de saturação de um componente de referência, escolhido automaticamente
+        a cada iteração como o de maior contribuição para a fase líquida (y/Psat) na temperatura corrente, de modo que o
+        algoritmo se aplica a qualquer número de componentes e a referência acompanha a variação da temperatura.
 
         ========
         Entradas
@@ -1169,47 +1939,205 @@ class VLE(Thread):
         # Normalização do valor de y
         y        = [y[i]/(sum([y[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
         if Testimativa is None:
-            T = [sum([self.Componente[i].Tsat_Prausnitz_4th(P)*y[i] for i in xrange(self.NC)])]
+            T = sum([self.Componente[i].Tsat_Prausnitz_4th(P)*y[i] for i in xrange(self.NC)])
         else:
             T = Testimativa
        
-        coeffug  = [1.0,1.0]
-        coefAct  = [[1.0,1.0]]
-        cont   = 0; deltaT = 10
+        coeffug  = self.estphi
+        coefAct  = self.estgama
+        # Apenas a iteração corrente é armazenada
+        monitor  = self._Monitor(1,self.maxiter+1,'PontoOrvalho_T')
         
-        while (deltaT > self.tolAlg) and (cont<self.maxiter+1):
+        while monitor.ativo[0]:
             # cálculo da pressão de saturação P_i^(sat) por Prausnitz
-            psat_ini     = [self.Componente[i].Pvap_Prausnitz_4th(T[cont]) for i in xrange(self.NC)]            
+            psat_ini     = [self.Componente[i].Pvap_Prausnitz_4th(T) for i in xrange(self.NC)]            
+            # Componente de referência para a atualização de T: maior contribuição para o líquido (y/Psat)
+            ref          = max(xrange(self.NC), key = lambda i: y[i]/psat_ini[i])
             # Cálculo de phisat
-            self.PhiSat(T[cont])            
+            self.PhiSat(T)            
             # Atualização de phi por EoS
-            coeffug  = self.Coeficiente_Fugacidade(y,P,T[cont])
-            # Loop interno para o cálculo de gamma
-            contador = 0 ; delta_gamma = 10
-            while (delta_gamma > self.tolAlg) and (contador<self.maxiter+1):
+            coeffug  = self.Coeficiente_Fugacidade(y,P,T)
+            # Loop interno para o cálculo de gamma, partindo do último valor calculado
+            interno = self._Monitor(1,self.maxiter+1)
+            while interno.ativo[0]:
                 # Predição de x por equilíbrio
-                x = [y[i]*coeffug[i]*P/(coefAct[contador][i]*psat_ini[i]*self.phisat[i]) for i in xrange(self.NC)]
+                x = [y[i]*coeffug[i]*P/(coefAct[i]*psat_ini[i]*self.phisat[i]) for i in xrange(self.NC)]
                 # Normalização do valor de x
                 x = [x[i]/(sum([x[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
                 # Atualização do valor de gamma por modelos termodinâmicos
-                coefAct.append(self.Coeficiente_Atividade(x,T[cont]))
+                coefAct_novo = self.Coeficiente_Atividade(x,T)
                 # Atualização do valor de delta_gamma
-                delta_gamma  = abs((coefAct[contador+1][0] - coefAct[contador][0])/coefAct[contador][0])
-                contador+=1 
+                delta_gamma  = max([abs((coefAct_novo[i] - coefAct[i])/coefAct[i]) for i in xrange(self.NC)])
+                coefAct      = coefAct_novo
+                interno.atualizar(delta_gamma)
                 
-            # Cálculo da pressão de saturação P_j^(sat) por VLE
-            psat     = [P*(sum([(y[i]*coeffug[i]*psat_ini[j])/(coefAct[contador][i]*self.phisat[i]*psat_ini[i]) for i in xrange(self.NC)])) for j in xrange(self.NC)]            
-            # Atualização do valor de T por Prausnitz
-            T.append(self.Componente[0].Tsat_Prausnitz_4th(psat[0]))
-            # Atualização do valor de deltaT
-            deltaT  = abs((T[cont+1] - T[cont])/T[cont])
-            cont+=1
+            # Cálculo da pressão de saturação P_ref^(sat) do componente de referência por VLE
+            psat     = P*(sum([(y[i]*coeffug[i]*psat_ini[ref])/(coefAct[i]*self.phisat[i]*psat_ini[i]) for i in xrange(self.NC)]))
+            # Atualização do valor de T por Prausnitz e de deltaT
+            T_novo   = self.Componente[ref].Tsat_Prausnitz_4th(psat)
+            deltaT   = abs((T_novo - T)/T)
+            T        = T_novo
+            monitor.atualizar(deltaT,valor=T)
 
         # Caracterização da fase vapor
-        self.vapor   = Condicao(P,T[cont],y,coeffug,None)
-        self.Orvalho = Condicao(P,T[cont],x,None,coefAct)
+        self.vapor   = Condicao(P,T,y,coeffug,None)
+        self.Orvalho = Condicao(P,T,x,None,coefAct,**monitor.telemetria(escalar=True))
         self.liquido = self.Orvalho
+
+    @solucao
+    def PontoOrvalho_P_Lote(self,y,T):
+        '''
+        Módulo para calcular o ponto de orvalho de várias composições de uma só vez, quando a temperatura é conhecida. 
+        O algoritmo é o mesmo de ``PontoOrvalho_P``, porém todas as composições são iteradas simultaneamente. Cada
+        composição deixa de ser iterada assim que atinge a tolerância (``tolAlg``) ou o número máximo de iterações.
         
+        ========
+        Entradas
+        ========
+        
+        * y (list ou array): Composições da fase vapor, de dimensão (N,NC);
+        * T (float ou array): Temperatura(s) em Kelvin, um valor único ou um por composição (N).
+            
+        ======
+        Saídas
+        ======
+        
+        As seguintes saídas são em forma de atributos, cujos valores são arrays com uma linha por composição.
+        
+        * ``vapor``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``liquido``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``Orvalho``: Um objeto da classe ``Condicao``, vide documentação da classe.
+        
+        Os atributos ``iteracoes`` e ``convergido`` de ``Orvalho`` informam o número de iterações e a convergência de cada composição.
+        '''
+        #==============================================================================
+        #------------------ Estimativas iniciais --------------------------------------
+        #==============================================================================
+        y = asarray(y,dtype=float)
+        y = y/y.sum(axis=1)[:,newaxis] # Normalização das composições
+        N = y.shape[0]
+        T = zeros(N) + T
+        
+        # Termo Psat*phisat, constante ao longo das iterações
+        f       = self._Psat_Lote(T)*self.PhiSat_Lote(T)
+        coeffug = zeros((N,self.NC)) + self.estphi
+        coefAct = zeros((N,self.NC)) + self.estgama
+        
+        P       = zeros(N) + (self.Pressao or 0.0)
+        x       = zeros((N,self.NC))
+        deltaP  = zeros(N) + 10000
+        monitor = self._Monitor(N,self.maxiter,'PontoOrvalho_P_Lote')
+        ativo   = monitor.ativo
+        while ativo.any():
+            k = nonzero(ativo)[0] # Composições ainda não convergidas
+            P_anterior = P[k]
+            # Atualização do valor de P por VLE
+            P[k] = 1/(y[k]*coeffug[k]/(coefAct[k]*f[k])).sum(axis=1)
+            # Cálculo e normalização de x por VLE
+            x[k] = y[k]*coeffug[k]*P[k][:,newaxis]/(coefAct[k]*f[k])
+            x[k] = x[k]/x[k].sum(axis=1)[:,newaxis]
+            # Cálculo de phi por EoS
+            coeffug[k] = self.Coeficiente_Fugacidade_Lote(y[k],P[k],T[k])
+            # Cálculo de gamma por modelos termodinamicos
+            coefAct[k] = self.Coeficiente_Atividade_Lote(x[k],T[k])
+            
+            deltaP[k] = abs(P[k] - P_anterior)
+            ativo = monitor.atualizar(deltaP[k],k,P[k])
+            
+        self.vapor   = Condicao(P,T,y,coeffug,None)
+        self.Orvalho = Condicao(P,T,x,None,coefAct,**monitor.telemetria())
+        self.liquido = self.Orvalho
+
+    @solucao
+    def PontoOrvalho_T_Lote(self,y,P,Testimativa=None):
+        '''
+        Módulo para calcular o ponto de orvalho de várias composições de uma só vez, quando a pressão é conhecida. 
+        O algoritmo é o mesmo de ``PontoOrvalho_T``, porém todas as composições são iteradas simultaneamente, tanto no
+        laço da temperatura quanto no laço interno de gamma. Cada composição deixa de ser iterada assim que atinge a 
+        tolerância (``tolAlg``) ou o número máximo de iterações. O laço interno de gamma de cada composição parte do
+        último valor calculado, de modo que apenas o valor corrente é armazenado.
+        
+        ========
+        Entradas
+        ========
+        
+        * y (list ou array): Composições da fase vapor, de dimensão (N,NC);
+        * P (float ou array): Pressão(ões) em bar, um valor único ou um por composição (N);
+        * Testimativa (float ou array): Estimativa para temperatura em Kelvin.
+            
+        ======
+        Saídas
+        ======
+        
+        As seguintes saídas são em forma de atributos, cujos valores são arrays com uma linha por composição.
+        
+        * ``vapor``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``liquido``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``Orvalho``: Um objeto da classe ``Condicao``, vide documentação da classe.
+        
+        Os atributos ``iteracoes`` e ``convergido`` de ``Orvalho`` informam o número de iterações (do laço da temperatura)
+        e a convergência de cada composição.
+        '''
+        #==============================================================================
+        #------------------ Estimativas iniciais --------------------------------------
+        #==============================================================================
+        y = asarray(y,dtype=float)
+        y = y/y.sum(axis=1)[:,newaxis] # Normalização das composições
+        N = y.shape[0]
+        P = zeros(N) + P
+        
+        if Testimativa is None:
+            T = sum([self._Tsat_Lote(P,i)*y[:,i] for i in xrange(self.NC)])
+        else:
+            T = zeros(N) + Testimativa
+        
+        coeffug = zeros((N,self.NC)) + self.estphi
+        coefAct = zeros((N,self.NC)) + self.estgama
+        x       = zeros((N,self.NC))
+        deltaT  = zeros(N) + 10
+        monitor = self._Monitor(N,self.maxiter+1,'PontoOrvalho_T_Lote')
+        ativo   = monitor.ativo
+        while ativo.any():
+            k = nonzero(ativo)[0] # Composições ainda não convergidas
+            # cálculo da pressão de saturação P_i^(sat) por Prausnitz e de phisat
+            psat_ini   = self._Psat_Lote(T[k])
+            f          = psat_ini*self.PhiSat_Lote(T[k])
+            # Componente de referência de cada composição: maior contribuição para o líquido (y/Psat)
+            ref        = (y[k]/psat_ini).argmax(axis=1)
+            # Atualização de phi por EoS
+            coeffug[k] = self.Coeficiente_Fugacidade_Lote(y[k],P[k],T[k])
+            # Termo y*phi*P, constante no laço interno
+            g          = y[k]*coeffug[k]*P[k][:,newaxis]
+            
+            # Loop interno para o cálculo de gamma (índices relativos a k)
+            monitor_interno = self._Monitor(k.size,self.maxiter+1)
+            interno         = monitor_interno.ativo
+            while interno.any():
+                m  = nonzero(interno)[0]
+                km = k[m]
+                # Predição e normalização de x por equilíbrio
+                x[km] = g[m]/(coefAct[km]*f[m])
+                x[km] = x[km]/x[km].sum(axis=1)[:,newaxis]
+                # Atualização do valor de gamma por modelos termodinâmicos
+                coefAct_novo   = self.Coeficiente_Atividade_Lote(x[km],T[km])
+                delta_gamma    = (abs(coefAct_novo - coefAct[km])/coefAct[km]).max(axis=1)
+                coefAct[km]    = coefAct_novo
+                interno = monitor_interno.atualizar(delta_gamma,m)
+                
+            # Cálculo da pressão de saturação P_ref^(sat) por VLE e atualização do valor de T por Prausnitz
+            psat      = (g*psat_ini[range(k.size),ref][:,newaxis]/(coefAct[k]*f)).sum(axis=1)
+            T_novo    = self._Tsat_Referencia(psat,ref)
+            # Atualização do valor de deltaT
+            deltaT[k] = abs((T_novo - T[k])/T[k])
+            T[k]      = T_novo
+            ativo = monitor.atualizar(deltaT[k],k,T_novo)
+            
+        # Caracterização das fases
+        self.vapor   = Condicao(P,T,y,coeffug,None)
+        self.Orvalho = Condicao(P,T,x,None,coefAct,**monitor.telemetria())
+        self.liquido = self.Orvalho
+        
+    @solucao
     def Flash(self,z,T,P):
         '''        
         Módulo para realizar o calculo de flash segundo [1] e [2], dada pressão, composições globais e temperatura.    
@@ -1228,9 +2156,14 @@ class VLE(Thread):
         
         As seguintes saídas são em forma de atributos.
         
-        * ``Bolha``: Um objeto da classe ``Condicao``, vide documentação da classe;
-        * ``Orvalho``: Um objeto da classe ``Condicao``, vide documentação da classe;
-        * ``Beta``: Um objeto da classe ``Condicao``, vide documentação da classe.
+        * ``liquido``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``vapor``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``condicao_global``: Um objeto da classe ``Condicao`` com a composição global, a fração vaporizada e os dados da convergência;
+        * ``Beta`` (float): Fração vaporizada.
+        
+        Os atributos ``Orvalho`` e ``Bolha`` correspondem às fases líquida e vapor, respectivamente. Caso a pressão não
+        esteja entre as pressões de orvalho e de bolha da alimentação (alimentação monofásica), é gerado um erro
+        (``Erro_Valor``); o módulo ``Flash_Lote`` classifica essas alimentações como líquido ou vapor.
         
         ===========
         Referências
@@ -1242,78 +2175,250 @@ class VLE(Thread):
         [2] SMITH, J. M.; NESS, H. C. VAN; ABBOTT, M. M. Introduction to Chemical 
         Engineering Thermodinamics. 7th. ed. [s.l.] Mc-Graw Hills, [s.d.]. 
         '''
-        # TDODO: documentaao
         z    = [z[i]/(sum([z[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
         Psat = [self.Componente[i].Pvap_Prausnitz_4th(T) for i in xrange(self.NC)]            
         self.PontoBolha_P(z,T)
+        Bolha, liquido_bolha = self.Bolha, self.liquido
         self.PontoOrvalho_P(z,T)
+        Orvalho, vapor_orvalho = self.Orvalho, self.vapor
 
-        if (P < self.Bolha.Pressao) and (P > self.Orvalho.Pressao):
+        if (P < Bolha.Pressao) and (P > Orvalho.Pressao):
             
-            interp = (P - self.Orvalho.Pressao)/(self.Bolha.Pressao - self.Orvalho.Pressao)
-            coefAct = [(self.liquido.coefAct[i] - self.Orvalho.coefAct[i])*interp + self.Orvalho.liquido.coefAct[i]  for i in xrange(self.NC) ]
-            coeffug = [(self.Bolha.coeffug[i]   - self.vapor.coeffug[i])*interp   + self.Orvalho.vapor.coefFug[i]    for i in xrange(self.NC) ]
+            # Estimativas de gamma e phi por interpolação entre os pontos de orvalho e de bolha
+            interp  = (P - Orvalho.Pressao)/(Bolha.Pressao - Orvalho.Pressao)
+            coefAct = [(liquido_bolha.coefAct[i] - Orvalho.coefAct[i])*interp + Orvalho.coefAct[i]       for i in xrange(self.NC)]
+            coeffug = [(Bolha.coeffug[i]         - vapor_orvalho.coeffug[i])*interp + vapor_orvalho.coeffug[i] for i in xrange(self.NC)]
             
             self.PhiSat(T)
             
-            V    = [(self.Bolha.Pressao - self.Pressao)/(self.Bolha.Pressao - self.Orvalho.Pressao)]
-            x    = [z]
-            y    = [z]
-            cont = 0; deltaV = 1e10; delta_x = 1e4; delta_y = 1e4            
-            while (deltaV>self.tolAlg) and (delta_x>self.toleq) and (delta_y>self.toleq) and (cont<(self.maxiter)) :
+            # Apenas a iteração corrente é armazenada
+            V    = (Bolha.Pressao - P)/(Bolha.Pressao - Orvalho.Pressao)
+            x    = z
+            y    = z
+            monitor = self._Monitor(1,self.maxiter,'Flash')
+            while monitor.ativo[0]:
                 
                 # Cálculo de K
-                
                 K = [(coefAct[i]*Psat[i]*self.phisat[i]) / (coeffug[i]*P) for i in xrange(self.NC)]
-		
+                
                 # Cálculo de F e sua derivada em relação à fração de vapor
-                F     = sum([z[i]*(K[i]-1)    / (1+V[cont]*(K[i]-1))    for i in xrange(self.NC)])
-                dFdV = (-1)*sum([z[i]*(K[i]-1)**2 / (1+V[cont]*(K[i]-1))**2 for i in xrange(self.NC)])
-		
+                F    = sum([z[i]*(K[i]-1)    / (1+V*(K[i]-1))    for i in xrange(self.NC)])
+                dFdV = (-1)*sum([z[i]*(K[i]-1)**2 / (1+V*(K[i]-1))**2 for i in xrange(self.NC)])
+                
                 # Aplicação do método de Newton
-                V.append(V[cont] - F/dFdV)
-
+                V_novo = V - F/dFdV
+                
                 # Cálculo das composições e subsequente normalização:
-                x_aux = [z[i] / (1 + V[cont+1]*(K[i]-1)) for i in xrange(self.NC)]
-                x.append([x_aux[i]/(sum([x_aux[i] for i in xrange(self.NC)])) for i in xrange(self.NC)])
-            
-                y_aux = [K[i]*x[i] for i in xrange(self.NC)]
-                y.append([y_aux[i]/(sum([y_aux[i] for i in xrange(self.NC)])) for i in xrange(self.NC)])
-
+                x_aux = [z[i] / (1 + V_novo*(K[i]-1)) for i in xrange(self.NC)]
+                x_novo = [x_aux[i]/(sum([x_aux[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
+                
+                y_aux = [K[i]*x_novo[i] for i in xrange(self.NC)]
+                y_novo = [y_aux[i]/(sum([y_aux[i] for i in xrange(self.NC)])) for i in xrange(self.NC)]
+                
                 # Cálculo das fugacidades
-                coefAct = self.Coeficiente_Atividade(x[cont+1],T)
-                coeffug = self.Coeficiente_Fugacidade(y[cont+1],P,T)
+                coefAct = self.Coeficiente_Atividade(x_novo,T)
+                coeffug = self.Coeficiente_Fugacidade(y_novo,P,T)
                 
                 # Diferença entre valores de x
-                delta_x = abs((x[cont+1][0] - x[cont][0])/x[cont][0])
+                delta_x = abs((x_novo[0] - x[0])/x[0])
                 
                 # Diferença entre valores de y
-                delta_y = abs((y[cont+1][0] - y[cont][0])/y[cont][0])
+                delta_y = abs((y_novo[0] - y[0])/y[0])
                 
                 # Diferença entre valores de beta
-                deltaV = abs((V[cont+1] - V[cont])/V[cont])
+                deltaV = abs((V_novo - V)/V)
                 
-                cont+=1
+                V, x, y = V_novo, x_novo, y_novo
+                monitor.atualizar(max(deltaV,delta_x,delta_y),valor=V)
                 
-          # Configuração das fases
-	    self.Orvalho = Condicao(P,T,x[cont],None,coefAct) # configuração da fase líquida
-	    self.Bolha   = Condicao(P,T,y[cont],coeffug,None) # configuração da fase vapor
-	    self.Beta    = V[cont]
-	    self.condicao_global  = Condicao(P,T,z,None,None) # Configuração da condição global
-	else:
-	    
-	    raise ValueError(u'Não é possível realizar o cálculo de Flash, dado que a condição de equilíbrio não é satisfeita.') 
+            # Configuração das fases
+            self.liquido = Condicao(P,T,x,None,coefAct) # configuração da fase líquida
+            self.vapor   = Condicao(P,T,y,coeffug,None) # configuração da fase vapor
+            self.Orvalho = self.liquido
+            self.Bolha   = self.vapor
+            self.Beta    = V
+            self.condicao_global  = Condicao(P,T,z,None,None,beta=V,**monitor.telemetria(escalar=True)) # Configuração da condição global
+        else:
+            
+            raise Erro_Valor(u'Não é possível realizar o cálculo de Flash, dado que a condição de equilíbrio não é satisfeita.') 
     
-    def Predicao(self,Constante,Valor_cte):
+    @solucao
+    def Flash_Lote(self,z,T,P):
+        '''
+        Módulo para realizar o cálculo de flash de várias alimentações de uma só vez, dadas as composições globais,
+        a temperatura e a pressão. 
+        
+        Em cada iteração, os valores de K são calculados pelos coeficientes de atividade e de fugacidade
+        (``Coeficiente_Atividade_Lote`` e ``Coeficiente_Fugacidade_Lote``) e a equação de Rachford-Rice é resolvida
+        para todas as alimentações simultaneamente (vide ``_Rachford_Rice_Lote``). Cada alimentação é classificada,
+        com base nos valores de K, como líquido sub-resfriado, vapor superaquecido ou sistema bifásico:
+        
+        * ``'liquido'``: soma de z*K menor ou igual a 1 (Beta = 0);
+        * ``'vapor'``: soma de z/K menor ou igual a 1 (Beta = 1);
+        * ``'bifasico'``: demais casos (0 < Beta < 1).
+        
+        Nas alimentações monofásicas, a composição da fase ausente corresponde à da fase incipiente. Ao contrário do
+        módulo ``Flash``, que gera um erro (``Erro_Valor``) quando a alimentação não é bifásica, as alimentações
+        monofásicas recebem Beta = 0 ou 1 e o status 'convergido'.
+        
+        ========
+        Entradas
+        ========
+        
+        * z (list ou array): Composições globais, de dimensão (N,NC);
+        * T (float ou array): Temperatura(s) em Kelvin, um valor único ou um por alimentação (N);
+        * P (float ou array): Pressão(ões) em bar, um valor único ou um por alimentação (N).
+        
+        ======
+        Saídas
+        ======
+        
+        As seguintes saídas são em forma de atributos, cujos valores são arrays com uma linha por alimentação.
+        
+        * ``liquido``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``vapor``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``condicao_global``: Um objeto da classe ``Condicao`` que armazena os dados das alimentações, além do número de iterações e da convergência de cada alimentação;
+        * ``Beta`` (array): Fração vaporizada de cada alimentação;
+        * ``estado_fase`` (array): Classificação de cada alimentação ('liquido', 'vapor' ou 'bifasico').
+        
+        Como em ``Flash``, os atributos ``Orvalho`` e ``Bolha`` correspondem às fases líquida e vapor, respectivamente.
+        
+        ===========
+        Referências
+        ===========
+        
+        [1] PRAUSNITZ, J. M. et al. Computer Calculations for multicomponent vapor-liquid 
+        and liquid-liquid equilibria. [s.l.] Prendice-Hall, 1980. p. 353
+        
+        [2] RACHFORD, H. H.; RICE, J. D. Procedure for Use of Electronic Digital Computers in Calculating Flash
+        Vaporization Hydrocarbon Equilibrium. Journal of Petroleum Technology, v. 4, n. 10, 1952.
+        '''
+        #==============================================================================
+        #------------------ Estimativas iniciais --------------------------------------
+        #==============================================================================
+        z = asarray(z,dtype=float)
+        z = z/z.sum(axis=1)[:,newaxis] # Normalização das composições
+        N = z.shape[0]
+        T = zeros(N) + T
+        P = zeros(N) + P
+        
+        # Termo Psat*phisat/P, constante ao longo das iterações
+        f       = self._Psat_Lote(T)*self.PhiSat_Lote(T)/P[:,newaxis]
+        coefAct = self.Coeficiente_Atividade_Lote(z,T)
+        coeffug = zeros((N,self.NC)) + self.estphi
+        K       = coefAct*f/coeffug
+        
+        Beta    = zeros(N) + self.estBeta
+        x       = z.copy()
+        y       = z.copy()
+        deltaK  = zeros(N) + 1e4
+        monitor = self._Monitor(N,self.maxiter,'Flash_Lote')
+        ativo   = monitor.ativo
+        while ativo.any():
+            k = nonzero(ativo)[0] # Alimentações ainda não convergidas
+            # Classificação das fases e solução da equação de Rachford-Rice
+            Beta[k] = self._Rachford_Rice_Lote(z[k],K[k],Beta[k])
+            # Cálculo das composições e subsequente normalização
+            x[k] = z[k]/(1 + Beta[k][:,newaxis]*(K[k]-1))
+            x[k] = x[k]/x[k].sum(axis=1)[:,newaxis]
+            y[k] = K[k]*x[k]
+            y[k] = y[k]/y[k].sum(axis=1)[:,newaxis]
+            # Atualização de gamma e phi e, consequentemente, de K
+            coefAct[k] = self.Coeficiente_Atividade_Lote(x[k],T[k])
+            coeffug[k] = self.Coeficiente_Fugacidade_Lote(y[k],P[k],T[k])
+            K_novo     = coefAct[k]*f[k]/coeffug[k]
+            deltaK[k]  = (abs(K_novo - K[k])/K[k]).max(axis=1)
+            K[k]       = K_novo
+            ativo = monitor.atualizar(deltaK[k],k,Beta[k])
+        
+        # Classificação final com os valores de K convergidos
+        Beta = self._Rachford_Rice_Lote(z,K,Beta)
+        estado_fase = array(['bifasico']*N,dtype=object)
+        estado_fase[Beta == 0.0] = 'liquido'
+        estado_fase[Beta == 1.0] = 'vapor'
+        
+        # Configuração das fases
+        self.liquido = Condicao(P,T,x,None,coefAct)
+        self.vapor   = Condicao(P,T,y,coeffug,None)
+        self.Orvalho = self.liquido
+        self.Bolha   = self.vapor
+        self.Beta    = Beta
+        self.estado_fase = estado_fase
+        self.condicao_global = Condicao(P,T,z,None,None,beta=Beta,**monitor.telemetria())
+
+    def _Rachford_Rice_Lote(self,z,K,Beta0):
+        '''
+        Solução da equação de Rachford-Rice para várias alimentações de uma só vez, pelo método de Newton com
+        salvaguarda: a raiz é mantida no intervalo [0, 1], que é atualizado a cada iteração, e passos de Newton que 
+        deixam o intervalo são substituídos por bissecção.
+        
+        ========
+        Entradas
+        ========
+        
+        * z (array): Composições globais, de dimensão (N,NC);
+        * K (array): Razões de equilíbrio y/x, de dimensão (N,NC);
+        * Beta0 (array): Estimativas para a fração vaporizada (N).
+        
+        ======
+        Saídas
+        ======
+        
+        * Retorna um array (N) com a fração vaporizada. As alimentações de líquido sub-resfriado (soma de z*K <= 1)
+          recebem Beta = 0 e as de vapor superaquecido (soma de z/K <= 1), Beta = 1.
+        '''
+        N    = z.shape[0]
+        Beta = zeros(N)
+        Beta[(z/K).sum(axis=1) <= 1.0] = 1.0
+        
+        bifasico = ((z*K).sum(axis=1) > 1.0) & ((z/K).sum(axis=1) > 1.0)
+        b  = nonzero(bifasico)[0]
+        zb = z[b]; Kb = K[b]-1
+        V  = Beta0[b].clip(0.0,1.0)
+        inferior = zeros(b.size); superior = ones(b.size) # Intervalo que contém a raiz
+        cont  = 0
+        ativo = ones(b.size,dtype=bool)
+        while ativo.any() and cont < self.maxiter:
+            m  = nonzero(ativo)[0]
+            # Cálculo de F e sua derivada em relação à fração de vapor
+            d    = 1 + V[m][:,newaxis]*Kb[m]
+            F    = (zb[m]*Kb[m]/d).sum(axis=1)
+            dFdV = -(zb[m]*Kb[m]**2/d**2).sum(axis=1)
+            # Atualização do intervalo (F é decrescente em V)
+            inferior[m] = where(F > 0, V[m], inferior[m])
+            superior[m] = where(F < 0, V[m], superior[m])
+            # Passo de Newton, substituído por bissecção caso deixe o intervalo
+            V_novo = V[m] - F/dFdV
+            fora   = (V_novo <= inferior[m]) | (V_novo >= superior[m])
+            V_novo[fora] = 0.5*(inferior[m][fora] + superior[m][fora])
+            ativo[m] = (abs(V_novo - V[m]) > self.tolAlg) & (F != 0)
+            V[m] = V_novo
+            cont += 1
+        Beta[b] = V
+        return Beta
+        
+    @solucao
+    def Predicao(self,Constante,Valor_cte,resolucao=None,ponto_controle=None,tamanho_bloco=None):
         '''
         Metodo para caracterização dos eixos Ox e Oy para a realização dos gráficos.
         
+        Para misturas binárias, sem ``resolucao``, é percorrida a linha de composições [z, 1-z]. Para misturas com 3 ou mais
+        componentes, ou caso ``resolucao`` seja inserida, é realizada uma varredura de uma grade baricêntrica regular sobre o 
+        simplex das composições (vide ``Grade_Simplex``). Os pontos de bolha e de orvalho de todos os pontos são calculados
+        pelos algoritmos em lote.
+        
         ========
         Entradas
         ========
         
         * Constante (str): Nome da variável que será mantida constante: temperatura ou pressao;
-        * Valor_cte (float): Valor da constante de acordo com a variável inserida em *Constante*.
+        * Valor_cte (float): Valor da constante de acordo com a variável inserida em *Constante*;
+        * resolucao (int): Número de divisões de cada aresta do simplex na varredura. Caso não seja inserida, é utilizado o valor 20 para misturas com 3 ou mais componentes;
+        * ponto_controle (str): Diretório dos pontos de controle (vide ``Ponto_Controle``). Os blocos calculados são gravados
+          à medida que são obtidos e, caso o cálculo seja repetido com a mesma especificação, os blocos já gravados não são
+          calculados novamente;
+        * tamanho_bloco (int): Número de composições de cada bloco. Caso não seja inserido, todas as composições são 
+          calculadas em um único bloco ou, com ``ponto_controle``, em blocos de 250 composições.
         
         ======
         Saídas
@@ -1322,8 +2427,79 @@ class VLE(Thread):
         As seguintes saídas são em forma de atributos.
         
         * ``Bolha``: Um objeto da classe ``Condicao``, vide documentação da classe;
-        * ``Orvalho``: Um objeto da classe ``Condicao``, vide documentação da classe.
+        * ``Orvalho``: Um objeto da classe ``Condicao``, vide documentação da classe;
+        * ``varredura``: Um objeto da classe ``Varredura``, apenas no caso da varredura da grade, vide documentação da classe.
         
+        '''
+        # ----------------------------------------------------
+        # CÁLCULO (vide Predicao_Iterativa)
+        # ----------------------------------------------------
+        if ponto_controle is not None and tamanho_bloco is None:
+            tamanho_bloco = 250
+        
+        blocos = list(self.Predicao_Iterativa(Constante,Valor_cte,resolucao,tamanho_bloco,ponto_controle))
+        if len(blocos) > 1:
+            self.Bolha   = _Concatenar_Condicoes([bloco['Bolha'] for bloco in blocos])
+            self.Orvalho = _Concatenar_Condicoes([bloco['Orvalho'] for bloco in blocos])
+        indice = None if blocos[0]['indice'] is None else concatenate([bloco['indice'] for bloco in blocos])
+        
+        if indice is not None:
+            
+            # Varredura da grade de composições
+            self.varredura = Varredura(indice,concatenate([bloco['composicao'] for bloco in blocos]),Constante,Valor_cte,self.Bolha,self.Orvalho)
+        
+        elif Constante == 'temperatura':
+            
+            # caracterização das fases
+            self.Bolha   = Condicao(self.Bolha.Pressao.tolist(),Valor_cte,self.Bolha.comp_molar.T.tolist(),None,None)
+            self.Orvalho = Condicao(self.Orvalho.Pressao.tolist(),Valor_cte,self.Orvalho.comp_molar.T.tolist(),None,None)
+        
+        elif Constante == 'pressao':
+            
+            # Caracterização das fases
+            self.Bolha   = Condicao(Valor_cte,self.Bolha.Temp.tolist(),self.Bolha.comp_molar.T.tolist(),None,None)
+            self.Orvalho = Condicao(Valor_cte,self.Orvalho.Temp.tolist(),self.Orvalho.comp_molar.T.tolist(),None,None)
+
+    def Predicao_Iterativa(self,Constante,Valor_cte,resolucao=None,tamanho_bloco=250,ponto_controle=None):
+        '''
+        Forma iterativa de ``Predicao``: retorna um gerador que calcula os pontos de bolha e de orvalho em blocos de 
+        composições, entregando cada bloco assim que é calculado. Desta forma, os resultados podem ser utilizados (Ex.: em
+        gráficos) à medida que são obtidos, a memória utilizada é limitada ao tamanho do bloco e o cálculo pode ser 
+        interrompido a qualquer momento.
+        
+        ========
+        Entradas
+        ========
+        
+        * Constante (str): Nome da variável que será mantida constante: temperatura ou pressao;
+        * Valor_cte (float): Valor da constante de acordo com a variável inserida em *Constante*;
+        * resolucao (int): Vide documentação de ``Predicao``;
+        * tamanho_bloco (int): Número de composições de cada bloco. Caso seja None, todas as composições são calculadas em um único bloco;
+        * ponto_controle (str ou Ponto_Controle): Diretório dos pontos de controle (vide ``Ponto_Controle``). Cada bloco é 
+          gravado assim que é calculado, e os blocos já gravados por uma execução anterior com a mesma especificação são 
+          carregados em vez de calculados.
+        
+        ======
+        Saídas
+        ======
+        
+        Cada bloco é um dicionário com as chaves:
+        
+        * ``inicio`` (int): Posição da primeira composição do bloco no eixo de composições;
+        * ``indice`` (array de inteiros): Índices dos pontos na grade (vide ``Grade_Simplex``), ou None no caso da linha binária;
+        * ``composicao`` (array): Composições do bloco, de dimensão (n,NC);
+        * ``Bolha`` e ``Orvalho``: Objetos da classe ``Condicao`` calculados pelos algoritmos em lote para o bloco;
+        * ``retomado`` (bool): Indica se o bloco foi carregado do ponto de controle. Neste caso, os atributos ``liquido`` e 
+          ``vapor`` não são atualizados e os avisos do bloco não são emitidos novamente.
+        
+        =======
+        Exemplo
+        =======
+        
+        ::
+        
+            >>> for bloco in Calculo.Predicao_Iterativa('pressao',1.013,tamanho_bloco=100):
+            ...     print bloco['inicio'], bloco['Bolha'].Temp
         '''
         # ----------------------------------------------------
         # VALIDAÇÃO
@@ -1333,89 +2509,216 @@ class VLE(Thread):
         
         # Validação se a string Constante foi digitada incorretamente:
         if Constante not in keywordsEntrada:
-            raise NameError(u'keyword(s) incorretas para as constantes: '+', '.join([Constante])+'.'+u' Keywords das constantes disponíveis: '+', '.join(keywordsEntrada)+'.')
+            raise Erro_Nome(u'keyword(s) incorretas para as constantes: '+', '.join([Constante])+'.'+u' Keywords das constantes disponíveis: '+', '.join(keywordsEntrada)+'.')
         
-        if Constante == keywordsEntrada[1]:
-            
-            T = Valor_cte
-            # Criação do eixo X para fazer os gráficos
-            z_1 = linspace(1e-13,0.1,1000).tolist() # Devido à união das pontas, o passo nas extremidades é menor
-            z_2 = linspace(0.1,0.9,500).tolist()
-            z_3 = linspace(0.9,0.9999999999999,1000).tolist() # Devido à união das pontas, o passo nas extremidades é menor
-            
-            z = z_1+z_2+z_3 # Forma~çao do eixo X, eixo das composições, completo
-
-            # Criação das listas vazias
-            y_1 = []
-            y_2 = []
-            x_1 = []
-            x_2 = []
-            Pressao_Ponto_Bolha   = []
-            Pressao_Ponto_Orvalho = []
-            
-            # Realiza o cálculo do ponto de bolha e de orvalho de cada par de concetrações
-            for i in xrange(len(z)):
-            
-                # Cálculos
-                self.PontoBolha_P([z[i],1-z[i]],T)
-                self.PontoOrvalho_P([z[i],1-z[i]],T)
-                          
-                # Preenchimento das listas          
-                y_1.append(self.Bolha.comp_molar[0])
-                y_2.append(self.Bolha.comp_molar[1])
-                x_1.append(self.Orvalho.comp_molar[0])
-                x_2.append(self.Orvalho.comp_molar[1])
-                Pressao_Ponto_Bolha.append(self.Bolha.Pressao)
-                Pressao_Ponto_Orvalho.append(self.Orvalho.Pressao)
-
-            # caracterização das fases
-            self.Bolha   = Condicao(Pressao_Ponto_Bolha,T,[y_1,y_2],None,None)
-            self.Orvalho = Condicao(Pressao_Ponto_Orvalho,T,[x_1,x_2],None,None)
+        if self.NC > 2 and resolucao is None:
+            resolucao = 20
         
-        elif Constante == keywordsEntrada[0]:
-            
-            P = Valor_cte
+        if isinstance(ponto_controle,basestring):
+            ponto_controle = Ponto_Controle(ponto_controle,self._Especificacao_Varredura(Constante,Valor_cte,resolucao,tamanho_bloco))
+        
+        return self._Blocos_Predicao(Constante,Valor_cte,resolucao,tamanho_bloco,ponto_controle)
+
+    def _Descricao_Sistema(self):
+        '''
+        Descrição do sistema (componentes, modelos e tolerâncias), utilizada nos pontos de controle (vide ``Ponto_Controle``)
+        e nas descrições dos resultados gravados (vide rotina Resultados). Os parâmetros dos modelos são representados por 
+        um resumo (SHA-1).
+        '''
+        parametros = sha1()
+        for modelo in (self.model_liq,self.model_vap):
+            for atributo in modelo._matrizes+modelo._vetores:
+                valor = getattr(modelo,atributo,None)
+                parametros.update(atributo+repr(valor.tolist() if hasattr(valor,'tolist') else valor))
+        
+        return {'componentes':[componente.nome for componente in self.Componente],
+                'modelo_liq':self.model_liq.nome_modelo,'forma':getattr(self.model_liq,'formaEq',None),
+                'modelo_vap':self.model_vap.nome_modelo,'regra':getattr(self.model_vap,'regra_mistura',None),
+                'parametros':parametros.hexdigest(),'tolAlg':self.tolAlg,'maxiter':self.maxiter,'estphi':self.estphi,
+                'z_coordenacao':self.z_coordenacao,'janela_estagnacao':self.janela_estagnacao}
+
+    def _Especificacao_Varredura(self,Constante,Valor_cte,resolucao,tamanho_bloco):
+        '''
+        Especificação de uma varredura, utilizada na identificação dos pontos de controle (vide ``Ponto_Controle``).
+        '''
+        especificacao = self._Descricao_Sistema()
+        especificacao.update({'Constante':Constante,'Valor_cte':Valor_cte,'resolucao':resolucao,'tamanho_bloco':tamanho_bloco})
+        return especificacao
+
+    def _Blocos_Predicao(self,Constante,Valor_cte,resolucao,tamanho_bloco,ponto_controle=None):
+        '''
+        Gerador dos blocos de ``Predicao_Iterativa``. As composições de cada bloco são geradas apenas quando o bloco é calculado.
+        '''
+        # ----------------------------------------------------
+        # EIXO DAS COMPOSIÇÕES
+        # ----------------------------------------------------
+        if resolucao is not None:
+            # Grade de composições: posições das divisórias geradas sob demanda (vide Grade_Simplex)
+            divisorias = combinations(xrange(resolucao+self.NC-1),self.NC-1)
+        else:
             # Criação do eixo X para fazer os gráficos
-            z_1 = linspace(1e-13,0.1,1000).tolist() # Devido à união das pontas, o passo nas extremidades é menor
-            z_2 = linspace(0.1,0.9,500).tolist()
-            z_3 = linspace(0.9,0.9999999999999,1000).tolist() # Devido à união das pontas, o passo nas extremidades é menor
-            
-            z = z_1+z_2+z_3 # Forma~çao do eixo X, eixo das composições, completo
-
-            # Criação das listas vazias
-            y_1 = []
-            y_2 = []
-            x_1 = []
-            x_2 = []
-            Temperatura_Ponto_Bolha   = []
-            Temperatura_Ponto_Orvalho = []
-            
-            # Realiza o cálculo do ponto de bolha e de orvalho de cada par de concetrações
-            for i  in xrange(len(z)):
+            z = _Eixo_Binario()
+        
+        # ----------------------------------------------------
+        # CÁLCULO DOS BLOCOS
+        # ----------------------------------------------------
+        self.diagnostico.iniciar() # Os avisos são emitidos ao final do gerador (ou quando este for interrompido)
+        try:
+            inicio = 0
+            while True:
+                if resolucao is not None:
+                    bloco = list(islice(divisorias,tamanho_bloco))
+                    if len(bloco) == 0:
+                        break
+                    indice, zb = _Pontos_Simplex(bloco,self.NC,resolucao)
+                else:
+                    if inicio >= z.shape[0]:
+                        break
+                    indice = None
+                    zb     = z[inicio:] if tamanho_bloco is None else z[inicio:inicio+tamanho_bloco]
                 
-                # Cálculos
-                self.PontoBolha_T([z[i],1-z[i]],P)
-                self.PontoOrvalho_T([z[i],1-z[i]],P)
-                          
-                # Preenchimento das listas    
-                y_1.append(self.Bolha.comp_molar[0])
-                y_2.append(self.Bolha.comp_molar[1])
-                x_1.append(self.Orvalho.comp_molar[0])
-                x_2.append(self.Orvalho.comp_molar[1])
-                Temperatura_Ponto_Bolha.append(self.Bolha.Temp)
-                Temperatura_Ponto_Orvalho.append(self.Orvalho.Temp)
-            
-            # Caracterização das fases
-            self.Bolha   = Condicao(P,Temperatura_Ponto_Bolha,[y_1,y_2],None,None)
-            self.Orvalho = Condicao(P,Temperatura_Ponto_Orvalho,[x_1,x_2],None,None)
-            
+                # Blocos calculados por uma execução anterior
+                retomado = ponto_controle is not None and ponto_controle.carregar(inicio,zb)
+                if retomado:
+                    self.Bolha, self.Orvalho = retomado
+                
+                # Cálculo dos pontos de bolha e de orvalho das composições do bloco de uma só vez
+                elif Constante == 'temperatura':
+                    self.PontoBolha_P_Lote(zb,Valor_cte)
+                    self.PontoOrvalho_P_Lote(zb,Valor_cte)
+                else:
+                    self.PontoBolha_T_Lote(zb,Valor_cte)
+                    self.PontoOrvalho_T_Lote(zb,Valor_cte)
+                
+                if ponto_controle is not None and not retomado:
+                    ponto_controle.salvar(inicio,zb,self.Bolha,self.Orvalho)
+                
+                yield {'inicio':inicio,'indice':indice,'composicao':zb,'Bolha':self.Bolha,'Orvalho':self.Orvalho,'retomado':bool(retomado)}
+                inicio += zb.shape[0]
+        finally:
+            self.diagnostico.finalizar()
+
+    @solucao
+    def Predicao_Mapeada(self,Constante,Valor_cte,diretorio,resolucao=None,tamanho_bloco=250,ponto_controle=None):
+        '''
+        Forma de ``Predicao`` para varreduras grandes: os resultados de cada bloco (vide ``Predicao_Iterativa``) são 
+        gravados em arrays mapeados em memória (vide rotina Resultados) assim que o bloco é calculado, de modo que a 
+        memória utilizada é limitada ao tamanho do bloco.
+        
+        ========
+        Entradas
+        ========
+        
+        * Constante, Valor_cte, resolucao: Vide documentação de ``Predicao``;
+        * diretorio (str): Diretório dos resultados;
+        * tamanho_bloco (int): Número de composições de cada bloco;
+        * ponto_controle (str): Diretório dos pontos de controle, vide ``Predicao_Iterativa``.
+        
+        ======
+        Saídas
+        ======
+        
+        Retorna um objeto da classe ``Resultados`` com os campos (um valor por ponto, como na classe ``Varredura``):
+        
+        * ``composicao``: Composições globais (N,NC);
+        * ``indice``: Índices dos pontos na grade (N,NC), apenas no caso da varredura da grade (vide ``Grade_Simplex``);
+        * ``bolha`` e ``orvalho``: Pressão (temperatura constante) ou temperatura (pressão constante) dos pontos de bolha e de orvalho (N);
+        * ``y_bolha`` e ``phi_bolha``: Composição e coeficientes de fugacidade da fase vapor no ponto de bolha (N,NC);
+        * ``x_orvalho`` e ``gama_orvalho``: Composição e coeficientes de atividade da fase líquida no ponto de orvalho (N,NC);
+        * ``convergido``: Indica se ambos os cálculos (bolha e orvalho) convergiram (N).
+        '''
+        if self.NC > 2 and resolucao is None:
+            resolucao = 20
+        N = _Eixo_Binario().shape[0] if resolucao is None else _Numero_Pontos_Simplex(self.NC,resolucao)
+        
+        campos = [('composicao',float,(self.NC,))] + ([('indice',int32,(self.NC,))] if resolucao is not None else []) + \
+                 [('bolha',float),('orvalho',float),('y_bolha',float,(self.NC,)),('phi_bolha',float,(self.NC,)),
+                  ('x_orvalho',float,(self.NC,)),('gama_orvalho',float,(self.NC,)),('convergido',bool)]
+        resultados = Resultados.criar(diretorio,N,campos,{'calculo':'Predicao','sistema':self._Descricao_Sistema(),
+                                      'Constante':Constante,'Valor_cte':Valor_cte,'resolucao':resolucao})
+        
+        variavel = 'Pressao' if Constante == 'temperatura' else 'Temp'
+        for bloco in self.Predicao_Iterativa(Constante,Valor_cte,resolucao,tamanho_bloco,ponto_controle):
+            linhas = slice(bloco['inicio'],bloco['inicio']+bloco['composicao'].shape[0])
+            resultados.escrever(linhas,composicao=bloco['composicao'],bolha=getattr(bloco['Bolha'],variavel),
+                                orvalho=getattr(bloco['Orvalho'],variavel),y_bolha=bloco['Bolha'].comp_molar,
+                                phi_bolha=bloco['Bolha'].coeffug,x_orvalho=bloco['Orvalho'].comp_molar,
+                                gama_orvalho=bloco['Orvalho'].coefAct,
+                                convergido=bloco['Bolha'].convergido & bloco['Orvalho'].convergido)
+            if bloco['indice'] is not None:
+                resultados.escrever(linhas,indice=bloco['indice'])
+        resultados.sincronizar()
+        return resultados
+
+    @solucao
+    def Varredura_Flash(self,diretorio,T,P,resolucao=20,tamanho_bloco=100):
+        '''
+        Cálculo de flash (vide ``Flash_Lote``) de todas as combinações das composições de uma grade baricêntrica (vide 
+        ``Grade_Simplex``), das temperaturas e das pressões inseridas (Ex.: para o treinamento de modelos substitutos). 
+        Os resultados são gravados em arrays mapeados em memória (vide rotina Resultados) à medida que os blocos de 
+        composições são calculados, de modo que o número de pontos é limitado pelo disco e não pela memória.
+        
+        ========
+        Entradas
+        ========
+        
+        * diretorio (str): Diretório dos resultados;
+        * T (list): Temperaturas em Kelvin;
+        * P (list): Pressões em bar;
+        * resolucao (int): Número de divisões de cada aresta do simplex;
+        * tamanho_bloco (int): Número de composições de cada bloco. Cada bloco possui tamanho_bloco*len(T)*len(P) pontos.
+        
+        ======
+        Saídas
+        ======
+        
+        Retorna um objeto da classe ``Resultados`` com um ponto por combinação, na ordem (composição, temperatura, pressão),
+        isto é, o ponto ``(i*len(T) + j)*len(P) + k`` corresponde à i-ésima composição da grade, a T[j] e a P[k]. Campos:
+        
+        * ``z``, ``x`` e ``y``: Composições global, da fase líquida e da fase vapor (N,NC);
+        * ``T`` e ``P``: Temperatura e pressão (N);
+        * ``gama`` e ``phi``: Coeficientes de atividade da fase líquida e de fugacidade da fase vapor (N,NC);
+        * ``beta``: Fração vaporizada (N);
+        * ``convergido`` e ``iteracoes``: Convergência e número de iterações de cada ponto (N).
+        '''
+        T = asarray(T,dtype=float).ravel()
+        P = asarray(P,dtype=float).ravel()
+        NTP = T.size*P.size
+        N   = _Numero_Pontos_Simplex(self.NC,resolucao)*NTP
+        
+        campos = [('z',float,(self.NC,)),('x',float,(self.NC,)),('y',float,(self.NC,)),('T',float),('P',float),
+                  ('gama',float,(self.NC,)),('phi',float,(self.NC,)),('beta',float),('convergido',bool),('iteracoes',int32)]
+        resultados = Resultados.criar(diretorio,N,campos,{'calculo':'Varredura_Flash','sistema':self._Descricao_Sistema(),
+                                      'resolucao':resolucao,'T':T.tolist(),'P':P.tolist(),'ordem':['composicao','T','P']})
+        
+        divisorias = combinations(xrange(resolucao+self.NC-1),self.NC-1)
+        inicio     = 0
+        while True:
+            bloco = list(islice(divisorias,tamanho_bloco))
+            if len(bloco) == 0:
+                break
+            zb = _Pontos_Simplex(bloco,self.NC,resolucao)[1]
+            
+            # Combinações (composição, temperatura, pressão) do bloco
+            self.Flash_Lote(repeat(zb,NTP,axis=0),tile(repeat(T,P.size),zb.shape[0]),tile(P,T.size*zb.shape[0]))
+            
+            linhas = slice(inicio,inicio+zb.shape[0]*NTP)
+            resultados.escrever(linhas,z=self.condicao_global.comp_molar,x=self.liquido.comp_molar,y=self.vapor.comp_molar,
+                                T=self.condicao_global.Temp,P=self.condicao_global.Pressao,gama=self.liquido.coefAct,
+                                phi=self.vapor.coeffug,beta=self.Beta,convergido=self.condicao_global.convergido,
+                                iteracoes=self.condicao_global.iteracoes)
+            inicio += zb.shape[0]*NTP
+        resultados.sincronizar()
+        return resultados
+            
+    @solucao
     def run(self):
         
         # Validação do algoritmo
         algoritmos_disponiveis = ['Coeficiente_Fugacidade','Coeficiente_Atividade','PontoBolha_P','PontoBolha_T','PontoOrvalho_P','PontoOrvalho_T','Flash']
         if self.Algoritmo not in algoritmos_disponiveis:
             
-            raise NameError(u'O algoritmo escolhido não consta na lista de algoritmo disponíveis: '+', '.join(algoritmos_disponiveis)+'.')
+            raise Erro_Nome(u'O algoritmo escolhido não consta na lista de algoritmo disponíveis: '+', '.join(algoritmos_disponiveis)+'.')
             
         if self.Algoritmo == 'Coeficiente_Fugacidade':
             
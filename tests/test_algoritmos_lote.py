@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação dos algoritmos em lote dos pontos de bolha e de orvalho (PontoBolha_T_Lote, PontoBolha_P_Lote,
+PontoOrvalho_T_Lote e PontoOrvalho_P_Lote): cada composição do lote deve resultar no mesmo ponto calculado pelo algoritmo
+escalar correspondente.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+
+from numpy import array, linspace, column_stack, ones
+from numpy.random import RandomState
+
+from Conexao import Componente_Caracterizar, UNIQUAC, UNIFAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+
+class Teste_Algoritmos_Lote(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        C  = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        C3 = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol','Metanol')]
+        eta = [[0.1*(i+j) for j in range(3)] for i in range(3)]
+        cls.binario = VLE('PontoBolha_T',C,UNIQUAC(C,340.0,1),VIRIAL(C),Pressao=1.013,diagnostico=Diagnostico('silencioso'))
+        cls.ternario = VLE('PontoBolha_T',C3,UNIFAC(C3),VIRIAL(C3,'Hayden_o_Connel',eta),Pressao=1.013,
+                           diagnostico=Diagnostico('silencioso'))
+        x1 = linspace(0.02,0.98,9)
+        cls.x_binario  = column_stack((x1,1-x1))
+        cls.x_ternario = RandomState(0).dirichlet([1.0,1.0,1.0],8)
+
+    def _Comparar(self,calculo,x,lote,escalar,variavel,constante):
+        # Ponto de bolha: composição do vapor (Bolha); ponto de orvalho: composição do líquido (Orvalho)
+        fase = 'Orvalho' if escalar.startswith('PontoOrvalho') else 'Bolha'
+        getattr(calculo,lote)(x,constante)
+        condicao = getattr(calculo,fase)
+        valores, y, convergido = array(getattr(condicao,variavel)), array(condicao.comp_molar), array(condicao.convergido)
+        self.assertTrue(convergido.all())
+        constante = constante*ones(x.shape[0]) # Valor único ou um por composição
+        for i in range(x.shape[0]):
+            getattr(calculo,escalar)(list(x[i]),constante[i])
+            self.assertTrue(getattr(calculo,fase).convergido)
+            self.assertAlmostEqual(getattr(getattr(calculo,fase),variavel),valores[i],places=8)
+            for j in range(x.shape[1]):
+                self.assertAlmostEqual(getattr(calculo,fase).comp_molar[j],y[i,j],places=8)
+
+    def test_bolha_T_binario(self):
+        self._Comparar(self.binario,self.x_binario,'PontoBolha_T_Lote','PontoBolha_T','Temp',1.013)
+
+    def test_bolha_P_binario(self):
+        self._Comparar(self.binario,self.x_binario,'PontoBolha_P_Lote','PontoBolha_P','Pressao',340.0)
+
+    def test_bolha_T_ternario(self):
+        self._Comparar(self.ternario,self.x_ternario,'PontoBolha_T_Lote','PontoBolha_T','Temp',1.013)
+
+    def test_bolha_P_ternario(self):
+        self._Comparar(self.ternario,self.x_ternario,'PontoBolha_P_Lote','PontoBolha_P','Pressao',340.0)
+
+    def test_orvalho_T_binario(self):
+        self._Comparar(self.binario,self.x_binario,'PontoOrvalho_T_Lote','PontoOrvalho_T','Temp',1.013)
+
+    def test_orvalho_P_binario(self):
+        self._Comparar(self.binario,self.x_binario,'PontoOrvalho_P_Lote','PontoOrvalho_P','Pressao',340.0)
+
+    def test_orvalho_T_ternario(self):
+        self._Comparar(self.ternario,self.x_ternario,'PontoOrvalho_T_Lote','PontoOrvalho_T','Temp',1.013)
+
+    def test_orvalho_P_ternario(self):
+        self._Comparar(self.ternario,self.x_ternario,'PontoOrvalho_P_Lote','PontoOrvalho_P','Pressao',340.0)
+
+    def test_orvalho_por_composicao(self):
+        # Pressões e temperaturas distintas em cada composição
+        P = linspace(0.8,1.2,self.x_binario.shape[0])
+        T = linspace(330.0,345.0,self.x_ternario.shape[0])
+        self._Comparar(self.binario,self.x_binario,'PontoOrvalho_T_Lote','PontoOrvalho_T','Temp',P)
+        self._Comparar(self.ternario,self.x_ternario,'PontoOrvalho_T_Lote','PontoOrvalho_T','Temp',P[:T.size])
+        self._Comparar(self.ternario,self.x_ternario,'PontoOrvalho_P_Lote','PontoOrvalho_P','Pressao',T)
+
+    def test_pressao_por_composicao(self):
+        # Pressões distintas em cada composição devem resultar nos mesmos pontos do cálculo com pressão única
+        P = linspace(0.8,1.2,self.x_binario.shape[0])
+        self.binario.PontoBolha_T_Lote(self.x_binario,P)
+        T = array(self.binario.Bolha.Temp)
+        for i in range(P.size):
+            self.binario.PontoBolha_T_Lote(self.x_binario[i:i+1],P[i])
+            self.assertAlmostEqual(self.binario.Bolha.Temp[0],T[i],places=8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação do snapshot do banco de dados: as buscas no snapshot exportado (tabelas completas e as buscas com filtros
+realizadas pela rotina Conexao) devem resultar nas mesmas linhas, com os mesmos tipos do Python (inclusive os valores
+nulos), das buscas no banco de dados SQLite, e a função abrir_banco deve utilizar o banco de dados quando este é mais
+recente que o snapshot.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlite3 import connect
+
+import Banco
+from Banco import Banco_SQLite, Banco_Snapshot, exportar, abrir_banco, caminho_snapshot
+
+# Buscas com filtros da rotina Conexao: tabela, colunas retornadas e colunas dos filtros
+BUSCAS = [('Componentes',['ID'],['Nome']),
+          ('Componentes',['ID_grupo'],['ID']),
+          ('Grupo',['Nome'],['ID']),
+          ('Propriedades_puras','*',['ID_componente']),
+          ('Parametros_Psat_Prausnitz_4th_edition',['ID_forma'],['ID_componente']),
+          ('Parametros_Psat_Prausnitz_4th_edition','*',['ID_componente','ID_forma']),
+          ('UNIFAC_componente_subgrupo',['ID_subgrupo','Quantidade'],['ID_componente']),
+          ('UNIFAC_subgrupo',['ID'],['Nome']),
+          ('UNIFAC_subgrupo',['Nome','ID_grupo_principal','R','Q'],['ID']),
+          ('UNIFAC_parametros_interacao',['amn'],['ID_grupo_principal_m','ID_grupo_principal_n'])]
+for tabela in ('UNIQUAC_parametros_interacao_binaria','NRTL','Wilson'):
+    BUSCAS += [(tabela,['ParametroInteracao'],['ID_forma','ID_componente_i','ID_componente_j']),
+               (tabela,['TempMin','TempMax'],['ID_componente_i','ID_componente_j','ID_forma']),
+               (tabela,['ID_forma'],['ID_componente_i','ID_componente_j'])]
+BUSCAS += [('NRTL',['alphaij'],['ID_forma','ID_componente_i','ID_componente_j']),
+           ('Van_Laar',['Parametro'],['ID_componente_i','ID_componente_j']),
+           ('Tsonopoulos',['kij'],['ID_componente_i','ID_componente_j']),
+           ('SRK',['kij'],['ID_componente_i','ID_componente_j']),
+           ('Propriedade_mistura',['CoeficienteSolvatacao'],['ID_componente_i','ID_componente_j'])]
+
+class Teste_Banco_Snapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.banco     = os.path.join(self.diretorio,'banco.db')
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(Banco.__file__)),Banco.BANCO),self.banco)
+
+        # Tabela com valores nulos em colunas de inteiros, números reais e textos, e uma coluna somente com valores nulos
+        conector = connect(self.banco)
+        conector.execute('CREATE TABLE [Nulos] ([ID] INTEGER PRIMARY KEY, [Inteiro] INTEGER, [Real] REAL, [Texto] TEXT, [Vazia] REAL)')
+        conector.executemany('INSERT INTO [Nulos] VALUES (?,?,?,?,?)',[(1,None,1.5,u'Água',None),(2,7,None,None,None),
+                                                                    (3,None,None,u'',None),(4,-3,2.0,u'b',None)])
+        conector.commit()
+        conector.close()
+
+        self.snapshot = exportar(self.banco)
+        self.sqlite   = Banco_SQLite(self.banco,somente_leitura=True)
+        self.copia    = Banco_Snapshot(self.snapshot)
+
+    def tearDown(self):
+        self.sqlite.fechar()
+        Banco.fechar_banco()
+        shutil.rmtree(self.diretorio)
+
+    def _Comparar(self,a,b,mensagem):
+        # A ordem das linhas não é definida pelo SQLite; os tipos são comparados valor a valor (Ex.: 6 != 6.0)
+        a, b = sorted(a), sorted(b)
+        self.assertEqual(a,b,mensagem)
+        self.assertEqual([map(type,linha) for linha in a],[map(type,linha) for linha in b],mensagem)
+
+    def test_tabelas(self):
+        self.assertEqual(self.copia.tabelas(),self.sqlite.tabelas())
+        self.assertEqual(self.snapshot,caminho_snapshot(self.banco))
+        for tabela in self.sqlite.tabelas():
+            self.assertEqual(self.copia.colunas(tabela),self.sqlite.colunas(tabela),tabela)
+            self._Comparar(self.copia.consultar(tabela),self.sqlite.consultar(tabela),tabela)
+
+    def test_nulos(self):
+        linhas = dict([(linha[0],linha) for linha in self.copia.consultar('Nulos')])
+        self.assertEqual(linhas[1],(1,None,1.5,u'Água',None))
+        self.assertEqual(linhas[3],(3,None,None,u'',None))
+        self._Comparar(self.copia.consultar('Nulos',['Texto','Inteiro'],Real=2.0),
+                       self.sqlite.consultar('Nulos',['Texto','Inteiro'],Real=2.0),'Nulos')
+        self._Comparar(self.copia.consultar('Nulos',['Real'],Texto=u''),self.sqlite.consultar('Nulos',['Real'],Texto=u''),'Nulos')
+
+    def test_buscas_conexao(self):
+        for tabela, colunas, filtros in BUSCAS:
+            # Todas as combinações de valores dos filtros que constam na tabela, além de uma combinação inexistente
+            combinacoes = set(self.sqlite.consultar(tabela,filtros)) | set([tuple([-1]*len(filtros))])
+            for valores in combinacoes:
+                filtro = dict(zip(filtros,valores))
+                self._Comparar(self.copia.consultar(tabela,colunas,**filtro),self.sqlite.consultar(tabela,colunas,**filtro),
+                               (tabela,filtro))
+
+    def test_abrir_banco(self):
+        # Snapshot mais recente que o banco de dados
+        data = os.path.getmtime(self.banco)
+        os.utime(self.snapshot,(data+10,data+10))
+        self.assertTrue(isinstance(abrir_banco(self.banco),Banco_Snapshot))
+
+        # Banco de dados alterado após a exportação do snapshot
+        os.utime(self.banco,(data+20,data+20))
+        banco = abrir_banco(self.banco)
+        self.assertTrue(isinstance(banco,Banco_SQLite))
+        self.assertEqual(banco.caminho,self.banco)
+
+        # Snapshot novamente mais recente que o banco de dados
+        os.utime(self.banco,(data,data))
+        self.assertTrue(isinstance(abrir_banco(self.banco),Banco_Snapshot))
+
+if __name__ == '__main__':
+    unittest.main()
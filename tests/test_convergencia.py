@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação do acompanhamento da convergência (classe Convergencia da rotina VLE) com sequências sintéticas de resíduos:
+cada ponto deve ser interrompido, com o estado correspondente, exatamente na iteração em que a convergência, a divergência,
+a oscilação ou o número máximo de iterações é detectado. O traço das iterações deve conter apenas as últimas
+``tamanho_traco`` iterações dos algoritmos, ou nenhuma, caso ``tamanho_traco`` seja 0.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+from collections import deque
+
+from numpy import nan, inf, nonzero, linspace, column_stack
+
+from Conexao import Componente_Caracterizar, UNIQUAC, VIRIAL
+from VLE import VLE, Convergencia
+from Diagnostico import Diagnostico
+
+TOLERANCIA = 1e-8
+MAXITER    = 12
+
+# Resíduos de cada iteração (a partir da primeira) e estado e iteração esperados da interrupção, com janela = 3
+SEQUENCIAS = [([1.0,1e-2,1e-4,1e-6,1e-9],'convergido',5),
+              ([1.0,0.5,nan],'divergido',3),                                    # Resíduo não finito
+              ([1.0,0.5,inf],'divergido',3),
+              ([1.0,1e-1,1e-2,1e-3,2e-3,5e-3,2e-2],'divergido',7),              # Sem redução durante 3 iterações e > 10x o menor
+              ([1.0,1e-1,1e-2,1e-3,2e-3,5e-3,1e-2],'oscilante',7),              # Sem redução durante 3 iterações e <= 10x o menor
+              ([1.0,0.5,0.6,0.55,0.6],'oscilante',5),
+              ([1.0/(k+1) for k in range(MAXITER)],'max_iter',MAXITER),         # Redução lenta
+              ([1.0/(k+1) for k in range(MAXITER-1)]+[1e-9],'convergido',MAXITER)] # A convergência prevalece sobre max_iter
+
+class Teste_Convergencia(unittest.TestCase):
+
+    def _Iterar(self,sequencias,janela):
+        # Itera os pontos simultaneamente e registra a iteração em que cada ponto deixa de estar ativo
+        monitor = Convergencia(len(sequencias),TOLERANCIA,MAXITER,janela)
+        parada  = [None]*len(sequencias)
+        while monitor.ativo.any():
+            k = nonzero(monitor.ativo)[0]
+            residuos = [sequencias[i][monitor.iteracoes[i]] for i in k]
+            ativo = monitor.atualizar(residuos,k)
+            for i in k:
+                if not ativo[i]:
+                    parada[i] = monitor.iteracoes[i]
+        return monitor, parada
+
+    def test_interrupcao(self):
+        monitor, parada = self._Iterar([sequencia for sequencia, estado, iteracao in SEQUENCIAS],3)
+        for i, (sequencia, estado, iteracao) in enumerate(SEQUENCIAS):
+            self.assertEqual(monitor.estado[i],estado,i)
+            self.assertEqual(monitor.iteracoes[i],iteracao,i)
+            self.assertEqual(parada[i],iteracao,i)
+        self.assertFalse(monitor.ativo.any())
+        self.assertEqual(monitor.melhor[3],1e-3)
+
+    def test_janela_desativada(self):
+        # Sem a detecção, os pontos sem redução do resíduo são iterados até o número máximo de iterações
+        sequencias = [sequencia + [sequencia[-1]]*(MAXITER-len(sequencia)) for sequencia, estado, iteracao in SEQUENCIAS]
+        for janela in (0,None):
+            monitor, parada = self._Iterar(sequencias,janela)
+            for i, (sequencia, estado, iteracao) in enumerate(SEQUENCIAS):
+                if estado in ('divergido','oscilante') and all([abs(valor) < inf for valor in sequencia]):
+                    estado, iteracao = 'max_iter', MAXITER
+                self.assertEqual(monitor.estado[i],estado,(janela,i))
+                self.assertEqual(parada[i],iteracao,(janela,i))
+
+    def test_pontos_ativos(self):
+        # Sem a entrada k, os resíduos são os dos pontos ativos
+        monitor = Convergencia(3,TOLERANCIA,MAXITER,3)
+        self.assertEqual(list(monitor.atualizar([1.0,1e-9,1.0])),[True,False,True])
+        self.assertEqual(list(monitor.atualizar([nan,0.5])),[False,False,True])
+        self.assertEqual(list(monitor.estado),['divergido','convergido','iterando'])
+        self.assertEqual(list(monitor.iteracoes),[2,1,2])
+        telemetria = monitor.telemetria()
+        self.assertEqual(list(telemetria['convergido']),[False,True,False])
+        self.assertEqual(list(telemetria['residuo'][1:]),[1e-9,0.5])
+
+class Teste_Traco(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+
+    def _Calculo(self,tamanho_traco):
+        return VLE('PontoBolha_T',self.C,UNIQUAC(self.C,340.0,1),VIRIAL(self.C),Pressao=1.013,
+                   diagnostico=Diagnostico('silencioso'),tamanho_traco=tamanho_traco)
+
+    def test_buffer_circular(self):
+        traco   = deque(maxlen=4)
+        monitor = Convergencia(2,TOLERANCIA,MAXITER,3,algoritmo='teste',traco=traco)
+        for iteracao in range(1,11):
+            monitor.atualizar([1.0/iteracao,2.0/iteracao],valor=[10.0*iteracao,20.0*iteracao])
+        self.assertEqual(len(traco),4)
+        self.assertEqual(list(monitor.estado),['iterando']*2)
+        self.assertEqual(list(monitor.iteracoes),[10,10])
+        for registro, iteracao in zip(traco,range(7,11)):
+            self.assertEqual(sorted(registro),['algoritmo','indice','iteracao','residuo','valor'])
+            self.assertEqual(registro['algoritmo'],'teste')
+            self.assertEqual(list(registro['indice']),[0,1])
+            self.assertEqual(list(registro['iteracao']),[iteracao]*2)
+            self.assertEqual(list(registro['residuo']),[1.0/iteracao,2.0/iteracao])
+            self.assertEqual(list(registro['valor']),[10.0*iteracao,20.0*iteracao])
+
+    def test_traco_algoritmos(self):
+        calculo = self._Calculo(5)
+        calculo.PontoBolha_T([0.3,0.7],1.013)
+        self.assertTrue(0 < len(calculo.traco) <= 5)
+        ultimo = calculo.traco[-1]
+        self.assertEqual(ultimo['algoritmo'],'PontoBolha_T')
+        self.assertEqual(list(ultimo['iteracao']),[calculo.Bolha.iteracoes])
+        self.assertEqual(list(ultimo['residuo']),[calculo.Bolha.residuo])
+        self.assertEqual(list(ultimo['valor']),[calculo.Bolha.Temp])
+
+        # Os laços internos não são registrados; o buffer mantém apenas as últimas iterações
+        calculo.PontoOrvalho_T_Lote(column_stack((linspace(0.1,0.9,4),linspace(0.9,0.1,4))),1.013)
+        self.assertEqual(len(calculo.traco),5)
+        self.assertEqual(set([registro['algoritmo'] for registro in calculo.traco]),set(['PontoOrvalho_T_Lote']))
+        self.assertEqual(calculo.traco[-1]['iteracao'].max(),max(calculo.Orvalho.iteracoes))
+        self.assertEqual(calculo.Subsistema([1,0]).traco.maxlen,5)
+
+    def test_traco_desativado(self):
+        calculo = self._Calculo(0)
+        self.assertIsNone(calculo.traco)
+        calculo.PontoBolha_T([0.3,0.7],1.013)
+        self.assertTrue(calculo.Bolha.convergido)
+        self.assertIsNone(calculo.Subsistema([1,0]).traco)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação das equações de estado cúbicas (SRK e Peng-Robinson): solução analítica da equação cúbica, consistência
+termodinâmica dos coeficientes de fugacidade e igualdade entre os cálculos em lote e os escalares.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+
+from numpy import array, sqrt, log, roots, linspace, column_stack, isreal
+from numpy.random import RandomState
+
+from Conexao import Componente_Caracterizar, UNIQUAC, SRK, Peng_Robinson
+from VLE import VLE
+from Diagnostico import Diagnostico
+
+R = 83.144621 # em cm3.bar/ K.mol
+
+class Teste_Cubicas(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        cls.calculos = [VLE('PontoBolha_T',C,UNIQUAC(C,340.0,1),modelo(C),Pressao=1.013,diagnostico=Diagnostico('silencioso'))
+                        for modelo in (SRK,Peng_Robinson)]
+
+    def test_raiz_cubica(self):
+        # Equações com raízes conhecidas: três raízes reais e uma raiz real com um par complexo
+        aleatorio = RandomState(0)
+        calculo   = self.calculos[0]
+        reais     = aleatorio.uniform(0.01,1.5,(50,3))
+        c2 = -reais.sum(axis=1)
+        c1 = reais[:,0]*reais[:,1] + reais[:,0]*reais[:,2] + reais[:,1]*reais[:,2]
+        c0 = -reais.prod(axis=1)
+        for fase, esperado in (('vapor',reais.max(axis=1)),('liquido',reais.min(axis=1))):
+            for obtido, valor in zip(calculo._Raiz_Cubica(c2,c1,c0,fase),esperado):
+                self.assertAlmostEqual(obtido,valor,places=7)
+
+        real, parte_real, parte_imaginaria = aleatorio.uniform(0.1,1.5,(3,50))
+        c2 = -(real + 2*parte_real)
+        c1 = 2*real*parte_real + parte_real**2 + parte_imaginaria**2
+        c0 = -real*(parte_real**2 + parte_imaginaria**2)
+        for fase in ('vapor','liquido'):
+            for obtido, valor in zip(calculo._Raiz_Cubica(c2,c1,c0,fase),real):
+                self.assertAlmostEqual(obtido,valor,places=7)
+
+    def _ln_phi_mistura(self,calculo,n,P,T):
+        # Coeficiente de fugacidade da mistura, calculado de forma independente (raízes por numpy.roots)
+        u, w = calculo.model_vap.u, calculo.model_vap.w
+        cte  = calculo._Constantes_Cubica()
+        y    = n/n.sum()
+        a    = cte['ac']*(1 + cte['m']*(1 - sqrt(T/cte['Tc'])))**2
+        am   = (y[:,None]*y[None,:]*sqrt(a[:,None]*a[None,:])*(1 - cte['kij'])).sum()
+        bm   = y.dot(cte['b'])
+        A, B = am*P/(R*T)**2, bm*P/(R*T)
+        Z    = max([raiz.real for raiz in roots([1.0,-(1 + B - u*B),A + w*B**2 - u*B - u*B**2,-(A*B + w*B**2 + w*B**3)]) if isreal(raiz)])
+        d    = sqrt(u**2 - 4*w)
+        return Z - 1 - log(Z - B) - A/(B*d)*log((2*Z + B*(u + d))/(2*Z + B*(u - d)))
+
+    def test_derivada_parcial(self):
+        # ln(phi_i) é a derivada parcial de n*ln(phi) da mistura em relação a n_i
+        P, T, y, h = 5.0, 420.0, array([0.35,0.65]), 1e-5
+        for calculo in self.calculos:
+            phi = calculo.Coeficiente_Fugacidade(list(y),P,T)
+            for i in range(2):
+                dn = array([0.0,0.0])
+                dn[i] = h
+                derivada = ((y + dn).sum()*self._ln_phi_mistura(calculo,y + dn,P,T) -
+                            (y - dn).sum()*self._ln_phi_mistura(calculo,y - dn,P,T))/(2*h)
+                self.assertAlmostEqual(log(phi[i]),derivada,places=7)
+
+    def test_gas_ideal(self):
+        for calculo in self.calculos:
+            for phi in calculo.Coeficiente_Fugacidade([0.5,0.5],1e-6,400.0):
+                self.assertAlmostEqual(phi,1.0,places=6)
+
+    def test_fugacidade_lote(self):
+        aleatorio = RandomState(1)
+        y1 = aleatorio.uniform(0.0,1.0,20)
+        y  = column_stack((y1,1-y1))
+        P  = aleatorio.uniform(0.5,5.0,20)
+        T  = aleatorio.uniform(330.0,450.0,20)
+        for calculo in self.calculos:
+            lote = calculo.Coeficiente_Fugacidade_Lote(y,P,T)
+            for k in range(20):
+                for obtido, valor in zip(calculo.Coeficiente_Fugacidade(list(y[k]),P[k],T[k]),lote[k]):
+                    self.assertAlmostEqual(obtido,valor,places=12)
+
+    def test_bolha_lote(self):
+        x1 = linspace(0.05,0.95,7)
+        x  = column_stack((x1,1-x1))
+        for calculo in self.calculos:
+            calculo.PontoBolha_T_Lote(x,1.013)
+            T, convergido = array(calculo.Bolha.Temp), array(calculo.Bolha.convergido)
+            self.assertTrue(convergido.all())
+            for k in range(x.shape[0]):
+                calculo.PontoBolha_T(list(x[k]),1.013)
+                self.assertAlmostEqual(calculo.Bolha.Temp,T[k],places=8)
+
+if __name__ == '__main__':
+    unittest.main()
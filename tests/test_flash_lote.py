@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação do flash em lote (Flash_Lote e _Rachford_Rice_Lote): cada alimentação bifásica do lote deve resultar na mesma
+fração vaporizada e nas mesmas composições do flash escalar (Flash), com temperatura e pressão únicas ou uma por
+alimentação, e as alimentações monofásicas devem ser classificadas como líquido ou vapor.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+
+from numpy import array, linspace, column_stack, ones
+from numpy.random import RandomState
+
+from Conexao import Componente_Caracterizar, UNIQUAC, UNIFAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+
+class Teste_Flash_Lote(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        C  = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        C3 = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol','Metanol')]
+        eta = [[0.1*(i+j) for j in range(3)] for i in range(3)]
+        cls.binario = VLE('PontoBolha_T',C,UNIQUAC(C,340.0,1),VIRIAL(C),Pressao=1.013,diagnostico=Diagnostico('silencioso'))
+        cls.ternario = VLE('PontoBolha_T',C3,UNIFAC(C3),VIRIAL(C3,'Hayden_o_Connel',eta),Pressao=1.013,
+                           diagnostico=Diagnostico('silencioso'))
+        z1 = linspace(0.1,0.9,7)
+        cls.z_binario  = column_stack((z1,1-z1))
+        cls.z_ternario = RandomState(0).dirichlet([2.0,2.0,2.0],6)
+
+    def _Pressao_Bifasica(self,calculo,z,T,fracao):
+        # Pressão entre os pontos de orvalho (fracao = 0) e de bolha (fracao = 1) de cada alimentação
+        calculo.PontoBolha_P_Lote(z,T)
+        bolha = array(calculo.Bolha.Pressao)
+        calculo.PontoOrvalho_P_Lote(z,T)
+        orvalho = array(calculo.Orvalho.Pressao)
+        return orvalho + fracao*(bolha - orvalho)
+
+    def _Comparar(self,calculo,z,T,P):
+        calculo.Flash_Lote(z,T,P)
+        Beta, estado_fase = calculo.Beta.copy(), calculo.estado_fase.copy()
+        x, y = array(calculo.liquido.comp_molar), array(calculo.vapor.comp_molar)
+        self.assertTrue(array(calculo.condicao_global.convergido).all())
+        self.assertEqual(list(estado_fase),['bifasico']*z.shape[0])
+        T, P = T*ones(z.shape[0]), P*ones(z.shape[0])
+        for i in range(z.shape[0]):
+            calculo.Flash(list(z[i]),T[i],P[i])
+            self.assertTrue(calculo.condicao_global.convergido)
+            self.assertAlmostEqual(calculo.Beta,Beta[i],places=8)
+            for j in range(z.shape[1]):
+                self.assertAlmostEqual(calculo.liquido.comp_molar[j],x[i,j],places=8)
+                self.assertAlmostEqual(calculo.vapor.comp_molar[j],y[i,j],places=8)
+        return Beta, x, y
+
+    def test_bifasico_binario(self):
+        P = self._Pressao_Bifasica(self.binario,self.z_binario,340.0,linspace(0.1,0.9,self.z_binario.shape[0]))
+        self._Comparar(self.binario,self.z_binario,340.0,P)
+
+    def test_bifasico_ternario(self):
+        P = self._Pressao_Bifasica(self.ternario,self.z_ternario,340.0,linspace(0.1,0.9,self.z_ternario.shape[0]))
+        self._Comparar(self.ternario,self.z_ternario,340.0,P)
+
+    def test_pressao_unica(self):
+        # Alimentações bifásicas na mesma pressão
+        z = self.z_binario[3:5]
+        orvalho = self._Pressao_Bifasica(self.binario,z,340.0,0.0).max()
+        bolha   = self._Pressao_Bifasica(self.binario,z,340.0,1.0).min()
+        self.assertTrue(orvalho < bolha)
+        self._Comparar(self.binario,z,340.0,0.5*(orvalho+bolha))
+
+    def test_temperatura_pressao_por_alimentacao(self):
+        # Temperaturas e pressões distintas em cada alimentação devem resultar nos mesmos valores do cálculo de cada
+        # alimentação separadamente
+        T = linspace(325.0,345.0,self.z_ternario.shape[0])
+        P = array([self._Pressao_Bifasica(self.ternario,self.z_ternario[i:i+1],T[i],0.4)[0] for i in range(T.size)])
+        Beta, x, y = self._Comparar(self.ternario,self.z_ternario,T,P)
+        for i in range(T.size):
+            self.ternario.Flash_Lote(self.z_ternario[i:i+1],T[i],P[i])
+            self.assertAlmostEqual(self.ternario.Beta[0],Beta[i],places=10)
+            for j in range(3):
+                self.assertAlmostEqual(self.ternario.liquido.comp_molar[0,j],x[i,j],places=10)
+                self.assertAlmostEqual(self.ternario.vapor.comp_molar[0,j],y[i,j],places=10)
+
+    def test_rachford_rice(self):
+        # K = (2, 0.5) e z = (0.5, 0.5): raiz analítica Beta = 0.5; K > 1: vapor (Beta = 1); K < 1: líquido (Beta = 0)
+        z = array([[0.5,0.5]]*3)
+        K = array([[2.0,0.5],[3.0,1.5],[0.8,0.2]])
+        Beta = self.binario._Rachford_Rice_Lote(z,K,array([0.9,0.5,0.5]))
+        self.assertAlmostEqual(Beta[0],0.5,places=12)
+        self.assertEqual(list(Beta[1:]),[1.0,0.0])
+
+    def test_monofasico(self):
+        # Abaixo da pressão de orvalho: vapor (Beta = 1); acima da pressão de bolha: líquido (Beta = 0). O flash escalar
+        # não é definido para essas alimentações (Erro_Valor), enquanto o flash em lote as classifica como convergidas.
+        z = self.z_binario[[1,3,5,3]]
+        orvalho = self._Pressao_Bifasica(self.binario,z,340.0,0.0)
+        bolha   = self._Pressao_Bifasica(self.binario,z,340.0,1.0)
+        P = array([0.9*orvalho[0],1.1*bolha[1],0.5*(orvalho[2]+bolha[2]),0.5*orvalho[3]])
+        self.binario.Flash_Lote(z,340.0,P)
+        self.assertEqual(list(self.binario.estado_fase),['vapor','liquido','bifasico','vapor'])
+        self.assertEqual(list(self.binario.Beta[[0,1,3]]),[1.0,0.0,1.0])
+        self.assertTrue(0.0 < self.binario.Beta[2] < 1.0)
+        self.assertEqual(list(self.binario.condicao_global.status),['convergido']*4)
+
+        # A composição da fase presente é a da alimentação
+        for i, fase in ((0,self.binario.vapor),(1,self.binario.liquido),(3,self.binario.vapor)):
+            for j in range(2):
+                self.assertAlmostEqual(fase.comp_molar[i,j],z[i,j],places=12)
+
+        for i in (0,1,3):
+            with self.assertRaises(ValueError):
+                self.binario.Flash(list(z[i]),340.0,P[i])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação do cache dos kernels com threads: os objetos VLE criados com os mesmos modelos compartilham o kernel (e o
+cache das matrizes dependentes da temperatura), e os cálculos em threads distintas devem resultar nos mesmos valores dos
+cálculos sequenciais, sem exceder o tamanho do cache.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+from threading import Thread
+
+from numpy import linspace
+
+from Conexao import Componente_Caracterizar, UNIQUAC, UNIFAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+
+class Teste_Kernel_Threads(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        cls.modelos = [UNIQUAC(cls.C,340.0,1),UNIFAC(cls.C)]
+
+    def _Executar(self,alvos):
+        erros = []
+        def executar(alvo):
+            try:
+                alvo()
+            except Exception as erro:
+                erros.append(erro)
+        threads = [Thread(target=executar,args=(alvo,)) for alvo in alvos]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(erros,[])
+
+    def test_bolha_threads(self):
+        composicoes = linspace(0.05,0.95,25)
+        calcular = lambda modelo: VLE('PontoBolha_T',self.C,modelo,VIRIAL(self.C),Pressao=1.013,
+                                      diagnostico=Diagnostico('silencioso'))
+        sequencial = {}
+        for k, modelo in enumerate(self.modelos):
+            calculo = calcular(modelo)
+            for x1 in composicoes:
+                calculo.PontoBolha_T([x1,1-x1],1.013)
+                sequencial[k,x1] = calculo.Bolha.Temp
+
+        resultados = {}
+        def alvo(k):
+            calculo = calcular(self.modelos[k%2])
+            def executar():
+                for repeticao in range(4):
+                    for x1 in composicoes:
+                        calculo.PontoBolha_T([x1,1-x1],1.013)
+                        resultados[k,repeticao,x1] = calculo.Bolha.Temp
+            return executar
+        self._Executar([alvo(k) for k in range(8)])
+
+        for (k, repeticao, x1), T in resultados.items():
+            self.assertEqual(T,sequencial[k%2,x1])
+        for modelo in self.modelos:
+            kernel = modelo.Kernel()
+            self.assertTrue(len(kernel._cache) <= kernel.tamanho_cache)
+
+    def test_gama_threads(self):
+        kernel = self.modelos[0].Kernel()
+        kernel.limpar_cache()
+        temperaturas = linspace(300.0,380.0,200)
+        referencia   = [kernel.gama([0.3,0.7],T) for T in temperaturas]
+        kernel.limpar_cache()
+
+        def alvo(deslocamento):
+            def executar():
+                for repeticao in range(3):
+                    for i in range(len(temperaturas)):
+                        j = (i + deslocamento)%len(temperaturas)
+                        self.assertEqual(kernel.gama([0.3,0.7],temperaturas[j]),referencia[j])
+                        self.assertTrue(len(kernel._cache) <= kernel.tamanho_cache)
+            return executar
+        self._Executar([alvo(25*k) for k in range(8)])
+        self.assertTrue(len(kernel._cache) <= kernel.tamanho_cache)
+        self.assertEqual(kernel.cache_acertos + kernel.cache_falhas,8*3*len(temperaturas))
+
+if __name__ == '__main__':
+    unittest.main()
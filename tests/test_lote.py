@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação da rotina Lote: as mesmas especificações em JSONL e em CSV devem resultar nas mesmas especificações
+normalizadas e nos mesmos resultados, os resultados gravados em JSON devem ser lidos sem alteração e os resultados
+mapeados em memória devem conter os mesmos valores dos resultados em JSON.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+
+from numpy import isnan
+
+import Lote
+from Conexao import Componente_Caracterizar, UNIQUAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+from Resultados import Resultados
+
+ESPECIFICACOES = [
+    {'id':'bolha_T','algoritmo':'PontoBolha_T','componentes':['Acetona','Etanol'],'z':[0.3,0.7],'P':1.013},
+    {'id':'bolha_P','algoritmo':'PontoBolha_P','componentes':['Acetona','Etanol'],'z':[0.6,0.4],'T':340.0},
+    {'id':'orvalho_T','algoritmo':'PontoOrvalho_T','componentes':['Acetona','Etanol'],'z':[0.5,0.5],'P':0.9},
+    {'id':'gama','algoritmo':'Coeficiente_Atividade','componentes':['Acetona','Etanol'],'z':[0.2,0.8],'T':330.0},
+    {'id':'ternario','algoritmo':'PontoBolha_T','componentes':['Acetona','Etanol','Metanol'],'modelo_liq':'UNIFAC',
+     'modelo_vap':'SRK','z':[0.2,0.3,0.5],'P':1.013},
+    {'id':'inexistente','algoritmo':'PontoBolha_T','componentes':['Acetona','Inexistente'],'z':[0.5,0.5],'P':1.013}]
+
+class Teste_Lote(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.jsonl = os.path.join(self.diretorio,'especificacoes.jsonl')
+        self.csv   = os.path.join(self.diretorio,'especificacoes.csv')
+        with open(self.jsonl,'wb') as arquivo:
+            for especificacao in ESPECIFICACOES:
+                arquivo.write(json.dumps(especificacao)+'\n')
+        campos = ['id','algoritmo','componentes','modelo_liq','modelo_vap','z','T','P']
+        with open(self.csv,'wb') as arquivo:
+            escritor = csv.DictWriter(arquivo,campos)
+            escritor.writeheader()
+            for especificacao in ESPECIFICACOES:
+                linha = dict(especificacao)
+                linha['componentes'] = ';'.join(linha['componentes'])
+                linha['z']           = ';'.join([repr(valor) for valor in linha['z']])
+                escritor.writerow(linha)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def _Resultados(self,especificacoes,**kwargs):
+        return dict([(resultado['id'],resultado) for resultado in Lote.executar(especificacoes,**kwargs)])
+
+    def test_leitura(self):
+        self.assertEqual(list(Lote.ler_especificacoes(self.jsonl)),list(Lote.ler_especificacoes(self.csv)))
+
+    def test_resultados_jsonl_csv(self):
+        jsonl = self._Resultados(Lote.ler_especificacoes(self.jsonl))
+        self.assertEqual(sorted(jsonl),sorted([especificacao['id'] for especificacao in ESPECIFICACOES]))
+        self.assertEqual(jsonl,self._Resultados(Lote.ler_especificacoes(self.csv)))
+        self.assertEqual(jsonl,self._Resultados(Lote.ler_especificacoes(self.jsonl),processos=2,tamanho_tarefa=2))
+
+        self.assertTrue(jsonl['inexistente']['erro'].startswith('Erro_Nome: '))
+        for nome in ('bolha_T','bolha_P','orvalho_T','ternario'):
+            self.assertIsNone(jsonl[nome]['erro'])
+            self.assertTrue(jsonl[nome]['convergido'])
+
+    def test_valores(self):
+        # O resultado do lote é o do cálculo direto pela classe VLE (a temperatura da caracterização é utilizada apenas
+        # nas validações)
+        resultado = self._Resultados(Lote.ler_especificacoes(self.jsonl))['bolha_T']
+        C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        calculo = VLE('PontoBolha_T',C,UNIQUAC(C,340.0,1),VIRIAL(C),diagnostico=Diagnostico('silencioso'))
+        calculo.PontoBolha_T([0.3,0.7],1.013)
+        self.assertAlmostEqual(resultado['T'],calculo.Bolha.Temp,places=10)
+        for obtido, valor in zip(resultado['y'],calculo.Bolha.comp_molar):
+            self.assertAlmostEqual(obtido,valor,places=10)
+
+    def test_escrita(self):
+        resultados = self._Resultados(Lote.ler_especificacoes(self.jsonl))
+        arquivo    = os.path.join(self.diretorio,'resultados.jsonl')
+        with open(arquivo,'wb') as saida:
+            total, erros = Lote.escrever(resultados.values(),saida)
+        self.assertEqual((total,erros),(len(ESPECIFICACOES),1))
+        with open(arquivo,'rb') as entrada:
+            lidos = dict([(resultado['id'],resultado) for resultado in map(json.loads,entrada)])
+        self.assertEqual(lidos,resultados)
+        self.assertEqual(Lote.concluidos(arquivo),set(resultados))
+
+    def test_mapeado(self):
+        diretorio = os.path.join(self.diretorio,'mapeado')
+        Lote.criar_resultados(diretorio,Lote.ler_especificacoes(self.jsonl),self.jsonl)
+        resultados = self._Resultados(Lote.ler_especificacoes(self.jsonl),mapeado=diretorio)
+        mapeado    = Resultados(diretorio)
+        self.assertTrue(mapeado.concluido.all())
+        for linha, especificacao in enumerate(ESPECIFICACOES):
+            resultado = resultados[especificacao['id']]
+            self.assertEqual(bool(mapeado.erro[linha]),resultado['erro'] is not None)
+            for campo in ('T','P','x','y','gama','phi'):
+                if resultado[campo] is None:
+                    continue
+                valores = mapeado[campo][linha]
+                valores = valores[~isnan(valores)].tolist() if valores.ndim else float(valores)
+                self.assertEqual(valores,resultado[campo])
+
+if __name__ == '__main__':
+    unittest.main()
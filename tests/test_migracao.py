@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação da rotina Migracao em uma cópia do banco de dados de exemplo: a migração deve remover as tabelas obsoletas,
+criar os índices apenas na primeira execução e resultar em buscas indexadas para todas as buscas da rotina Conexao.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlite3 import connect
+
+import Banco
+from Migracao import migrar, verificar_planos, INDICES, CONSULTAS
+
+class Teste_Migracao(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.banco     = os.path.join(self.diretorio,'banco.db')
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(Banco.__file__)),Banco.BANCO),self.banco)
+
+        # Banco de dados sem os índices da migração e com tabelas obsoletas
+        conector = connect(self.banco)
+        for nome, tabela, colunas in INDICES:
+            conector.execute('DROP INDEX IF EXISTS ['+nome+']')
+        conector.execute('CREATE TABLE [NRTL_bak0] AS SELECT * FROM [NRTL]')
+        conector.execute('CREATE TABLE [sqlitestudio_temp_table] ([ID] INTEGER)')
+        conector.commit()
+        conector.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def _Tabelas(self):
+        conector = connect(self.banco)
+        try:
+            return set([linha[0] for linha in conector.execute("SELECT name FROM sqlite_master WHERE type='table'")])
+        finally:
+            conector.close()
+
+    def test_migracao(self):
+        self.assertFalse(all([busca['indexada'] for busca in verificar_planos(self.banco)]))
+
+        relatorio = migrar(self.banco)
+        self.assertEqual(relatorio['removidas'],['NRTL_bak0','sqlitestudio_temp_table'])
+        self.assertEqual(sorted(relatorio['indices']),sorted([nome for nome, tabela, colunas in INDICES]))
+        self.assertEqual(relatorio['ausentes'],[])
+        tabelas = self._Tabelas()
+        self.assertFalse('NRTL_bak0' in tabelas or 'sqlitestudio_temp_table' in tabelas)
+        self.assertTrue('NRTL' in tabelas)
+
+        # Segunda execução: os índices existentes são mantidos
+        self.assertEqual(migrar(self.banco),{'removidas':[],'indices':[],'ausentes':[]})
+
+        planos = verificar_planos(self.banco)
+        self.assertEqual(len(planos),len(CONSULTAS))
+        for busca in planos:
+            self.assertTrue(busca['indexada'],busca)
+
+    def test_manter_obsoletas(self):
+        self.assertEqual(migrar(self.banco,remover_obsoletas=False)['removidas'],[])
+        self.assertTrue(set(['NRTL_bak0','sqlitestudio_temp_table']) <= self._Tabelas())
+
+    def test_banco_inexistente(self):
+        # O banco de dados não é criado
+        inexistente = os.path.join(self.diretorio,'inexistente.db')
+        with self.assertRaises(ValueError):
+            migrar(inexistente)
+        self.assertFalse(os.path.exists(inexistente))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação da rotina Perfil: os algoritmos executados com o perfil ativo devem ser registrados, com as etapas chamadas
+durante cada chamada, os métodos originais devem ser restaurados na desativação e os cálculos em várias threads devem
+resultar, em cada chamada, nas mesmas etapas do cálculo em uma única thread.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from threading import Thread
+
+from Conexao import Componente_Caracterizar, UNIQUAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+from Perfil import Perfil, ETAPAS, ALGORITMOS, CONSULTAS
+
+class Teste_Perfil(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+
+    def _Calculo(self):
+        return VLE('PontoBolha_T',self.C,UNIQUAC(self.C,340.0,1),VIRIAL(self.C),Pressao=1.013,
+                   diagnostico=Diagnostico('silencioso'))
+
+    def test_predicao(self):
+        metodos  = [(classe,metodo) for classe, metodo in ETAPAS + ALGORITMOS] + \
+                   [(classe,metodo) for classe, metodo, nome in CONSULTAS]
+        originais = [classe.__dict__[metodo] for classe, metodo in metodos]
+        calculo   = self._Calculo()
+        with Perfil() as perfil:
+            calculo.Predicao('pressao',1.013)
+            self.assertTrue(Perfil._ativo is perfil)
+        self.assertTrue(Perfil._ativo is None)
+        for (classe, metodo), original in zip(metodos,originais):
+            self.assertTrue(classe.__dict__[metodo] is original,metodo)
+
+        relatorio = perfil.relatorio()
+        etapas    = relatorio['etapas']
+        self.assertEqual(etapas['Predicao']['chamadas'],1)
+        for nome in ('PontoBolha_T_Lote','PontoOrvalho_T_Lote','Coeficiente_Atividade_Lote','Coeficiente_Fugacidade_Lote'):
+            self.assertTrue(etapas[nome]['chamadas'] > 0,nome)
+            self.assertTrue(0.0 <= etapas[nome]['tempo_proprio'] <= etapas[nome]['tempo'],nome)
+        predicao = [registro for registro in relatorio['invocacoes'] if registro['algoritmo'] == 'Predicao']
+        self.assertEqual(len(predicao),1)
+        self.assertEqual(predicao[0]['etapas']['Coeficiente_Atividade_Lote']['chamadas'],
+                         etapas['Coeficiente_Atividade_Lote']['chamadas'])
+        self.assertFalse('Predicao' in predicao[0]['etapas'])
+
+        # Sem o perfil ativo, nada é registrado
+        calculo.PontoBolha_T([0.3,0.7],1.013)
+        self.assertEqual(perfil.relatorio()['etapas'],etapas)
+
+    def test_resultados_mapeados(self):
+        diretorio = tempfile.mkdtemp()
+        try:
+            calculo = self._Calculo()
+            with Perfil() as perfil:
+                calculo.Predicao_Mapeada('pressao',1.013,os.path.join(diretorio,'predicao'),tamanho_bloco=1000)
+                calculo.Varredura_Flash(os.path.join(diretorio,'flash'),[340.0],[1.0,1.1],resolucao=10)
+            invocacoes = dict([(registro['algoritmo'],registro) for registro in perfil.invocacoes])
+            self.assertTrue(invocacoes['Predicao_Mapeada']['etapas']['PontoBolha_T_Lote']['chamadas'] > 0)
+            self.assertEqual(invocacoes['Varredura_Flash']['etapas']['Flash_Lote']['chamadas'],1)
+        finally:
+            shutil.rmtree(diretorio)
+
+    def test_threads(self):
+        referencia = Perfil()
+        with referencia:
+            self._Calculo().PontoBolha_T([0.3,0.7],1.013)
+        etapas = dict([(nome,dados['chamadas']) for nome, dados in referencia.invocacoes[0]['etapas'].items()])
+
+        calculos = [self._Calculo() for i in range(4)]
+        erros    = []
+        def executar(calculo):
+            try:
+                for repeticao in range(5):
+                    calculo.PontoBolha_T([0.3,0.7],1.013)
+            except Exception as erro:
+                erros.append(erro)
+        with Perfil() as perfil:
+            threads = [Thread(target=executar,args=(calculo,)) for calculo in calculos]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(erros,[])
+
+        # Cada chamada registra apenas as etapas da própria thread
+        self.assertEqual(len(perfil.invocacoes),20)
+        for registro in perfil.invocacoes:
+            self.assertEqual(dict([(nome,dados['chamadas']) for nome, dados in registro['etapas'].items()]),etapas)
+        relatorio = perfil.relatorio()['etapas']
+        for nome, chamadas in etapas.items():
+            self.assertEqual(relatorio[nome]['chamadas'],20*chamadas,nome)
+            self.assertTrue(relatorio[nome]['tempo_proprio'] <= relatorio[nome]['tempo'] + 1e-9,nome)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação da retomada de cálculos interrompidos: as varreduras (Predicao com pontos de controle) e os lotes (Lote, com
+os resultados em JSON ou mapeados em memória) retomados devem resultar nos mesmos valores dos cálculos sem interrupção.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from itertools import islice
+
+from numpy import array_equal
+from numpy.testing import assert_array_equal
+from numpy.random import RandomState
+
+import Lote
+from Conexao import Componente_Caracterizar, UNIQUAC, UNIFAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+from Resultados import Resultados
+
+class Teste_Ponto_Controle(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.C  = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        cls.C3 = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol','Metanol')]
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def _Binario(self):
+        return VLE('PontoBolha_P',self.C,UNIQUAC(self.C,340.0,1),VIRIAL(self.C),z=[0.3,0.7],Temp=340.0,Pressao=1.013,
+                   diagnostico=Diagnostico('silencioso'))
+
+    def _Ternario(self):
+        eta = [[0.1*(i+j) for j in range(3)] for i in range(3)]
+        return VLE('PontoBolha_P',self.C3,UNIFAC(self.C3),VIRIAL(self.C3,'Hayden_o_Connel',eta),Temp=340.0,Pressao=1.0,
+                   diagnostico=Diagnostico('silencioso'))
+
+    def _Comparar_Condicoes(self,a,b):
+        for fase in ('Bolha','Orvalho'):
+            for atributo in ('Temp','Pressao','comp_molar','coeffug','convergido','iteracoes'):
+                self.assertTrue(array_equal(getattr(getattr(a,fase),atributo),getattr(getattr(b,fase),atributo)),(fase,atributo))
+
+    def test_predicao_binaria(self):
+        pontos = os.path.join(self.diretorio,'pontos')
+        continuo = self._Binario()
+        continuo.Predicao('pressao',1.013)
+
+        # Interrupção após dois blocos
+        interrompido = self._Binario().Predicao_Iterativa('pressao',1.013,tamanho_bloco=250,ponto_controle=pontos)
+        self.assertFalse(any([bloco['retomado'] for bloco in islice(interrompido,2)]))
+        interrompido.close()
+
+        retomado = self._Binario()
+        blocos   = list(retomado.Predicao_Iterativa('pressao',1.013,tamanho_bloco=250,ponto_controle=pontos))
+        self.assertEqual([bloco['retomado'] for bloco in blocos][:3],[True,True,False])
+        retomado.Predicao('pressao',1.013,ponto_controle=pontos)
+        self._Comparar_Condicoes(continuo,retomado)
+
+    def test_predicao_ternaria(self):
+        pontos = os.path.join(self.diretorio,'pontos')
+        continuo = self._Ternario()
+        continuo.Predicao('temperatura',340.0,resolucao=20)
+
+        interrompido = self._Ternario().Predicao_Iterativa('temperatura',340.0,20,tamanho_bloco=60,ponto_controle=pontos)
+        interrompido.next()
+        interrompido.close()
+
+        retomado = self._Ternario()
+        retomado.Predicao('temperatura',340.0,resolucao=20,ponto_controle=pontos,tamanho_bloco=60)
+        self._Comparar_Condicoes(continuo,retomado)
+        for campo in ('indice','composicao','bolha','orvalho','y_bolha','x_orvalho','convergido'):
+            self.assertTrue(array_equal(getattr(continuo.varredura,campo),getattr(retomado.varredura,campo)),campo)
+
+    def test_especificacao_diferente(self):
+        pontos = os.path.join(self.diretorio,'pontos')
+        self._Binario().Predicao('pressao',1.013,ponto_controle=pontos,tamanho_bloco=500)
+        with self.assertRaises(ValueError):
+            self._Binario().Predicao('pressao',1.5,ponto_controle=pontos,tamanho_bloco=500)
+
+    def _Especificacoes(self):
+        arquivo = os.path.join(self.diretorio,'especificacoes.jsonl')
+        x1 = RandomState(0).uniform(0.05,0.95,12)
+        with open(arquivo,'wb') as saida:
+            for k, valor in enumerate(x1):
+                saida.write(json.dumps({'id':k,'algoritmo':'PontoBolha_T','componentes':['Acetona','Etanol'],
+                                        'z':[valor,1-valor],'P':1.013})+'\n')
+        return arquivo
+
+    def test_lote_json(self):
+        entrada   = self._Especificacoes()
+        continuo  = dict([(resultado['id'],resultado) for resultado in Lote.executar(Lote.ler_especificacoes(entrada))])
+
+        # Interrupção durante a gravação do quinto resultado (última linha incompleta)
+        arquivo = os.path.join(self.diretorio,'resultados.jsonl')
+        with open(arquivo,'wb') as saida:
+            Lote.escrever(islice(Lote.executar(Lote.ler_especificacoes(entrada),tamanho_tarefa=1),4),saida)
+            saida.write('{"id": 4, "algor')
+
+        retomados = Lote.concluidos(arquivo)
+        self.assertEqual(len(retomados),4)
+        with open(arquivo,'ab') as saida:
+            Lote.escrever(Lote.executar(Lote.ler_especificacoes(entrada),concluidos=retomados),saida)
+        with open(arquivo,'rb') as entrada_resultados:
+            resultados = [json.loads(linha) for linha in entrada_resultados]
+        self.assertEqual(sorted([resultado['id'] for resultado in resultados]),sorted(continuo))
+        self.assertEqual(dict([(resultado['id'],resultado) for resultado in resultados]),continuo)
+
+    def test_lote_mapeado(self):
+        entrada = self._Especificacoes()
+        continuo, retomado = os.path.join(self.diretorio,'continuo'), os.path.join(self.diretorio,'retomado')
+        for diretorio in (continuo,retomado):
+            Lote.criar_resultados(diretorio,Lote.ler_especificacoes(entrada),entrada)
+        list(Lote.executar(Lote.ler_especificacoes(entrada),mapeado=continuo))
+
+        # Interrupção após cinco tarefas de uma especificação
+        list(islice(Lote.executar(Lote.ler_especificacoes(entrada),tamanho_tarefa=1,mapeado=retomado),5))
+        self.assertEqual(Resultados(retomado).concluido.sum(),5)
+        self.assertEqual(len(list(Lote.executar(Lote.ler_especificacoes(entrada),mapeado=retomado))),7)
+
+        a, b = Resultados(continuo), Resultados(retomado)
+        for campo in a.campos:
+            assert_array_equal(a[campo],b[campo],campo) # Os NaN das colunas sem valor são considerados iguais
+
+if __name__ == '__main__':
+    unittest.main()
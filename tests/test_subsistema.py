@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação dos subsistemas: os cálculos (coeficientes de atividade e de fugacidade, segundo coeficiente Virial e ponto de
+bolha) de um subsistema recortado de um sistema de quatro componentes devem resultar nos mesmos valores de um sistema
+criado diretamente com os componentes do subsistema.
+
+O Banco de dados de exemplo não contém os parâmetros de todos os pares dos quatro componentes. Os parâmetros do sistema de
+quatro componentes são os do Banco de dados, para os pares que constam no Banco, e valores arbitrários, para os demais
+pares. Os subsistemas com os pares do Banco são comparados com sistemas criados com os parâmetros buscados no Banco, e os
+demais subsistemas, com sistemas criados com os mesmos parâmetros arbitrários.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+
+from Conexao import Componente_Caracterizar, UNIQUAC, NRTL, UNIFAC, VIRIAL, SRK
+from VLE import VLE
+from Diagnostico import Diagnostico
+
+NOMES = ('Acetona','Etanol','Metanol','Benzeno')
+PARES = [(0,1),(0,2),(1,3)] # Pares com os parâmetros do UNIQUAC e do Hayden O'Connel no Banco de dados
+
+# Modelos: criação a partir dos componentes e dos parâmetros (None: parâmetros do Banco de dados), atributos dos
+# parâmetros, pares que constam no Banco de dados (None: todos) e valores arbitrários dos parâmetros dos demais pares
+LIQUIDO = {'UNIQUAC':(lambda C,p: UNIQUAC(C,340.0,1,*(p or [None])),['parametro_int'],PARES,
+                      [lambda i,j: 0.0 if i == j else 60.0*(j-i)+20.0]),
+           'NRTL'   :(lambda C,p: NRTL(C,340.0,1,*(p or [None,None])),['parametro_int','alpha'],[(0,2)],
+                      [lambda i,j: 0.0 if i == j else 400.0+50.0*(j-i), lambda i,j: 0.0 if i == j else 0.3]),
+           'UNIFAC' :(lambda C,p: UNIFAC(C),[],None,[])}
+VAPOR   = {'Hayden_o_Connel':(lambda C,p: VIRIAL(C,'Hayden_o_Connel',*(p or [None])),['coef_solv'],PARES,
+                              [lambda i,j: 0.1*(i+j)]),
+           'Tsonopoulos'    :(lambda C,p: VIRIAL(C,'Tsonopoulos',*(p or [None])),['k_int_binaria'],[(1,3)],
+                              [lambda i,j: 0.0 if i == j else 0.05]),
+           'SRK'            :(lambda C,p: SRK(C),[],None,[])}
+
+SUBSISTEMAS = [[0,1],[1,0],[0,2],[2,0],[1,3],[3,1],[0,3],[2,1],[3,0,2],[1,2,3],[3,2,1,0]]
+
+class Teste_Subsistema(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in NOMES]
+
+    def _Componentes(self,indices):
+        return [Componente_Caracterizar(NOMES[i],ConfigPsat=('Prausnitz4th',1),T=340.0) for i in indices]
+
+    def _Parametros(self,modelo):
+        # Parâmetros do sistema de quatro componentes: Banco de dados (modelos dos pares) e valores arbitrários
+        criar, atributos, pares, arbitrarios = modelo
+        matrizes = [[[valor(i,j) for j in range(len(NOMES))] for i in range(len(NOMES))] for valor in arbitrarios]
+        for i, j in pares or []:
+            binario = criar([self.C[i],self.C[j]],None)
+            for atributo, matriz in zip(atributos,matrizes):
+                parametro = getattr(binario,atributo)
+                for a, b in ((0,0),(0,1),(1,0),(1,1)):
+                    matriz[(i,j)[a]][(i,j)[b]] = parametro[a][b]
+        return matrizes or None
+
+    def _Modelo(self,modelo,parametros,indices):
+        # Modelo criado diretamente: parâmetros do Banco de dados, caso o subsistema seja um par do Banco
+        criar, atributos, pares, arbitrarios = modelo
+        if pares is None or (len(indices) == 2 and tuple(sorted(indices)) in pares):
+            return criar(self._Componentes(indices),None)
+        return criar(self._Componentes(indices),[[[matriz[i][j] for j in indices] for i in indices] for matriz in parametros])
+
+    def _Calcular(self,calculo,x,T,P):
+        resultado = {'gama':calculo.Coeficiente_Atividade(x,T),'phi':calculo.Coeficiente_Fugacidade(x,P,T)}
+        if calculo.model_vap.nome_modelo == 'Virial':
+            calculo.Second_Virial_Coef(T)
+            resultado['Bvirial'] = [valor for linha in calculo.Bvirial for valor in linha]
+        calculo.PontoBolha_T(x,P)
+        resultado['Temp'] = [calculo.Bolha.Temp]
+        resultado['y']    = list(calculo.Bolha.comp_molar)
+        return resultado
+
+    def _Comparar(self,a,b,mensagem):
+        self.assertEqual(sorted(a),sorted(b))
+        for chave, tolerancia in (('gama',1e-12),('phi',1e-12),('Bvirial',1e-12),('Temp',1e-9),('y',1e-9)):
+            for valor, referencia in zip(a.get(chave,[]),b.get(chave,[])):
+                self.assertTrue(abs(valor-referencia) <= tolerancia*max(1.0,abs(referencia)),(mensagem,chave,valor,referencia))
+
+    def _Verificar(self,liquido,vapor,nome):
+        parametros_liq, parametros_vap = self._Parametros(liquido), self._Parametros(vapor)
+        sistema = VLE('PontoBolha_T',self.C,liquido[0](self.C,parametros_liq),vapor[0](self.C,parametros_vap),Pressao=1.013,
+                      diagnostico=Diagnostico('silencioso'))
+        x4 = [0.1,0.2,0.3,0.4]
+        original = self._Calcular(sistema,x4,335.0,1.013) # Constantes do Virial e das cúbicas calculadas antes do recorte
+
+        for indices in SUBSISTEMAS:
+            x = [float(k+1)/sum(range(1,len(indices)+1)) for k in range(len(indices))]
+            direto = VLE('PontoBolha_T',self._Componentes(indices),self._Modelo(liquido,parametros_liq,indices),
+                         self._Modelo(vapor,parametros_vap,indices),Pressao=1.013,diagnostico=Diagnostico('silencioso'))
+            for T in (320.0,335.0):
+                self._Comparar(self._Calcular(sistema.Subsistema(indices),x,T,1.013),self._Calcular(direto,x,T,1.013),
+                               (nome,indices,T))
+
+        # O sistema original não é alterado pelos recortes
+        self._Comparar(self._Calcular(sistema,x4,335.0,1.013),original,nome)
+
+    def test_modelos_liquido(self):
+        for nome, liquido in sorted(LIQUIDO.items()):
+            self._Verificar(liquido,VAPOR['Hayden_o_Connel'],nome)
+
+    def test_modelos_vapor(self):
+        for nome, vapor in sorted(VAPOR.items()):
+            self._Verificar(LIQUIDO['UNIFAC'],vapor,nome)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação da rotina Tabela: as consultas interpoladas devem concordar com o cálculo exato (algoritmos em lote) dentro da
+tolerância da tabela, as consultas fora da tabela devem ser calculadas de forma exata e a tabela gravada deve resultar
+nas mesmas consultas.
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import array, column_stack, isnan, abs
+from numpy.random import RandomState
+
+from Conexao import Componente_Caracterizar, UNIQUAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+from Tabela import Tabela_Binaria
+
+class Teste_Tabela(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+        cls.calculo = VLE('PontoBolha_T',C,UNIQUAC(C,340.0,1),VIRIAL(C),Pressao=1.013,diagnostico=Diagnostico('silencioso'))
+        cls.tabelas = {'pressao'    :Tabela_Binaria(cls.calculo,'pressao',0.8,1.2),
+                       'temperatura':Tabela_Binaria(cls.calculo,'temperatura',320.0,360.0)}
+
+    def _Exato(self,Constante,ponto,composicao,valor):
+        z = column_stack((composicao.clip(1e-13,1-1e-13),1-composicao.clip(1e-13,1-1e-13)))
+        algoritmo = {('pressao','bolha'):'PontoBolha_T_Lote',('pressao','orvalho'):'PontoOrvalho_T_Lote',
+                     ('temperatura','bolha'):'PontoBolha_P_Lote',('temperatura','orvalho'):'PontoOrvalho_P_Lote'}[(Constante,ponto)]
+        getattr(self.calculo,algoritmo)(z,valor)
+        condicao = self.calculo.Bolha if ponto == 'bolha' else self.calculo.Orvalho
+        return (condicao.Temp if Constante == 'pressao' else condicao.Pressao), condicao.comp_molar[:,0]
+
+    def test_interpolacao(self):
+        aleatorio = RandomState(0)
+        for Constante, tabela in self.tabelas.items():
+            composicao = aleatorio.uniform(0.0,1.0,300)
+            valor      = aleatorio.uniform(tabela.variavel[0],tabela.variavel[-1],300)
+            for ponto in ('bolha','orvalho'):
+                principal, fracao, erro = getattr(tabela,ponto+'_lote')(composicao,valor)
+                exato, fracao_exata     = self._Exato(Constante,ponto,composicao,valor)
+                self.assertTrue((abs(principal/exato-1) <= tabela.tolerancia).all(),(Constante,ponto))
+                self.assertTrue((abs(fracao-fracao_exata) <= tabela.tolerancia).all(),(Constante,ponto))
+                self.assertTrue((erro <= tabela.tolerancia).all())
+
+    def test_consulta_ponto(self):
+        # A consulta de um ponto é a do lote com um único ponto
+        tabela = self.tabelas['pressao']
+        for x1, P in ((0.3,1.013),(0.05,0.81),(0.97,1.19)):
+            lote = tabela.bolha_lote([x1],P)
+            for valor, referencia in zip(tabela.bolha_ponto(x1,P),lote):
+                self.assertAlmostEqual(valor,referencia[0],places=10)
+
+    def test_fora_da_tabela(self):
+        tabela = self.tabelas['pressao']
+        exatos = tabela.exatos
+        T, y1, erro = tabela.bolha_ponto(0.3,1.5)
+        exato, fracao_exata = self._Exato('pressao','bolha',array([0.3]),1.5)
+        self.assertEqual(tabela.exatos,exatos+1)
+        self.assertAlmostEqual(T,exato[0],places=10)
+        self.assertAlmostEqual(y1,fracao_exata[0],places=10)
+        self.assertTrue(0.0 <= erro <= self.calculo.tolAlg) # Resíduo final do algoritmo
+
+        # Sem convergência, o erro informado é NaN
+        maxiter = self.calculo.maxiter
+        self.calculo.maxiter = 1
+        try:
+            self.assertTrue(isnan(tabela.bolha_ponto(0.3,1.5)[2]))
+            self.assertTrue(isnan(tabela.orvalho_lote([0.3,0.4],1.5)[2]).all())
+        finally:
+            self.calculo.maxiter = maxiter
+
+    def test_gravacao(self):
+        diretorio = tempfile.mkdtemp()
+        try:
+            arquivo = os.path.join(diretorio,'tabela.npz')
+            self.tabelas['temperatura'].salvar(arquivo)
+            carregada = Tabela_Binaria.carregar(arquivo,self.calculo)
+            composicao = RandomState(1).uniform(0.0,1.0,50)
+            for ponto in ('bolha','orvalho'):
+                for a, b in zip(getattr(self.tabelas['temperatura'],ponto+'_lote')(composicao,340.0),
+                                getattr(carregada,ponto+'_lote')(composicao,340.0)):
+                    self.assertTrue((a == b).all())
+
+            # Objeto VLE de outro sistema
+            C = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in ('Acetona','Etanol')]
+            outro = VLE('PontoBolha_T',C,UNIQUAC(C,340.0,1),VIRIAL(C),Pressao=1.013,tolAlg=1e-6,diagnostico=Diagnostico('silencioso'))
+            with self.assertRaises(ValueError):
+                Tabela_Binaria.carregar(arquivo,outro)
+        finally:
+            shutil.rmtree(diretorio)
+
+if __name__ == '__main__':
+    unittest.main()
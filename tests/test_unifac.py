@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação do modelo UNIFAC: os coeficientes de atividade do kernel (escalar e em lote) são comparados com os de uma
+implementação direta das equações de Fredenslund et al. (1975), com os parâmetros R, Q e a_mn publicados nas tabelas do
+UNIFAC (Hansen et al., 1991).
+
+Execução (no diretório da rotina): python -m unittest discover -s tests
+"""
+import unittest
+from math import exp, log
+
+from numpy import column_stack, linspace
+from numpy.random import RandomState
+
+from Conexao import Componente_Caracterizar, UNIFAC, VIRIAL
+from VLE import VLE
+from Diagnostico import Diagnostico
+
+# Parâmetros publicados: subgrupo: (grupo principal, R, Q); (grupo m, grupo n): a_mn (K)
+SUBGRUPOS = {'CH3'   :(1,0.9011,0.848), 'CH2':(1,0.6744,0.540), 'ACH':(3,0.5313,0.400), 'OH':(5,1.0000,1.200),
+             'CH3OH' :(6,1.4311,1.432), 'CH3CO':(9,1.6724,1.488)}
+INTERACAO = {(1,3):61.13, (1,5):986.5, (1,6):697.2, (1,9):476.4, (3,1):-11.12, (3,5):636.1, (3,6):637.4, (3,9):25.77,
+             (5,1):156.4, (5,3):89.6, (5,6):-137.1, (5,9):84.0, (6,1):16.51, (6,3):-50.0, (6,5):249.1, (6,9):23.39,
+             (9,1):26.76, (9,3):140.1, (9,5):164.5, (9,6):108.7}
+COMPOSICAO = {'Etanol' :{'CH3':1,'CH2':1,'OH':1}, 'Benzeno':{'ACH':6}, 'Acetona':{'CH3':1,'CH3CO':1},
+              'Metanol':{'CH3OH':1}}
+
+def gama_referencia(componentes,x,T):
+    # Implementação direta das equações do UNIFAC (parte combinatorial e residual), em Python puro
+    nu       = [COMPOSICAO[nome] for nome in componentes]
+    grupos   = sorted(set([k for n in nu for k in n]))
+    psi      = lambda m, n: exp(-INTERACAO.get((SUBGRUPOS[m][0],SUBGRUPOS[n][0]),0.0)/T)
+    r        = [sum([v*SUBGRUPOS[k][1] for k, v in n.items()]) for n in nu]
+    q        = [sum([v*SUBGRUPOS[k][2] for k, v in n.items()]) for n in nu]
+
+    def ln_Gama(X):
+        total = float(sum(X.values()))
+        area  = dict([(k,SUBGRUPOS[k][2]*X.get(k,0)/total) for k in grupos])
+        soma  = sum(area.values())
+        theta = dict([(k,area[k]/soma) for k in grupos])
+        return dict([(k,SUBGRUPOS[k][2]*(1 - log(sum([theta[m]*psi(m,k) for m in grupos])) -
+                                         sum([theta[m]*psi(k,m)/sum([theta[n]*psi(n,m) for n in grupos]) for m in grupos])))
+                     for k in grupos])
+
+    mistura = {}
+    for j, n in enumerate(nu):
+        for k, v in n.items():
+            mistura[k] = mistura.get(k,0) + x[j]*v
+    Gama_mistura = ln_Gama(mistura)
+    soma_r = sum([x[j]*r[j] for j in range(len(nu))])
+    soma_q = sum([x[j]*q[j] for j in range(len(nu))])
+    gama   = []
+    for i, n in enumerate(nu):
+        J, L  = r[i]/soma_r, q[i]/soma_q
+        ln_c  = 1 - J + log(J) - 5*q[i]*(1 - J/L + log(J/L))
+        Gama_puro = ln_Gama(dict(n))
+        ln_r  = sum([v*(Gama_mistura[k] - Gama_puro[k]) for k, v in n.items()])
+        gama.append(exp(ln_c + ln_r))
+    return gama
+
+class Teste_UNIFAC(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.calculos = {}
+        for nomes in (('Etanol','Benzeno'),('Acetona','Etanol','Metanol')):
+            C   = [Componente_Caracterizar(nome,ConfigPsat=('Prausnitz4th',1),T=340.0) for nome in nomes]
+            eta = [[0.0]*len(nomes) for nome in nomes] # Parâmetros de solvatação, irrelevantes para o UNIFAC
+            cls.calculos[nomes] = VLE('PontoBolha_T',C,UNIFAC(C),VIRIAL(C,'Hayden_o_Connel',eta),Pressao=1.013,
+                                      diagnostico=Diagnostico('silencioso'))
+
+    def test_binario(self):
+        calculo = self.calculos[('Etanol','Benzeno')]
+        for x1 in linspace(0.05,0.95,7):
+            for T in (300.0,330.0,350.0):
+                obtido = calculo.Coeficiente_Atividade([x1,1-x1],T)
+                for valor, referencia in zip(obtido,gama_referencia(('Etanol','Benzeno'),[x1,1-x1],T)):
+                    self.assertAlmostEqual(valor/referencia,1.0,places=10)
+
+    def test_valor_fixo(self):
+        # Valores da implementação de referência para o sistema etanol(1)/benzeno(2) a 330 K e x1 = 0.3, fixados para
+        # detectar alterações nos parâmetros do Banco de dados
+        gama = self.calculos[('Etanol','Benzeno')].Coeficiente_Atividade([0.3,0.7],330.0)
+        self.assertAlmostEqual(gama[0],2.189849,places=5)
+        self.assertAlmostEqual(gama[1],1.232882,places=5)
+
+    def test_ternario_lote(self):
+        nomes   = ('Acetona','Etanol','Metanol')
+        calculo = self.calculos[nomes]
+        x = RandomState(0).dirichlet([1.0,1.0,1.0],10)
+        T = linspace(310.0,350.0,10)
+        lote = calculo.Coeficiente_Atividade_Lote(x,T)
+        for k in range(10):
+            referencia = gama_referencia(nomes,list(x[k]),T[k])
+            escalar    = calculo.Coeficiente_Atividade(list(x[k]),T[k])
+            for i in range(3):
+                self.assertAlmostEqual(lote[k,i]/referencia[i],1.0,places=10)
+                self.assertAlmostEqual(escalar[i]/referencia[i],1.0,places=10)
+
+    def test_componente_puro(self):
+        # Componente puro: gama = 1
+        calculo = self.calculos[('Etanol','Benzeno')]
+        gama    = calculo.Coeficiente_Atividade_Lote(column_stack(([1.0,0.0],[0.0,1.0])),330.0)
+        self.assertAlmostEqual(gama[0,0],1.0,places=12)
+        self.assertAlmostEqual(gama[1,1],1.0,places=12)
+
+if __name__ == '__main__':
+    unittest.main()